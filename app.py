@@ -26,6 +26,7 @@ if st.session_state["logged_in"]:
             st.Page("pages/01_simu_basic.py", title="Simulation Basique", icon=":material/monitoring:"),
             st.Page("pages/02_simu_advanced.py", title="Simulation Avancée", icon=":material/monitoring:"),
             st.Page("pages/03_simu_advanced_v2.py", title="Simulation Avancée V2", icon=":material/monitoring:"),
+            st.Page("pages/05_simu_taux_variable.py", title="Simulation Taux Variable", icon=":material/monitoring:"),
             st.Page("pages/06_simu_pret_in_fine.py", title="Simulation Pret In Fine", icon=":material/monitoring:"),
             st.Page("pages/09_simu_comparateur_pret.py", title="Simulation Comparateur", icon=":material/monitoring:"),
             st.Page("pages/11_simu_loyer_locatif.py", title="Simulation Loyer Locatif", icon=":material/monitoring:"),
@@ -0,0 +1,79 @@
+"""
+Benchmark du tableau d'amortissement de ComputePret.
+
+Compare l'ancienne implémentation (remplissage ligne par ligne avec `.loc`)
+au noyau NumPy sur 5 prêts mensuels de 600 périodes.
+
+Usage:
+    python -m benchmarks.bench_amortissement
+"""
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from models.advanced_simulation.computation.amortissement import calculer_echeancier
+
+NB_PRETS = 5
+NB_PERIODES = 600
+REPETITIONS = 3
+
+
+def tableau_boucle_loc(montant, taux_par_periode, nombre_paiements):
+    """Ancienne implémentation sans différé : une écriture `.loc` par cellule"""
+    amortissement = pd.DataFrame({
+        'paiement': 0.0,
+        'interets': 0.0,
+        'principal': 0.0,
+        'capital_restant': float(montant),
+    }, index=range(nombre_paiements))
+
+    paiement_periodique = montant * (taux_par_periode * (1 + taux_par_periode) ** nombre_paiements) / \
+                          ((1 + taux_par_periode) ** nombre_paiements - 1)
+
+    capital_restant = montant
+    for idx in range(len(amortissement)):
+        amortissement.loc[idx, 'interets'] = capital_restant * taux_par_periode
+        amortissement.loc[idx, 'paiement'] = paiement_periodique
+        amortissement.loc[idx, 'principal'] = paiement_periodique - amortissement.loc[idx, 'interets']
+        capital_restant -= amortissement.loc[idx, 'principal']
+        amortissement.loc[idx, 'capital_restant'] = capital_restant
+
+    return amortissement
+
+
+def tableau_numpy(montant, taux_par_periode, nombre_paiements):
+    """Noyau vectorisé, DataFrame construit une seule fois à la fin"""
+    return pd.DataFrame(calculer_echeancier(montant, taux_par_periode, nombre_paiements))
+
+
+def main():
+    prets = [(100_000 * (i + 1), (3 + i * 0.5) / 100 / 12) for i in range(NB_PRETS)]
+
+    # Vérifie que les deux implémentations concordent avant de les chronométrer
+    for montant, taux in prets:
+        ancien = tableau_boucle_loc(montant, taux, NB_PERIODES)
+        nouveau = tableau_numpy(montant, taux, NB_PERIODES)
+        for col in ['paiement', 'interets', 'principal']:
+            np.testing.assert_allclose(nouveau[col], ancien[col], rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(nouveau['capital_restant'], ancien['capital_restant'], atol=1e-6)
+
+    def run_boucle():
+        for montant, taux in prets:
+            tableau_boucle_loc(montant, taux, NB_PERIODES)
+
+    def run_numpy():
+        for montant, taux in prets:
+            tableau_numpy(montant, taux, NB_PERIODES)
+
+    t_boucle = min(timeit.repeat(run_boucle, number=1, repeat=REPETITIONS))
+    t_numpy = min(timeit.repeat(run_numpy, number=10, repeat=REPETITIONS)) / 10
+
+    print(f"{NB_PRETS} prêts x {NB_PERIODES} périodes")
+    print(f"Boucle .loc : {t_boucle * 1000:10.2f} ms")
+    print(f"Noyau NumPy : {t_numpy * 1000:10.2f} ms")
+    print(f"Accélération : x{t_boucle / t_numpy:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark de ComputeMonteCarlo.
+
+Compare 10 000 tirages vectorisés sur un horizon de 25 ans (grille mensuelle) à
+l'exécution d'une simulation complète par tirage, extrapolée à partir de
+quelques exécutions de ComputeManager.
+
+Usage:
+    python -m benchmarks.bench_monte_carlo
+"""
+import copy
+import time
+import timeit
+
+import numpy as np
+
+from models.advanced_simulation.computation.cache import CacheLRU
+from models.advanced_simulation.computation.moteur import charger_scenario, simuler
+
+NB_TIRAGES = 10_000
+NB_SIMULATIONS_BOUCLE = 20
+REPETITIONS = 3
+
+DISTRIBUTIONS = {
+    "taux_inflation": {"loi": "normale", "ecart_type": 1.0},
+    "taux_croissance_annuel": {"loi": "uniforme", "min": -1.0, "max": 3.0},
+    "taux_augmentation_loyer": {"loi": "triangulaire", "min": 0.0, "max": 3.0},
+    "taux_croissance_charges_copro": {"loi": "normale", "ecart_type": 1.0},
+    "taux_croissance_taxe_fonciere": {"loi": "normale", "ecart_type": 1.0},
+}
+
+
+def scenario_monte_carlo():
+    """Scénario d'exemple avec cinq hypothèses tirées"""
+    scenario = charger_scenario("scenarios/exemple.json")
+    scenario["croissance"].update(monte_carlo=True, nb_tirages=NB_TIRAGES, graine=0,
+                                  distributions=DISTRIBUTIONS)
+    return scenario
+
+
+def simulations_en_boucle(scenario, nb):
+    """Une simulation complète (sans cache) par tirage des hypothèses"""
+    rng = np.random.default_rng(0)
+    for _ in range(nb):
+        variante = copy.deepcopy(scenario)
+        variante["croissance"].update(monte_carlo=False, distributions={})
+        for cle in DISTRIBUTIONS:
+            variante["croissance"][cle] = float(rng.normal(variante["croissance"][cle], 1.0))
+        simuler(variante, cache=None, cache_calculs=CacheLRU(), nb_workers=1)
+
+
+def main():
+    scenario = scenario_monte_carlo()
+
+    t_vectorise = min(timeit.repeat(
+        lambda: simuler(scenario, cache=None, cache_calculs=CacheLRU(), nb_workers=1),
+        number=1, repeat=REPETITIONS))
+
+    debut = time.perf_counter()
+    simulations_en_boucle(scenario, NB_SIMULATIONS_BOUCLE)
+    t_boucle = (time.perf_counter() - debut) / NB_SIMULATIONS_BOUCLE * NB_TIRAGES
+
+    nb_mois = len(simuler(scenario, cache=None, cache_calculs=CacheLRU())["resultats"]["ComputeMonteCarlo"])
+    print(f"{NB_TIRAGES} tirages x {nb_mois} mois, {len(DISTRIBUTIONS)} hypothèses tirées")
+    print(f"Simulation complète vectorisée      : {t_vectorise:10.2f} s")
+    print(f"Une simulation par tirage (estimée) : {t_boucle:10.2f} s")
+    print(f"Accélération : x{t_boucle / t_vectorise:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Exécution par lots de scénarios d'investissement, répartie sur un pool de processus.
+
+Les scénarios sont lus dans un dossier (un fichier .json, .yaml ou .yml par scénario) ou
+dans un fichier JSONL (un scénario par ligne, identifiant facultatif sous la clé 'id').
+Les sorties de chaque scénario sont écrites en Parquet dans `<sortie>/<identifiant>/` ;
+la synthèse du lot (indicateurs clés, durée, statut et erreur éventuelle de chaque
+scénario) est écrite dans `<sortie>/synthese.parquet`. Un scénario en échec n'interrompt
+pas le lot.
+
+Usage:
+    python -m models.advanced_simulation.batch scenarios/ --sortie lots/ --workers 8
+    python -m models.advanced_simulation.batch scenarios.jsonl -o lots/
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from models.advanced_simulation.cli import ecrire_resultats
+from models.advanced_simulation.computation.moteur import charger_scenario, normaliser_scenario, simuler, indicateurs_cles
+
+EXTENSIONS = ('.json', '.yaml', '.yml')
+
+
+def lister_scenarios(source):
+    """
+    Scénarios d'un dossier ou d'un fichier JSONL.
+
+    Args:
+        source (str | Path): Dossier de fichiers de scénario ou fichier .jsonl
+
+    Returns:
+        list: (identifiant, scénario) où le scénario est un chemin de fichier ou un dict
+    """
+    source = Path(source)
+    if source.is_dir():
+        return [(chemin.stem, chemin) for chemin in sorted(source.iterdir()) if chemin.suffix.lower() in EXTENSIONS]
+
+    scenarios = []
+    with open(source, encoding='utf-8') as fichier:
+        for numero, ligne in enumerate(fichier, start=1):
+            if ligne.strip():
+                scenario = json.loads(ligne)
+                scenarios.append((str(scenario.pop('id', f"scenario_{numero:04d}")), scenario))
+    return scenarios
+
+
+def executer_scenario(identifiant, scenario, sortie, valider=True):
+    """
+    Simule un scénario et écrit ses sorties ; les erreurs sont rapportées, pas levées.
+
+    Args:
+        identifiant (str): Identifiant du scénario (nom du dossier de sortie)
+        scenario (str | Path | dict): Fichier de scénario ou scénario déjà lu
+        sortie (str | Path): Dossier de sortie du lot
+        valider (bool): Valider le scénario avant le calcul
+
+    Returns:
+        dict: 'scenario', 'statut' ('ok' ou 'erreur'), 'duree_s', 'erreur', 'nb_fichiers'
+              puis les indicateurs clés (voir `moteur.indicateurs_cles`)
+    """
+    debut = time.perf_counter()
+    ligne = {'scenario': identifiant, 'statut': 'ok', 'erreur': None, 'nb_fichiers': 0}
+    try:
+        scenario = charger_scenario(scenario) if isinstance(scenario, (str, Path)) else normaliser_scenario(scenario)
+        simulation = simuler(scenario, cache=None, nb_workers=1, valider=valider)
+        ligne['nb_fichiers'] = len(ecrire_resultats(simulation, Path(sortie) / identifiant, "parquet"))
+        ligne.update(indicateurs_cles(simulation))
+    except Exception as erreur:
+        ligne['statut'] = 'erreur'
+        ligne['erreur'] = f"{type(erreur).__name__}: {erreur}"
+        ligne['trace'] = traceback.format_exc()
+    ligne['duree_s'] = time.perf_counter() - debut
+    return ligne
+
+
+def executer_lot(source, sortie, nb_workers=None, valider=True):
+    """
+    Exécute tous les scénarios d'une source sur un pool de processus.
+
+    Args:
+        source (str | Path): Dossier de scénarios ou fichier .jsonl
+        sortie (str | Path): Dossier de sortie du lot
+        nb_workers (int, optional): Nombre de processus (nombre de cœurs par défaut)
+        valider (bool): Valider chaque scénario avant le calcul
+
+    Returns:
+        pd.DataFrame: Synthèse du lot, une ligne par scénario (également écrite dans synthese.parquet)
+    """
+    sortie = Path(sortie)
+    sortie.mkdir(parents=True, exist_ok=True)
+    scenarios = lister_scenarios(source)
+
+    lignes = []
+    with ProcessPoolExecutor(max_workers=nb_workers or os.cpu_count()) as pool:
+        futurs = {pool.submit(executer_scenario, identifiant, scenario, sortie, valider): identifiant
+                  for identifiant, scenario in scenarios}
+        for futur in as_completed(futurs):
+            try:
+                lignes.append(futur.result())
+            except Exception as erreur:  # Processus interrompu ou résultat non transmissible
+                lignes.append({'scenario': futurs[futur], 'statut': 'erreur',
+                               'erreur': f"{type(erreur).__name__}: {erreur}", 'nb_fichiers': 0})
+
+    ordre = {identifiant: i for i, (identifiant, _) in enumerate(scenarios)}
+    synthese = pd.DataFrame(lignes, columns=_colonnes(lignes))
+    synthese = synthese.sort_values('scenario', key=lambda s: s.map(ordre), ignore_index=True)
+    synthese.to_parquet(sortie / "synthese.parquet", index=False)
+    return synthese
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Simulation par lots de scénarios d'investissement immobilier.")
+    parser.add_argument("source", help="Dossier de scénarios (.json, .yaml, .yml) ou fichier .jsonl")
+    parser.add_argument("--sortie", "-o", default="lots", help="Dossier de sortie (défaut : lots)")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--sans-validation", action="store_true", help="Ne pas valider les scénarios avant le calcul")
+    args = parser.parse_args(arguments)
+
+    debut = time.perf_counter()
+    synthese = executer_lot(args.source, args.sortie, args.workers, valider=not args.sans_validation)
+    duree = time.perf_counter() - debut
+
+    echecs = synthese[synthese['statut'] == 'erreur']
+    for _, ligne in synthese.iterrows():
+        message = f"{ligne['scenario']}: {ligne['statut']} ({ligne['duree_s']:.2f} s)" if pd.notna(ligne.get('duree_s')) \
+            else f"{ligne['scenario']}: {ligne['statut']}"
+        if ligne['statut'] == 'erreur':
+            message += f" - {ligne['erreur']}"
+        print(message, file=sys.stderr if ligne['statut'] == 'erreur' else sys.stdout)
+    print(f"{len(synthese) - len(echecs)}/{len(synthese)} scénarios réussis en {duree:.1f} s "
+          f"-> {Path(args.sortie) / 'synthese.parquet'}")
+    return 1 if len(echecs) else 0
+
+
+def _colonnes(lignes):
+    """Colonnes de la synthèse : identification et suivi d'abord, indicateurs ensuite"""
+    colonnes = ['scenario', 'statut', 'duree_s', 'nb_fichiers', 'erreur']
+    for ligne in lignes:
+        colonnes += [cle for cle in ligne if cle not in colonnes and cle != 'trace']
+    return colonnes + ['trace']
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Exécution du modèle d'investissement en ligne de commande, sans interface Streamlit.
+
+Le scénario est un fichier JSON ou YAML avec une clé par section (prets, loyers, bien,
+travaux, charges, frais_global, fisca, croissance, marche), au format du DataStore ; les
+dates sont écrites en ISO (AAAA-MM-JJ). Chaque sortie tabulaire est écrite dans le dossier
+de sortie, les autres résultats dans `resume.json`.
+
+Usage:
+    python -m models.advanced_simulation.cli scenarios/exemple.json --sortie resultats/
+    python -m models.advanced_simulation.cli scenario.yaml --format parquet --workers 4
+    python -m models.advanced_simulation.cli scenarios/exemple.json --sensibilite 0.1
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from models.advanced_simulation.computation.moteur import charger_scenario, simuler
+from models.advanced_simulation.computation.sensibilite import analyser_sensibilite
+
+
+def ecrire_resultats(simulation, dossier, format_sortie="csv"):
+    """
+    Écrit les résultats d'une simulation sur disque.
+
+    Args:
+        simulation (dict): Retour de `moteur.simuler`
+        dossier (str | Path): Dossier de sortie (créé si besoin)
+        format_sortie (str): 'csv' ou 'parquet'
+
+    Returns:
+        list: Chemins des fichiers écrits
+    """
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+    fichiers = []
+    resume = {'avertissements': simulation['avertissements']}
+
+    def ecrire(df, nom):
+        chemin = dossier / f"{nom}.{format_sortie}"
+        if format_sortie == "parquet":
+            df.to_parquet(chemin, index=False)
+        else:
+            df.to_csv(chemin, index=False)
+        fichiers.append(chemin)
+
+    for nom, sortie in simulation['resultats'].items():
+        if isinstance(sortie, pd.DataFrame):
+            ecrire(sortie, nom)
+        else:
+            resume[nom] = sortie
+
+    # Résultats détaillés : tableaux dans leurs propres fichiers, valeurs dans le résumé
+    for nom, details in simulation['details'].items():
+        for cle, valeur in details.items():
+            if valeur is simulation['resultats'].get(nom):
+                continue  # Déjà écrit comme sortie du calculateur
+            if isinstance(valeur, pd.DataFrame):
+                ecrire(valeur, f"{nom}_{cle}")
+            else:
+                resume.setdefault(nom, {})[cle] = valeur
+
+    chemin = dossier / "resume.json"
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump(resume, fichier, indent=2, ensure_ascii=False, default=_serialiser)
+    fichiers.append(chemin)
+    return fichiers
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Simulation d'investissement immobilier sans interface.")
+    parser.add_argument("scenario", help="Fichier de scénario (.json, .yaml, .yml)")
+    parser.add_argument("--sortie", "-o", default="resultats", help="Dossier de sortie (défaut : resultats)")
+    parser.add_argument("--format", "-f", choices=["csv", "parquet"], default="csv", dest="format_sortie",
+                        help="Format des tableaux (défaut : csv)")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Nombre de calculateurs exécutés en parallèle")
+    parser.add_argument("--sans-validation", action="store_true", help="Ne pas valider le scénario avant le calcul")
+    parser.add_argument("--sensibilite", type=float, default=None, metavar="PAS",
+                        help="Analyse de sensibilité (tornade) : variation relative des paramètres, ex. 0.1")
+    parser.add_argument("--pas-taux", type=float, default=None, metavar="POINTS",
+                        help="Variation absolue des taux pour l'analyse de sensibilité, en points")
+    args = parser.parse_args(arguments)
+
+    try:
+        simulation = simuler(charger_scenario(args.scenario), nb_workers=args.workers,
+                             valider=not args.sans_validation)
+    except ValueError as erreur:
+        print(f"Erreur : {erreur}", file=sys.stderr)
+        return 1
+
+    for avertissement in simulation['avertissements']:
+        print(f"Avertissement : {avertissement}", file=sys.stderr)
+
+    for chemin in ecrire_resultats(simulation, args.sortie, args.format_sortie):
+        print(chemin)
+
+    if args.sensibilite is not None:
+        scenario = charger_scenario(args.scenario)
+        tornade = analyser_sensibilite(scenario, pas=args.sensibilite, pas_taux=args.pas_taux,
+                                       nb_workers=args.workers, valider=False)
+        chemin = Path(args.sortie) / f"sensibilite.{args.format_sortie}"
+        if args.format_sortie == "parquet":
+            tornade.to_parquet(chemin, index=False)
+        else:
+            tornade.to_csv(chemin, index=False)
+        print(chemin)
+    return 0
+
+
+def _serialiser(valeur):
+    """Conversion JSON des valeurs NumPy / pandas / dates du résumé"""
+    if hasattr(valeur, 'item'):
+        return valeur.item()
+    if hasattr(valeur, 'tolist'):
+        return valeur.tolist()
+    return str(valeur)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,14 +10,30 @@ class Croissance(BaseSection):
             st.subheader("Hypothèses de Croissance et d'Inflation")
             st.divider()
             
+            # Simulation Monte Carlo : chaque hypothèse peut recevoir un écart-type (loi normale)
+            monte_carlo = st.checkbox("Simulation Monte Carlo des hypothèses", key="monte_carlo")
+            nb_tirages = 10000
+            if monte_carlo:
+                nb_tirages = st.number_input("Nombre de tirages", min_value=100, max_value=50000, value=10000, step=1000, key="nb_tirages")
+            distributions = {}
+            
             def input_with_frequency(label, key, default_value=0.0):
-                col1, col2 = st.columns([2, 1])
+                if monte_carlo:
+                    col1, col2, col3 = st.columns([2, 1, 1])
+                else:
+                    col1, col2 = st.columns([2, 1])
+                    col3 = None
                 with col1:
                     taux = st.number_input(label, min_value=0.0, max_value=10.0, value=default_value, step=0.1, key=key)
                 with col2:
                     frequence = st.selectbox("Fréquence de mise à jour", 
                                              options=["Annuelle", "Semestrielle", "Trimestrielle", "Mensuelle"],
                                              index=0, key=f"{key}_frequence")
+                if col3 is not None:
+                    with col3:
+                        ecart_type = st.number_input("Écart-type (points)", min_value=0.0, max_value=10.0, value=0.0, step=0.1, key=f"{key}_ecart_type")
+                    if ecart_type > 0:
+                        distributions[key] = {"loi": "normale", "ecart_type": ecart_type}
                 return taux, frequence
 
             data = {}
@@ -82,4 +98,8 @@ class Croissance(BaseSection):
             st.markdown("Estime l'évolution annuelle de tes revenus personnels.")
             data["taux_croissance_revenus"], data["frequence_taux_croissance_revenus"] = input_with_frequency("Croissance des Revenus Personnels (%)", "taux_croissance_revenus")
 
+            data["monte_carlo"] = monte_carlo
+            data["nb_tirages"] = nb_tirages
+            data["distributions"] = distributions
+
             DataStore.set("croissance", data)
@@ -45,23 +45,24 @@ class InputValidator:
             if pret.get("montant", 0) <= 0:
                 self.errors.append(f"Le montant du prêt {i+1} doit être positif")
             
-            if pret.get("taux", 0) < 0:
+            if pret.get("taux_interet", 0) < 0:
                 self.errors.append(f"Le taux du prêt {i+1} ne peut pas être négatif")
                 
-            if pret.get("duree", 0) <= 0:
+            if pret.get("duree_mois", 0) <= 0:
                 self.errors.append(f"La durée du prêt {i+1} doit être positive")
     
     def _validate_loyers(self):
-        loyers = self.data.get("loyers", {})
+        loyers = self.data.get("loyers", [])
         
         if not loyers:
             self.warnings.append("Le loyer mensuel n'est pas défini ou est nul")
             return
         
         # Vérification du taux de vacance raisonnable
-        taux_vacance = loyers.get("taux_vacance", 0)
-        if taux_vacance > 30:
-            self.warnings.append("Le taux de vacance semble très élevé (>30%)")
+        for i, loyer in enumerate(loyers):
+            taux_vacance = 100 - loyer.get("taux_occupation", 100)
+            if taux_vacance > 30:
+                self.warnings.append(f"Le taux de vacance du loyer {i+1} semble très élevé (>30%)")
     
     def _validate_travaux(self):
         travaux = self.data.get("travaux")
@@ -74,7 +75,7 @@ class InputValidator:
             self.warnings.append("Les charges n'ont pas été renseignées")
             
     def _validate_frais(self):
-        frais = self.data.get("frais")
+        frais = self.data.get("frais_global")
         if not frais:
             self.warnings.append("Les frais n'ont pas été renseignés")
         
@@ -91,11 +92,24 @@ class InputValidator:
             return 
         
         # Vérification des hypothèses de croissance réalistes
-        if croissance.get("croissance_loyer", 0) > 5:
+        if croissance.get("taux_augmentation_loyer", 0) > 5:
             self.warnings.append("L'hypothèse de croissance des loyers semble élevée (>5%)")
             
-        if croissance.get("inflation", 0) > 4:
+        if croissance.get("taux_inflation", 0) > 4:
             self.warnings.append("L'hypothèse d'inflation semble élevée (>4%)")
+        
+        # Lois des hypothèses tirées en simulation Monte Carlo
+        for cle, loi in croissance.get("distributions", {}).items():
+            nom = loi.get("loi", "normale").lower()
+            if nom == "normale" and loi.get("ecart_type", 0) < 0:
+                self.errors.append(f"L'écart-type de l'hypothèse {cle} ne peut pas être négatif")
+            elif nom == "uniforme" and not loi.get("min", 0) <= loi.get("max", 0):
+                self.errors.append(f"Le minimum de l'hypothèse {cle} doit être inférieur au maximum")
+            elif nom == "triangulaire" and not (loi.get("min", 0) <= loi.get("mode", croissance.get(cle, 0)) <= loi.get("max", 0)
+                                                and loi.get("min", 0) < loi.get("max", 0)):
+                self.errors.append(f"L'hypothèse {cle} doit vérifier minimum ≤ mode ≤ maximum (minimum < maximum)")
+            elif nom not in ("normale", "uniforme", "triangulaire"):
+                self.errors.append(f"Loi inconnue pour l'hypothèse {cle} : {loi.get('loi')}")
             
     def get_warnings(self):
         return self.warnings
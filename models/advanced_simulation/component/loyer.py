@@ -29,6 +29,9 @@ class Loyer(BaseSection):
                     loyer_mensuel = st.number_input("Montant du Loyer Mensuel (€)", min_value=0, value=1000, step=10, key=f"loyer_mensuel_{i}")
                     charges_mensuelles = st.number_input("Charges Mensuelles (optionnel) (€)", min_value=0, value=0, step=5, key=f"charges_mensuelles_{i}")
                     
+                    # Lots identiques (colocation, immeuble de rapport) : loyer et charges par lot
+                    nb_lots = st.number_input("Nombre de Lots Identiques", min_value=1, max_value=500, value=1, step=1, key=f"nb_lots_{i}")
+                    
                     # Jour de paiement
                     dernier_jour = st.checkbox("Paiement le dernier jour du mois ?", key=f"dernier_jour_{i}")
 
@@ -98,6 +101,7 @@ class Loyer(BaseSection):
                                 "loyer_mensuel": loyer_mensuel,
                                 "jour_paiement": jour_paiement,
                                 "charges_mensuelles": charges_mensuelles,
+                                "nb_lots": nb_lots,
                                 "duree_contrat_mois": duree_contrat_mois,
                                 "duree_contrat_annees": duree_contrat_annees,
                                 "start_date": start_date,
@@ -18,6 +18,15 @@ class Marche(BaseSection):
             st.markdown("### Taux de croissance des prix immobilier (%)")
             croissance_prix = st.number_input("Taux de Croissance des Prix (%)", min_value=-10.0, max_value=10.0, value=2.0, step=0.1, key="croissance_prix")
 
+            # Simulation stochastique du prix
+            st.markdown("### Simulation stochastique du prix")
+            simulation_stochastique = st.checkbox("Simuler des trajectoires aléatoires du prix", key="simulation_stochastique")
+            volatilite_prix = 5.0
+            nb_trajectoires = 1000
+            if simulation_stochastique:
+                volatilite_prix = st.number_input("Volatilité annuelle des prix (%)", min_value=0.0, max_value=50.0, value=5.0, step=0.5, key="volatilite_prix")
+                nb_trajectoires = st.number_input("Nombre de trajectoires", min_value=100, max_value=20000, value=1000, step=100, key="nb_trajectoires")
+
             # Loyer moyen au m²
             st.markdown("### Loyer moyen au m² (€)")
             loyer_m2 = st.number_input("Loyer moyen au m² (€)", min_value=0, max_value=500, value=15, step=1, key="loyer_m2")
@@ -79,6 +88,9 @@ class Marche(BaseSection):
             DataStore.set("marche", {
                 "prix_m2": prix_m2,
                 "croissance_prix": croissance_prix,
+                "simulation_stochastique": simulation_stochastique,
+                "volatilite_prix": volatilite_prix,
+                "nb_trajectoires": nb_trajectoires,
                 "loyer_m2": loyer_m2,
                 "rendement_locatif": rendement_locatif,
                 "vacance_locative": vacance_locative,
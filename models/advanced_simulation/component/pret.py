@@ -60,6 +60,57 @@ class Pret(BaseSection):
                         key=f"type_taux_{i}"
                     )
 
+                    # Paramètres de révision pour les taux non fixes
+                    taux_variable = {}
+                    if type_taux != "Fixe":
+                        cols = st.columns(2)
+                        with cols[0]:
+                            duree_fixe_mois = st.number_input(
+                                "Durée de la Phase à Taux Fixe (Mois)",
+                                min_value=0, max_value=600, step=12,
+                                value=60 if type_taux == "Taux Mixte" else 0,
+                                key=f"duree_fixe_{i}"
+                            )
+                            index_initial = st.number_input(
+                                "Index de Référence Initial (%)",
+                                min_value=-1.0, max_value=20.0, value=3.0, step=0.05,
+                                key=f"index_initial_{i}"
+                            )
+                        with cols[1]:
+                            periodicite_revision_mois = st.selectbox(
+                                "Révision du Taux (Mois)",
+                                options=[1, 3, 6, 12],
+                                index=3,
+                                key=f"periodicite_revision_{i}"
+                            )
+                            variation_index = st.number_input(
+                                "Évolution Annuelle de l'Index (points de %)",
+                                min_value=-5.0, max_value=5.0, value=0.0, step=0.05,
+                                key=f"variation_index_{i}"
+                            )
+
+                        taux_variable = {
+                            "duree_fixe_mois": duree_fixe_mois,
+                            "periodicite_revision_mois": periodicite_revision_mois,
+                            "index_initial": index_initial,
+                            "variation_index": variation_index,
+                        }
+
+                        if type_taux == "Capé":
+                            cols = st.columns(2)
+                            with cols[0]:
+                                taux_variable["cap"] = st.number_input(
+                                    "Cap à la Hausse (points de %)",
+                                    min_value=0.0, max_value=10.0, value=1.0, step=0.1,
+                                    key=f"cap_{i}"
+                                )
+                            with cols[1]:
+                                taux_variable["plancher"] = st.number_input(
+                                    "Plancher à la Baisse (points de %)",
+                                    min_value=0.0, max_value=10.0, value=1.0, step=0.1,
+                                    key=f"plancher_{i}"
+                                )
+
                     # Périodicité des remboursements
                     periodicite = st.selectbox(
                         "Périodicité des Remboursements", 
@@ -71,7 +122,7 @@ class Pret(BaseSection):
                     # Type de remboursement
                     type_remboursement = st.selectbox(
                         "Type de Remboursement", 
-                        options=["Amortissable", "Intérêts Seulement", "In Fine"],
+                        options=["Amortissable", "Intérêts Seulement", "In Fine", "Amortissement constant"],
                         index=0,
                         key=f"type_remboursement_{i}"
                     )
@@ -177,6 +228,7 @@ class Pret(BaseSection):
                                 "montant": montant_pret,
                                 "taux_interet": taux_interet,
                                 "type_taux": type_taux,
+                                "taux_variable": taux_variable,
                                 "frais_dossier": frais_dossier,
                                 "frais_assurance": frais_assurance,
                                 "frais_caution": frais_caution,
@@ -1,11 +1,12 @@
 import streamlit as st
 from models.advanced_simulation.component.base_section import BaseSection
-from models.advanced_simulation.computation.investment_model import InvestmentModel
 from models.advanced_simulation.displayer.display_factory import DisplayFactory
 
 class Result(BaseSection):
     
     def render(self):
+        # Import local : le package des composants est importé par les modules de calcul
+        from models.advanced_simulation.computation.investment_model import InvestmentModel
         
         st.header("Résumé du projet")
         model = InvestmentModel()
@@ -14,6 +15,8 @@ class Result(BaseSection):
         if not success:
             st.error("Impossible de calculer les résultats en raison d'erreurs dans les données fournies.")
             return
+        if model.depuis_cache:
+            st.caption("⚡ Données inchangées : résultats relus en cache.")
             
         # resultats = model.get_resultats()
         st.subheader("Résultat du Bien")
@@ -21,6 +24,7 @@ class Result(BaseSection):
         with tabs[0]:
             DisplayFactory(display="DISPLAY_RESULT_BIEN").render()
             DisplayFactory(display="DISPLAY_RESULT_V1").render()
+            DisplayFactory(display="DISPLAY_RESULT_BANDES_PRIX").render()
         with tabs[1]:
             DisplayFactory(display="DISPLAY_RESULT_V2").render()
             DisplayFactory(display="DISPLAY_RESULT_V3").render()
@@ -31,7 +35,7 @@ class Result(BaseSection):
         st.subheader("Résultat du Loyer")
         tabs = st.tabs(["Loyer1", "Loyer2", "Loyer3"])
         with tabs[0]:
-            pass
+            DisplayFactory(display="DISPLAY_RESULT_LOYER").render()
         with tabs[1]:
             pass
         with tabs[2]:
@@ -40,10 +44,16 @@ class Result(BaseSection):
         st.subheader("Résultat du Prêt")
         tabs = st.tabs(["Pret1", "Pret2", "Pret3"])
         with tabs[0]:
-            pass
+            DisplayFactory(display="DISPLAY_RESULT_PRET").render()
         with tabs[1]:
             pass
         with tabs[2]:
             pass
         
+        st.subheader("Résultat de la Trésorerie")
+        DisplayFactory(display="DISPLAY_RESULT_CASHFLOW").render()
+        
+        st.subheader("Simulation Monte Carlo")
+        DisplayFactory(display="DISPLAY_RESULT_MONTE_CARLO").render()
+        
         
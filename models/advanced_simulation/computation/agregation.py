@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from models.advanced_simulation.computation.cache import CacheLRU, copie_profonde
+
+
+class ServiceAgregation:
+    """
+    Agrégats mensuels, trimestriels et annuels partagés par les calculateurs et les affichages.
+
+    Les bornes des périodes du calendrier sont calculées une seule fois ; un journal daté
+    (journalier ou événementiel, trié par date) est agrégé par `np.add.reduceat` sur ces
+    bornes, sans copie ni regroupement sur chaînes de caractères. Les cubes obtenus
+    (tous les grains d'un journal) sont mis en cache par nom et version du résultat.
+    """
+
+    GRAINS = ['mois', 'trimestre', 'annee']
+
+    def __init__(self, dates, taille_cache=64):
+        """
+        Args:
+            dates (array-like): Calendrier journalier de la simulation
+            taille_cache (int): Nombre maximal de cubes conservés
+        """
+        self.dates = pd.DatetimeIndex(dates).values.astype('datetime64[ns]')
+        self.cache = CacheLRU(taille_max=taille_cache)
+
+        # Pour chaque grain : code de période de chaque jour, début de chaque période du calendrier
+        self._codes = {grain: self._coder(self.dates, grain) for grain in self.GRAINS}
+        self._bornes = {grain: self._debuts(codes) for grain, codes in self._codes.items()}
+        self._periodes = {grain: self._codes[grain][self._bornes[grain]] for grain in self.GRAINS}
+        for bornes in self._bornes.values():
+            bornes.setflags(write=False)
+
+    def bornes(self, grain='mois'):
+        """
+        Indice dans le calendrier du premier jour de chaque période.
+
+        Args:
+            grain (str): 'mois', 'trimestre' ou 'annee'
+
+        Returns:
+            np.ndarray: Indices croissants, en lecture seule
+        """
+        return self._bornes[grain]
+
+    def periodes(self, grain='mois'):
+        """
+        Dates de début des périodes du calendrier.
+
+        Args:
+            grain (str): 'mois', 'trimestre' ou 'annee'
+
+        Returns:
+            pd.DatetimeIndex: Une date par période
+        """
+        return pd.DatetimeIndex(self._etiquettes(self._periodes[grain], grain))
+
+    def agreger(self, df, grain='mois', stocks=()):
+        """
+        Agrège un journal daté sur les périodes du calendrier.
+
+        Les flux sont sommés ; les stocks prennent la dernière valeur connue de la période
+        (propagée sur les périodes sans mouvement). Les périodes sans ligne valent 0 pour
+        les flux.
+
+        Args:
+            df (pd.DataFrame): Journal trié par 'date', colonnes numériques à agréger
+            grain (str): 'mois', 'trimestre' ou 'annee'
+            stocks (iterable): Colonnes de stock (par exemple un capital restant dû)
+
+        Returns:
+            pd.DataFrame: Colonne 'periode' (début de période) puis une colonne par valeur
+        """
+        dates = df['date'].to_numpy(dtype='datetime64[ns]')
+        if len(dates) == len(self.dates) and np.array_equal(dates, self.dates):
+            codes, debuts = self._codes[grain], self._bornes[grain]
+        else:
+            codes = self._coder(dates, grain)
+            debuts = self._debuts(codes)
+
+        periodes = self._periodes[grain]
+        positions = np.searchsorted(periodes, codes[debuts])
+        dans_calendrier = (positions < len(periodes)) & (periodes[np.minimum(positions, len(periodes) - 1)]
+                                                         == codes[debuts])
+        fins = np.append(debuts[1:], len(dates))
+
+        resultat = {'periode': self._etiquettes(periodes, grain)}
+        for colonne in df.columns:
+            if colonne == 'date' or not pd.api.types.is_numeric_dtype(df[colonne]):
+                continue
+            valeurs = df[colonne].to_numpy(dtype=float)
+            if colonne in stocks:
+                agregat = np.full(len(periodes), np.nan)
+                if len(valeurs):
+                    agregat[positions[dans_calendrier]] = valeurs[fins - 1][dans_calendrier]
+                agregat = pd.Series(agregat).ffill().to_numpy()
+            else:
+                agregat = np.zeros(len(periodes))
+                if len(valeurs):
+                    agregat[positions[dans_calendrier]] = np.add.reduceat(valeurs, debuts)[dans_calendrier]
+            resultat[colonne] = agregat
+
+        return pd.DataFrame(resultat)
+
+    def cube(self, df, nom, version=None, stocks=()):
+        """
+        Tous les grains d'un journal, calculés une fois puis lus dans le cache.
+
+        Args:
+            df (pd.DataFrame): Journal trié par 'date'
+            nom (str): Nom du résultat, par exemple 'ComputeLoyer'
+            version (hashable, optional): Version du résultat (empreinte du contenu par défaut)
+            stocks (iterable): Colonnes de stock
+
+        Returns:
+            dict: Grain -> DataFrame agrégé (voir `agreger`), copie propre à l'appelant
+        """
+        if version is None:
+            version = int(pd.util.hash_pandas_object(df, index=False).sum())
+        cle = (nom, version, tuple(stocks))
+        return copie_profonde(self.cache.obtenir(
+            cle, lambda: {grain: self.agreger(df, grain, stocks) for grain in self.GRAINS}))
+
+    @staticmethod
+    def _coder(dates, grain):
+        """Code entier de la période de chaque date (mois, trimestres, années depuis 1970)"""
+        if grain == 'annee':
+            return dates.astype('datetime64[Y]').astype(np.int64)
+        mois = dates.astype('datetime64[M]').astype(np.int64)
+        return mois // 3 if grain == 'trimestre' else mois
+
+    @staticmethod
+    def _debuts(codes):
+        """Indices des premières lignes de chaque période (codes triés)"""
+        if len(codes) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+
+    @staticmethod
+    def _etiquettes(codes, grain):
+        """Date de début de chaque période codée"""
+        if grain == 'annee':
+            return codes.astype('datetime64[Y]').astype('datetime64[ns]')
+        mois = codes * 3 if grain == 'trimestre' else codes
+        return mois.astype('datetime64[M]').astype('datetime64[ns]')
@@ -0,0 +1,465 @@
+import bisect
+
+import numpy as np
+
+from models.advanced_simulation.computation.cache import CacheLRU
+
+
+# Nature du segment d'amortissement pour chaque profil de remboursement
+PROFILS = {
+    "Amortissable": 'amortissable',
+    "Mensualités constantes": 'amortissable',
+    "Intérêts Seulement": 'in_fine',
+    "In Fine": 'in_fine',
+    "Amortissement constant": 'amortissement_constant',
+}
+
+# Natures de segment qui remboursent le capital au terme
+NATURES_REMBOURSEMENT = ('amortissable', 'in_fine', 'amortissement_constant')
+
+# Nombre d'échéances par an pour chaque périodicité
+PERIODES_PAR_AN = {
+    "Mensuelle": 12,
+    "Trimestrielle": 4,
+    "Semestrielle": 2,
+    "Annuelle": 1,
+}
+
+# Échéanciers partagés par les pages et les calculateurs, clés normalisées
+CACHE_ECHEANCIERS = CacheLRU(taille_max=512, memoire_max=64 * 1024 ** 2)
+
+
+class Echeancier:
+    """
+    Tableau d'amortissement décrit par une liste triée de segments.
+
+    Chaque segment couvre les périodes [debut, fin) et porte son propre capital de départ,
+    son taux par période et son échéance : le capital restant y suit une forme fermée selon
+    le profil de remboursement (annuité constante : C_j = C_0 (1 + t)^j - E ((1 + t)^j - 1) / t,
+    amortissement constant : C_j = C_0 - A j, in fine : C_j = C_0). Un remboursement anticipé
+    ne fait que tronquer le segment courant et en ouvrir un nouveau, sans recalculer les périodes.
+    Les tableaux par période ne sont matérialisés qu'une fois, par `calculer()`.
+
+    Le taux peut être un tableau de forme (nb_chemins,) : les segments portent alors un capital,
+    un taux et une échéance par chemin, et `calculer()` renvoie des tableaux (nb_chemins,
+    nb_periodes). Les révisions de taux s'appliquent ainsi à plusieurs chemins d'index en un
+    seul échéancier (la réduction de durée reste réservée au cas scalaire).
+    """
+
+    def __init__(self, montant, taux_par_periode, nb_periodes, periode_differe=0,
+                 taux_differe_par_periode=None, type_differe="Aucun", type_remboursement="Amortissable"):
+        """
+        Args:
+            montant (float): Capital emprunté
+            taux_par_periode (float | np.ndarray): Taux d'intérêt par période (décimal), un par chemin
+            nb_periodes (int): Nombre total de périodes, différé compris
+            periode_differe (int): Nombre de périodes de différé
+            taux_differe_par_periode (float, optional): Taux par période pendant le différé
+            type_differe (str): "Partiel (Intérêts)", "Total (Pas de paiement)" ou "Aucun"
+            type_remboursement (str): "Amortissable", "Intérêts Seulement", "In Fine"
+                                      ou "Amortissement constant"
+        """
+        self.nb_periodes = int(nb_periodes)
+        periode_differe = min(max(int(periode_differe), 0), self.nb_periodes)
+        if taux_differe_par_periode is None:
+            taux_differe_par_periode = taux_par_periode
+
+        self.segments = []
+        self.evenements = []  # Remboursements anticipés : (échéance, capital remboursé, pénalité, ajuster capital)
+
+        if periode_differe > 0:
+            nature = 'differe_total' if 'Total' in type_differe else 'differe_partiel'
+            self._ajouter_segment(nature, 0, periode_differe, float(montant), taux_differe_par_periode)
+
+        if periode_differe < self.nb_periodes:
+            nature = PROFILS.get(type_remboursement, 'amortissable')
+            self._ajouter_segment(nature, periode_differe, self.nb_periodes,
+                                  self._capital_fin_segments(float(montant)), taux_par_periode)
+
+    def capital_avant(self, periode):
+        """Capital restant dû juste avant l'échéance `periode` (par chemin), en O(log(segments))"""
+        if not self.segments or periode <= self.segments[0]['debut']:
+            return self.segments[0]['capital'] if self.segments else 0.0
+        i = self._indice_segment(periode - 1)
+        segment = self.segments[i]
+        return _valeur(_capital_apres(segment, periode - segment['debut']))
+
+    def rembourser(self, periode, montant, penalite=0.0, type_remb="Partiel"):
+        """
+        Applique un remboursement anticipé versé entre les échéances `periode - 1` et `periode`.
+
+        Le remboursement et sa pénalité sont comptabilisés sur l'échéance `periode - 1`.
+        Les échéances suivantes repartent du nouveau capital : à durée constante
+        (réduction de mensualité, par défaut) ou à échéance constante (réduction de durée).
+
+        Args:
+            periode (int): Première échéance postérieure au remboursement
+            montant (float): Montant versé, pénalité comprise
+            penalite (float): Taux de pénalité (décimal) appliqué au montant versé
+            type_remb (str): "Partiel", "Total" ou un libellé contenant "reduction_duree"
+        """
+        fin = self.segments[-1]['fin'] if self.segments else 0
+        if montant <= 0 or periode >= fin:
+            return
+
+        periode = max(int(periode), self.segments[0]['debut'])
+        capital_avant = self.capital_avant(periode)
+        montant_penalite = montant * penalite
+        capital_rembourse = _valeur(np.minimum(montant - montant_penalite, capital_avant))
+        nouveau_capital = capital_avant - capital_rembourse
+
+        # Avant la première échéance, le nouveau capital est directement celui du segment repris
+        self.evenements.append((max(periode - 1, 0), capital_rembourse, montant_penalite, periode > 0))
+
+        self._reprendre(periode, nouveau_capital, reduction_duree='reduction_duree' in type_remb.lower())
+
+    def reviser_taux(self, periode, taux_par_periode):
+        """
+        Révise le taux des échéances de remboursement à partir de l'échéance `periode`.
+
+        L'échéance est recalculée sur la durée restante avec le nouveau taux ; le différé
+        éventuel conserve son propre taux.
+
+        Args:
+            periode (int): Première échéance au nouveau taux
+            taux_par_periode (float | np.ndarray): Nouveau taux par période (décimal), un par chemin
+        """
+        fin = self.segments[-1]['fin'] if self.segments else 0
+        if periode >= fin:
+            return
+        periode = max(int(periode), self.segments[0]['debut'])
+        self._reprendre(periode, self.capital_avant(periode), taux=taux_par_periode)
+
+    def appliquer(self, evenements):
+        """
+        Applique dans l'ordre une suite de révisions de taux et de remboursements anticipés.
+
+        Args:
+            evenements (iterable): Tuples (periode, 'revision', taux_par_periode) ou
+                                   (periode, 'remboursement', montant, penalite, type_remb)
+
+        Returns:
+            Echeancier: L'échéancier lui-même
+        """
+        for periode, nature, *parametres in evenements:
+            if nature == 'revision':
+                self.reviser_taux(periode, *parametres)
+            else:
+                self.rembourser(periode, *parametres)
+        return self
+
+    def calculer(self):
+        """
+        Matérialise l'échéancier en tableaux NumPy, segment par segment.
+
+        Returns:
+            dict: Tableaux 'paiement', 'interets', 'interets_payes', 'principal',
+                  'capital_restant', 'remboursement_anticipe' et 'penalite' (une valeur par
+                  échéance, et par chemin si le taux est un tableau). 'interets_payes' exclut
+                  les intérêts capitalisés pendant un différé total
+        """
+        nb_periodes = self.segments[-1]['fin'] if self.segments else 0
+        if self.evenements:
+            nb_periodes = max(nb_periodes, max(evenement[0] for evenement in self.evenements) + 1)
+        forme = np.broadcast_shapes(*(np.shape(segment[cle]) for segment in self.segments
+                                      for cle in ('capital', 'taux', 'echeance'))) + (nb_periodes,)
+
+        paiement = np.zeros(forme)
+        interets = np.zeros(forme)
+        interets_payes = np.zeros(forme)
+        principal = np.zeros(forme)
+        capital_restant = np.zeros(forme)
+        remboursement_anticipe = np.zeros(forme)
+        penalite = np.zeros(forme)
+
+        for segment in self.segments:
+            debut, fin = segment['debut'], segment['fin']
+            j = np.arange(1, fin - debut + 1)
+            capital_fin = _capital_apres(segment, j)
+            capital_debut = np.concatenate(
+                (np.broadcast_to(_etendre(segment['capital']), capital_fin[..., :1].shape), capital_fin[..., :-1]),
+                axis=-1)
+
+            capital_restant[..., debut:fin] = capital_fin
+            interets[..., debut:fin] = capital_debut * _etendre(segment['taux'])
+            paiement[..., debut:fin] = _etendre(segment['echeance'])
+            if segment['nature'] != 'differe_total':
+                interets_payes[..., debut:fin] = interets[..., debut:fin]
+            if segment['nature'] == 'differe_total':
+                principal[..., debut:fin] = 0.0
+            elif segment['nature'] == 'amortissement_constant':
+                principal[..., debut:fin] = capital_debut - capital_fin
+                paiement[..., debut:fin] = principal[..., debut:fin] + interets[..., debut:fin]
+            else:
+                principal[..., debut:fin] = _etendre(segment['echeance']) - interets[..., debut:fin]
+
+        # La dernière échéance solde le capital (absorbe l'arrondi ou l'échéance réduite)
+        if self.segments and self.segments[-1]['solde']:
+            dernier = self.segments[-1]['fin'] - 1
+            capital_precedent = capital_restant[..., dernier] + principal[..., dernier]
+            principal[..., dernier] = capital_precedent
+            paiement[..., dernier] = capital_precedent + interets[..., dernier]
+            capital_restant[..., dernier] = 0.0
+
+        # Remboursements anticipés et pénalités sur l'échéance qui les précède
+        for periode, capital_rembourse, montant_penalite, ajuster_capital in self.evenements:
+            remboursement_anticipe[..., periode] += capital_rembourse
+            penalite[..., periode] += montant_penalite
+            principal[..., periode] += capital_rembourse
+            paiement[..., periode] += capital_rembourse + montant_penalite
+            if ajuster_capital:
+                capital_restant[..., periode] -= capital_rembourse
+
+        return {
+            'paiement': paiement,
+            'interets': interets,
+            'interets_payes': interets_payes,
+            'principal': principal,
+            'capital_restant': capital_restant,
+            'remboursement_anticipe': remboursement_anticipe,
+            'penalite': penalite,
+        }
+
+    def _reprendre(self, periode, capital, taux=None, reduction_duree=False):
+        """
+        Tronque l'échéancier avant `periode` et reprend les segments suivants depuis `capital`.
+
+        Args:
+            periode (int): Première échéance reprise
+            capital (float): Capital restant dû avant l'échéance `periode` (0 : prêt soldé)
+            taux (float, optional): Nouveau taux par période des échéances de remboursement
+            reduction_duree (bool): Conserver l'échéance et raccourcir la durée
+        """
+        i = self._indice_segment(periode)
+        suivants = self.segments[i:]
+        self.segments = self.segments[:i]
+        if suivants[0]['debut'] < periode:
+            self.segments.append(dict(suivants[0], fin=periode, solde=False))
+
+        if np.all(np.asarray(capital) <= 0):
+            return
+
+        for segment in suivants:
+            debut = max(segment['debut'], periode)
+            if segment['nature'] in NATURES_REMBOURSEMENT:
+                nature = segment['nature']
+                taux_segment = segment['taux'] if taux is None else taux
+                if reduction_duree and nature == 'amortissable':
+                    duree = _duree_restante(capital, taux_segment, segment['echeance'])
+                    terme = min(debut + duree, segment['terme'])
+                    self._ajouter_segment(nature, debut, terme, capital, taux_segment,
+                                          echeance=segment['echeance'])
+                elif reduction_duree and nature == 'amortissement_constant':
+                    duree = int(np.ceil(capital / segment['amortissement'] - 1e-9))
+                    terme = min(debut + duree, segment['terme'])
+                    self._ajouter_segment(nature, debut, terme, capital, taux_segment,
+                                          amortissement=segment['amortissement'])
+                else:
+                    # In fine : le capital n'est remboursé qu'au terme, la durée est conservée
+                    self._ajouter_segment(nature, debut, segment['fin'], capital, taux_segment,
+                                          terme=segment['terme'])
+            else:
+                self._ajouter_segment(segment['nature'], debut, segment['fin'], capital, segment['taux'])
+            capital = _valeur(_capital_apres(self.segments[-1], segment['fin'] - debut))
+
+    def _ajouter_segment(self, nature, debut, fin, capital, taux, echeance=None, terme=None,
+                         amortissement=None):
+        """
+        Ajoute un segment [debut, fin) ; l'échéance dépend de sa nature.
+
+        Pour un segment de remboursement, `terme` est l'échéance à laquelle le capital est
+        soldé (par défaut `fin`) : l'échéance constante ou l'amortissement constant est
+        calculé jusqu'à ce terme. Pour l'amortissement constant, `echeance` est la première
+        échéance du segment.
+        """
+        if fin <= debut:
+            return
+        terme = fin if terme is None else terme
+        if nature == 'amortissement_constant' and amortissement is None:
+            amortissement = capital / (terme - debut)
+        if echeance is None:
+            if nature == 'differe_total':
+                echeance = 0.0
+            elif nature in ('differe_partiel', 'in_fine'):
+                echeance = capital * taux
+            elif nature == 'amortissement_constant':
+                echeance = amortissement + capital * taux
+            else:
+                echeance = calculer_echeance(capital, taux, terme - debut)
+        self.segments.append({
+            'nature': nature,
+            'debut': debut,
+            'fin': fin,
+            'terme': terme,
+            'capital': capital,
+            'taux': taux,
+            'echeance': echeance,
+            'amortissement': amortissement,
+            'solde': nature in NATURES_REMBOURSEMENT and fin == terme,  # Le segment solde tout son capital
+        })
+
+    def _capital_fin_segments(self, capital_initial):
+        """Capital restant à la fin du dernier segment (ou capital initial sans segment)"""
+        if not self.segments:
+            return capital_initial
+        segment = self.segments[-1]
+        return _valeur(_capital_apres(segment, segment['fin'] - segment['debut']))
+
+    def _indice_segment(self, periode):
+        """Indice du segment contenant `periode` (recherche dichotomique)"""
+        debuts = [segment['debut'] for segment in self.segments]
+        return max(bisect.bisect_right(debuts, periode) - 1, 0)
+
+
+def calculer_echeancier(montant, taux_par_periode, nb_periodes, periode_differe=0,
+                        taux_differe_par_periode=None, type_differe="Aucun", type_remboursement="Amortissable"):
+    """
+    Calcule un tableau d'amortissement en une seule passe NumPy.
+
+    Profils de remboursement : échéances constantes ("Amortissable"), capital remboursé au
+    terme avec paiement des seuls intérêts ("In Fine", "Intérêts Seulement") ou part de
+    capital constante ("Amortissement constant"). Pendant le différé, le capital reste constant (différé partiel : seuls les intérêts
+    sont payés) ou est augmenté des intérêts capitalisés (différé total : aucun paiement).
+    Le profil s'applique ensuite au capital restant à la fin du différé.
+
+    Args:
+        montant (float): Capital emprunté
+        taux_par_periode (float): Taux d'intérêt par période (décimal)
+        nb_periodes (int): Nombre total de périodes, différé compris
+        periode_differe (int): Nombre de périodes de différé
+        taux_differe_par_periode (float, optional): Taux par période pendant le différé
+        type_differe (str): "Partiel (Intérêts)", "Total (Pas de paiement)" ou "Aucun"
+        type_remboursement (str): Profil de remboursement (voir `PROFILS`)
+
+    Returns:
+        dict: Tableaux NumPy 'paiement', 'interets', 'principal' et 'capital_restant'
+    """
+    echeancier = Echeancier(montant, taux_par_periode, nb_periodes, periode_differe,
+                            taux_differe_par_periode, type_differe, type_remboursement)
+    resultat = echeancier.calculer()
+    return {cle: resultat[cle] for cle in ['paiement', 'interets', 'principal', 'capital_restant']}
+
+
+def echeancier_en_cache(montant, taux_par_periode, nb_periodes, periode_differe=0,
+                        taux_differe_par_periode=None, type_differe="Aucun",
+                        type_remboursement="Amortissable", evenements=()):
+    """
+    Échéancier complet lu dans `CACHE_ECHEANCIERS`, calculé seulement au premier appel.
+
+    La clé est normalisée : montants et taux arrondis, libellés ramenés à la nature de
+    segment, événements triés. Les tableaux renvoyés sont partagés, donc en lecture seule.
+
+    Args:
+        montant (float): Capital emprunté
+        taux_par_periode (float): Taux d'intérêt par période (décimal)
+        nb_periodes (int): Nombre total de périodes, différé compris
+        periode_differe (int): Nombre de périodes de différé
+        taux_differe_par_periode (float, optional): Taux par période pendant le différé
+        type_differe (str): "Partiel (Intérêts)", "Total (Pas de paiement)" ou "Aucun"
+        type_remboursement (str): Profil de remboursement (voir `PROFILS`)
+        evenements (iterable): Révisions et remboursements anticipés (voir `Echeancier.appliquer`)
+
+    Returns:
+        dict: Tableaux 'paiement', 'interets', 'interets_payes', 'principal', 'capital_restant',
+              'remboursement_anticipe' et 'penalite'
+    """
+    if taux_differe_par_periode is None:
+        taux_differe_par_periode = taux_par_periode
+    periode_differe = int(periode_differe)
+    nature_differe = 'aucun' if periode_differe <= 0 else (
+        'differe_total' if 'Total' in type_differe else 'differe_partiel')
+    evenements = tuple(sorted((tuple(_normaliser(v) for v in e) for e in evenements),
+                              key=lambda e: (e[0], e[1] != 'revision')))
+
+    cle = (_normaliser(montant), _normaliser(taux_par_periode), int(nb_periodes), max(periode_differe, 0),
+           _normaliser(taux_differe_par_periode) if periode_differe > 0 else None, nature_differe,
+           PROFILS.get(type_remboursement, 'amortissable'), evenements)
+
+    def calculer():
+        echeancier = Echeancier(montant, taux_par_periode, nb_periodes, periode_differe,
+                                taux_differe_par_periode, type_differe, type_remboursement)
+        resultat = echeancier.appliquer(evenements).calculer()
+        for tableau in resultat.values():
+            tableau.setflags(write=False)
+        return resultat
+
+    return CACHE_ECHEANCIERS.obtenir(cle, calculer)
+
+
+def calculer_echeancier_annuel(montant, taux_annuel, duree_mois, periodicite="Mensuelle",
+                               type_remboursement="Amortissable"):
+    """
+    Tableau d'amortissement à partir des paramètres saisis : taux annuel en %, durée en mois.
+
+    Args:
+        montant (float): Capital emprunté
+        taux_annuel (float): Taux d'intérêt annuel (%)
+        duree_mois (int): Durée du prêt en mois
+        periodicite (str): "Mensuelle", "Trimestrielle", "Semestrielle" ou "Annuelle"
+        type_remboursement (str): Profil de remboursement (voir `PROFILS`)
+
+    Returns:
+        dict: Tableaux NumPy en lecture seule (voir `echeancier_en_cache`)
+    """
+    periodes_par_an = PERIODES_PAR_AN.get(periodicite, 12)
+    nb_periodes = int(duree_mois * periodes_par_an / 12)
+    return echeancier_en_cache(montant, taux_annuel / 100 / periodes_par_an, nb_periodes,
+                               type_remboursement=type_remboursement)
+
+
+def calculer_echeance(capital, taux_par_periode, nb_periodes):
+    """Échéance constante remboursant `capital` en `nb_periodes` au taux donné (scalaires ou tableaux)"""
+    capital, taux = np.broadcast_arrays(np.asarray(capital, dtype=float), np.asarray(taux_par_periode, dtype=float))
+    if nb_periodes <= 0:
+        return _valeur(np.zeros(capital.shape))
+    avec_taux = taux != 0
+    r = np.where(avec_taux, taux, 1.0)
+    return _valeur(np.where(avec_taux, capital * r / (1 - (1 + r) ** -nb_periodes), capital / nb_periodes))
+
+
+def _normaliser(valeur):
+    """Arrondit les nombres d'une clé de cache pour absorber le bruit de calcul flottant"""
+    if isinstance(valeur, (float, np.floating)):
+        return round(float(valeur), 10)
+    if isinstance(valeur, (int, np.integer)):
+        return int(valeur)
+    return valeur
+
+
+def _capital_apres(segment, j):
+    """
+    Capital restant après `j` échéances d'un segment (forme fermée).
+
+    `j` est un scalaire ou un tableau d'échéances ; le résultat a pour forme celle des
+    chemins du segment suivie de celle de `j`.
+    """
+    j = np.asarray(j)
+    capital, taux, echeance = (_etendre(segment[cle], j.ndim) for cle in ('capital', 'taux', 'echeance'))
+    if segment['nature'] == 'amortissement_constant':
+        return capital - _etendre(segment['amortissement'], j.ndim) * j
+    if segment['nature'] in ('differe_partiel', 'in_fine'):
+        return capital + 0.0 * j
+    facteur = (1 + taux) ** j
+    avec_taux = taux != 0
+    r = np.where(avec_taux, taux, 1.0)
+    return np.where(avec_taux, capital * facteur - echeance * (facteur - 1) / r, capital - echeance * j)
+
+
+def _etendre(valeur, nb_axes=1):
+    """Ajoute `nb_axes` axes de période après les axes de chemin d'une valeur de segment"""
+    return np.reshape(valeur, np.shape(valeur) + (1,) * nb_axes)
+
+
+def _valeur(tableau):
+    """Scalaire Python pour un seul chemin, tableau sinon"""
+    tableau = np.asarray(tableau)
+    return float(tableau) if tableau.ndim == 0 else tableau
+
+
+def _duree_restante(capital, taux, echeance):
+    """Nombre d'échéances (arrondi au supérieur) pour solder `capital` à échéance constante"""
+    if taux == 0:
+        return int(np.ceil(capital / echeance - 1e-9))
+    if echeance <= capital * taux:
+        return np.iinfo(np.int32).max  # Échéance insuffisante pour couvrir les intérêts
+    return int(np.ceil(np.log(echeance / (echeance - capital * taux)) / np.log(1 + taux) - 1e-9))
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+
+class CacheLRU:
+    """
+    Cache LRU borné en nombre d'entrées et en mémoire, avec statistiques de succès.
+
+    Quand l'une des deux limites est dépassée, les entrées les moins récemment utilisées
+    sont évincées. Les accès sont protégés par un verrou : le cache peut être partagé
+    entre pages Streamlit et calculateurs exécutés en parallèle.
+    """
+
+    def __init__(self, taille_max=256, memoire_max=64 * 1024 ** 2):
+        """
+        Args:
+            taille_max (int): Nombre maximal d'entrées
+            memoire_max (int): Mémoire maximale occupée par les valeurs (octets)
+        """
+        self.taille_max = taille_max
+        self.memoire_max = memoire_max
+        self._entrees = OrderedDict()  # clé -> (valeur, taille en octets)
+        self._memoire = 0
+        self._verrou = threading.RLock()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def get(self, cle, defaut=None):
+        """Valeur associée à `cle` (marquée comme la plus récente), ou `defaut`"""
+        with self._verrou:
+            if cle in self._entrees:
+                self._entrees.move_to_end(cle)
+                self.succes += 1
+                return self._entrees[cle][0]
+            self.echecs += 1
+            return defaut
+
+    def set(self, cle, valeur):
+        """Enregistre `valeur` puis évince les entrées les plus anciennes si nécessaire"""
+        taille = taille_octets(valeur)
+        with self._verrou:
+            if cle in self._entrees:
+                self._memoire -= self._entrees.pop(cle)[1]
+            if taille > self.memoire_max:
+                return valeur  # Trop volumineuse pour être conservée
+            self._entrees[cle] = (valeur, taille)
+            self._memoire += taille
+            while len(self._entrees) > self.taille_max or self._memoire > self.memoire_max:
+                _, (_, taille_evincee) = self._entrees.popitem(last=False)
+                self._memoire -= taille_evincee
+                self.evictions += 1
+        return valeur
+
+    def obtenir(self, cle, calculer):
+        """
+        Valeur en cache pour `cle`, calculée par `calculer()` puis enregistrée en cas d'échec.
+
+        Args:
+            cle (hashable): Clé normalisée
+            calculer (callable): Fonction sans argument produisant la valeur
+
+        Returns:
+            object: Valeur en cache ou nouvellement calculée
+        """
+        manquant = object()
+        valeur = self.get(cle, manquant)
+        if valeur is manquant:
+            valeur = self.set(cle, calculer())
+        return valeur
+
+    def vider(self):
+        """Supprime toutes les entrées et remet les statistiques à zéro"""
+        with self._verrou:
+            self._entrees.clear()
+            self._memoire = 0
+            self.succes = self.echecs = self.evictions = 0
+
+    def statistiques(self):
+        """
+        Returns:
+            dict: 'succes', 'echecs', 'taux_succes', 'evictions', 'entrees' et 'memoire' (octets)
+        """
+        with self._verrou:
+            acces = self.succes + self.echecs
+            return {
+                'succes': self.succes,
+                'echecs': self.echecs,
+                'taux_succes': self.succes / acces if acces else 0.0,
+                'evictions': self.evictions,
+                'entrees': len(self._entrees),
+                'memoire': self._memoire,
+            }
+
+    def __contains__(self, cle):
+        with self._verrou:
+            return cle in self._entrees
+
+    def __len__(self):
+        return len(self._entrees)
+
+
+# Caches de simulation, définis ici (et non dans compute_manager / investment_model) pour être
+# importables sans charger les composants.
+
+# Sorties des calculateurs de ComputeManager, par calculateur et empreinte de ses entrées
+CACHE_CALCULS = CacheLRU(taille_max=64, memoire_max=256 * 1024 ** 2)
+
+# Résultats complets d'InvestmentModel, par empreinte des sections saisies
+CACHE_MODELES = CacheLRU(taille_max=32, memoire_max=256 * 1024 ** 2)
+
+
+def taille_octets(valeur):
+    """Estimation de la mémoire occupée par une valeur (tableaux, DataFrames, conteneurs)"""
+    if isinstance(valeur, np.ndarray):
+        return valeur.nbytes
+    if isinstance(valeur, (pd.DataFrame, pd.Series)):
+        return int(np.sum(valeur.memory_usage(deep=True)))
+    if isinstance(valeur, dict):
+        return sys.getsizeof(valeur) + sum(taille_octets(v) for v in valeur.values())
+    if isinstance(valeur, (list, tuple)):
+        return sys.getsizeof(valeur) + sum(taille_octets(v) for v in valeur)
+    return sys.getsizeof(valeur)
+
+
+def copie_profonde(valeur):
+    """
+    Copie indépendante d'une valeur mise en cache (DataFrames, tableaux, dicts, listes, tuples).
+
+    Les caches de résultats ne distribuent que des copies : un appelant qui modifie en place
+    un DataFrame reçu ne peut pas altérer l'entrée conservée pour les exécutions suivantes.
+    """
+    if isinstance(valeur, (pd.DataFrame, pd.Series)):
+        return valeur.copy(deep=True)
+    if isinstance(valeur, np.ndarray):
+        return valeur.copy()
+    if isinstance(valeur, dict):
+        return {cle: copie_profonde(v) for cle, v in valeur.items()}
+    if isinstance(valeur, (list, tuple)):
+        return type(valeur)(copie_profonde(v) for v in valeur)
+    return valeur
+
+
+def empreinte(valeur):
+    """
+    Empreinte stable du contenu d'une valeur (sections du DataStore : dicts, listes, dates, nombres).
+
+    Les clés des dicts sont triées ; un contexte figé (MappingProxyType, tuples) a la même
+    empreinte que les dicts et listes d'origine. Les autres valeurs non sérialisables en JSON
+    (dates, scalaires NumPy) sont converties en texte.
+    """
+    texte = json.dumps(valeur, sort_keys=True, default=_serialisable, ensure_ascii=False)
+    return hashlib.sha1(texte.encode('utf-8')).hexdigest()
+
+
+def _serialisable(valeur):
+    """Conversion JSON des valeurs hors types natifs : mappings figés en dicts, le reste en texte"""
+    if isinstance(valeur, Mapping):
+        return dict(valeur)
+    return str(valeur)
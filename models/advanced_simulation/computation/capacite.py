@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def capital_maximal(echeance, taux_annuel, nb_periodes, periodes_par_an=12):
+    """
+    Capital maximal remboursable par une échéance constante donnée.
+
+    Tous les arguments acceptent des scalaires ou des tableaux NumPy diffusables entre eux :
+    une grille taux × durée complète est résolue en un seul appel.
+
+    Args:
+        echeance (float | np.ndarray): Échéance disponible par période
+        taux_annuel (float | np.ndarray): Taux d'intérêt annuel (décimal)
+        nb_periodes (int | np.ndarray): Nombre d'échéances
+        periodes_par_an (int): Nombre d'échéances par an
+
+    Returns:
+        np.ndarray: Capital maximal (forme diffusée des arguments)
+    """
+    echeance, taux, nb_periodes = np.broadcast_arrays(
+        np.asarray(echeance, dtype=float),
+        np.asarray(taux_annuel, dtype=float) / periodes_par_an,
+        np.asarray(nb_periodes, dtype=float))
+    avec_taux = taux != 0
+    r = np.where(avec_taux, taux, 1.0)
+    return np.where(avec_taux,
+                    echeance * (1 - (1 + r) ** -nb_periodes) / r,
+                    echeance * nb_periodes)
+
+
+def duree_minimale(capital, echeance, taux_annuel, periodes_par_an=12):
+    """
+    Nombre minimal d'échéances pour rembourser `capital` sans dépasser l'échéance donnée.
+
+    Args:
+        capital (float | np.ndarray): Capital emprunté
+        echeance (float | np.ndarray): Échéance maximale par période
+        taux_annuel (float | np.ndarray): Taux d'intérêt annuel (décimal)
+        periodes_par_an (int): Nombre d'échéances par an
+
+    Returns:
+        np.ndarray: Nombre d'échéances (arrondi au supérieur), np.inf si l'échéance
+                    ne couvre pas les intérêts
+    """
+    capital, echeance, taux = np.broadcast_arrays(
+        np.asarray(capital, dtype=float),
+        np.asarray(echeance, dtype=float),
+        np.asarray(taux_annuel, dtype=float) / periodes_par_an)
+    avec_taux = taux != 0
+    r = np.where(avec_taux, taux, 1.0)
+    couvre_interets = echeance > capital * taux
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        duree = np.where(avec_taux,
+                         np.log(echeance / (echeance - capital * r)) / np.log1p(r),
+                         capital / echeance)
+    duree = np.ceil(duree - 1e-9)
+    return np.where(couvre_interets & (echeance > 0), duree, np.inf)
+
+
+def taux_maximal(capital, echeance, nb_periodes, periodes_par_an=12, tolerance=1e-10, max_iterations=100):
+    """
+    Taux annuel maximal pour lequel l'échéance constante de `capital` ne dépasse pas `echeance`.
+
+    L'échéance croît avec le taux : la racine est encadrée par [0, echeance / capital] (taux
+    par période) puis obtenue par dichotomie vectorisée, tous les points de la grille à la fois.
+
+    Args:
+        capital (float | np.ndarray): Capital emprunté
+        echeance (float | np.ndarray): Échéance maximale par période
+        nb_periodes (int | np.ndarray): Nombre d'échéances
+        periodes_par_an (int): Nombre d'échéances par an
+        tolerance (float): Largeur d'encadrement visée sur le taux par période
+        max_iterations (int): Nombre maximal d'itérations
+
+    Returns:
+        np.ndarray: Taux annuel maximal (décimal), np.nan si l'échéance ne rembourse
+                    pas le capital même à taux nul
+    """
+    capital, echeance, nb_periodes = np.broadcast_arrays(
+        np.asarray(capital, dtype=float),
+        np.asarray(echeance, dtype=float),
+        np.asarray(nb_periodes, dtype=float))
+    bas = np.zeros(capital.shape)
+    haut = np.divide(echeance, capital, out=np.zeros(capital.shape), where=capital > 0)
+
+    for _ in range(max_iterations):
+        milieu = (bas + haut) / 2
+        trop_cher = _echeance(capital, milieu, nb_periodes) > echeance
+        haut = np.where(trop_cher, milieu, haut)
+        bas = np.where(trop_cher, bas, milieu)
+        if np.all(haut - bas < tolerance):
+            break
+
+    realisable = (capital <= echeance * nb_periodes) & (nb_periodes > 0)
+    return np.where(realisable, bas * periodes_par_an, np.nan)
+
+
+def _echeance(capital, taux_periode, nb_periodes):
+    """Échéance constante vectorisée (taux par période, nul autorisé)"""
+    avec_taux = taux_periode != 0
+    r = np.where(avec_taux, taux_periode, 1.0)
+    return np.where(avec_taux, capital * r / (1 - (1 + r) ** -nb_periodes), capital / nb_periodes)
@@ -10,10 +10,19 @@ class ComputeBien(BaseCompute):
     Classe pour calculer les revenus locatifs basés sur différents contrats de location.
     Met à jour les prix corrigés à différentes fréquences selon l'inflation et la croissance.
     Les prix restent fixes entre les mises à jour et les taux sont ajustés en fonction de la fréquence.
+    
+    En mode stochastique (`simulation_stochastique` de la section Marché), des trajectoires
+    lognormales du prix sont aussi simulées sur une grille mensuelle (voir `simuler_trajectoires`).
     """
+    
+    PERCENTILES = (5, 25, 50, 75, 95)
 
-    def __init__(self):
-        super().__init__()
+    SECTIONS = ('bien', 'marche',
+                'croissance.taux_inflation', 'croissance.frequence_taux_inflation',
+                'croissance.taux_croissance_annuel', 'croissance.frequence_taux_croissance_annuel')
+
+    def __init__(self, contexte=None):
+        super().__init__(contexte)
         self.results = {}
         self.prix_initial = self.bien["prix_achat"]
         self.surface = self.bien["surface"]
@@ -27,20 +36,13 @@ class ComputeBien(BaseCompute):
         self.frequence_growth = self.croissance.get("frequence_taux_croissance_annuel", "Annuelle")  # Default: Annuelle
 
         # Conversion des fréquences en années décimales
-        self.frequences = {
-            "Annuelle": 1,
-            "Semestrielle": 0.5,
-            "Trimestrielle": 0.25,
-            "Mensuelle": 1 / 12
-        }
-
-        self.freq_inflation_annees = self.frequences.get(self.frequence_inflation, 1)
-        self.freq_growth_annees = self.frequences.get(self.frequence_growth, 1)
+        self.freq_inflation_annees = self.indexation.FREQUENCES.get(self.frequence_inflation, 1)
+        self.freq_growth_annees = self.indexation.FREQUENCES.get(self.frequence_growth, 1)
         
         # Ajuster les taux en fonction de la fréquence
         # Formule: (1+taux_annuel)^(fraction_année) - 1
-        self.taux_inflation_ajuste = (1 + self.taux_inflation_annuel) ** self.freq_inflation_annees - 1
-        self.taux_growth_ajuste = (1 + self.taux_growth_annuel) ** self.freq_growth_annees - 1
+        self.taux_inflation_ajuste = self.indexation.taux_ajuste(self.taux_inflation_annuel, self.frequence_inflation)
+        self.taux_growth_ajuste = self.indexation.taux_ajuste(self.taux_growth_annuel, self.frequence_growth)
 
     def run(self):
         """
@@ -49,21 +51,21 @@ class ComputeBien(BaseCompute):
         avec des taux ajustés selon la fréquence.
         Entre ces dates, les prix restent fixes.
         """
-        df = self.df_dates.copy()
+        df = self.df_dates
 
         # Prix de base
         df["prix"] = self.prix_initial
         df["prix_m2"] = self.prix_initial / self.surface
 
         # Date d'achat
-        date_achat = df["date"].min()
+        date_achat = df["date"].iloc[0]
 
-        # Temps écoulé en années
-        df["annees_ecoulees"] = (df["date"] - date_achat).dt.days / 365.25
+        # Temps écoulé en années (jours écoulés précalculés par le contexte)
+        df["annees_ecoulees"] = self.contexte.jours_ecoules / 365.25
 
-        # Identifie les périodes pour les mises à jour
-        df["periode_inflation"] = (df["annees_ecoulees"] / self.freq_inflation_annees).astype(int)
-        df["periode_growth"] = (df["annees_ecoulees"] / self.freq_growth_annees).astype(int)
+        # Identifie les périodes pour les mises à jour (calendrier partagé du service d'indexation)
+        df["periode_inflation"] = self.indexation.periodes(self.frequence_inflation, date_achat)
+        df["periode_growth"] = self.indexation.periodes(self.frequence_growth, date_achat)
 
         # Création de colonnes pour les mises à jour
         df["derniere_mise_a_jour_inflation"] = df["periode_inflation"] != df["periode_inflation"].shift(1)
@@ -73,42 +75,91 @@ class ComputeBien(BaseCompute):
         df.loc[df.index[0], "derniere_mise_a_jour_inflation"] = True
         df.loc[df.index[0], "derniere_mise_a_jour_growth"] = True
 
-        # Initialisation des prix corrigés
-        prix_inflation_courant = self.prix_initial
-        prix_growth_courant = self.prix_initial
+        # Exposants de capitalisation : nombre de mises à jour intervenues à chaque date
+        k_inflation = self._exposants(df["periode_inflation"].to_numpy())
+        k_growth = self._exposants(df["periode_growth"].to_numpy())
+
+        # Prix corrigés en une seule expression vectorisée : prix_initial * (1 + r) ** k
+        df["prix_corrige_inflation"] = self.prix_initial * (1 + self.taux_inflation_ajuste) ** k_inflation
+        df["prix_corrige_growth"] = self.prix_initial * (1 + self.taux_growth_ajuste) ** k_growth
         
-        prixs_corriges_inflation = []
-        prixs_corriges_growth = []
-        prixs_corriges_total = []
-
-        for i, row in df.iterrows():
-            # Mise à jour du prix corrigé par inflation seulement aux dates de changement
-            if row["derniere_mise_a_jour_inflation"]:
-                # Application du taux d'inflation ajusté par période
-                if row["periode_inflation"] > 0:  # On ne fait pas de mise à jour pour la période initiale
-                    prix_inflation_courant = prix_inflation_courant * (1 + self.taux_inflation_ajuste)
-            
-            # Mise à jour du prix corrigé par croissance seulement aux dates de changement
-            if row["derniere_mise_a_jour_growth"]:
-                # Application du taux de croissance ajusté par période
-                if row["periode_growth"] > 0:  # On ne fait pas de mise à jour pour la période initiale
-                    prix_growth_courant = prix_growth_courant * (1 + self.taux_growth_ajuste)
-            
-            # Stockage des prix dans les listes
-            prixs_corriges_inflation.append(prix_inflation_courant)
-            prixs_corriges_growth.append(prix_growth_courant)
-            
-            # Prix total combinant les effets d'inflation et de croissance
-            prix_total = prix_inflation_courant * prix_growth_courant / self.prix_initial
-            prixs_corriges_total.append(prix_total)
-
-        # Ajout des résultats au DataFrame
-        df["prix_corrige_inflation"] = prixs_corriges_inflation
-        df["prix_corrige_growth"] = prixs_corriges_growth
-        df["prix_corrige_total"] = prixs_corriges_total
+        # Prix total combinant les effets d'inflation et de croissance
+        df["prix_corrige_total"] = df["prix_corrige_inflation"] * df["prix_corrige_growth"] / self.prix_initial
 
         # Calcul des impacts
         df["impact_prix_total"] = df["prix_corrige_total"] - df["prix"]
         df["impact_prix_m2_total"] = df["prix_corrige_total"] / self.surface - df["prix_m2"]
 
-        return df
\ No newline at end of file
+        if self.marche.get("simulation_stochastique", False):
+            self.results["bandes_prix"] = self.simuler_trajectoires()
+
+        return df
+
+    def simuler_trajectoires(self, nb_trajectoires=None, volatilite=None, croissance=None, graine=None,
+                             percentiles=PERCENTILES):
+        """
+        Simule des trajectoires lognormales du prix du bien sur une grille mensuelle.
+
+        Les rendements logarithmiques mensuels suivent N((ln(1 + g) - σ²/2) / 12, σ² / 12) :
+        l'espérance du prix croît au taux `g`. Les trajectoires forment un tableau
+        (nb_trajectoires, nb_mois) ; seules les bandes de percentiles sont conservées.
+        L'inflation reste déterministe (mêmes mises à jour que `run`).
+
+        Args:
+            nb_trajectoires (int, optional): Nombre de trajectoires (section Marché, 1000 par défaut)
+            volatilite (float, optional): Volatilité annuelle du prix en % (section Marché, 5 par défaut)
+            croissance (float, optional): Croissance annuelle espérée en % (`croissance_prix` de la
+                section Marché, sinon `taux_croissance_annuel`)
+            graine (int, optional): Graine du générateur aléatoire
+            percentiles (tuple): Percentiles des bandes
+
+        Returns:
+            pd.DataFrame: Colonne 'date' (grille mensuelle) puis '{mesure}_p{percentile}' pour
+                          'prix', 'prix_m2', 'prix_corrige_total' et 'prix_corrige_total_m2'
+        """
+        nb_trajectoires = int(nb_trajectoires or self.marche.get("nb_trajectoires", 1000))
+        volatilite = self.marche.get("volatilite_prix", 5.0) if volatilite is None else volatilite
+        if croissance is None:
+            croissance = self.marche.get("croissance_prix", self.croissance["taux_croissance_annuel"])
+        graine = self.marche.get("graine") if graine is None else graine
+        sigma = volatilite / 100
+
+        # Grille mensuelle depuis la date d'achat
+        dates = self.contexte.dates
+        date_achat = pd.Timestamp(dates[0])
+        mois = pd.date_range(date_achat, pd.Timestamp(dates[-1]), freq=pd.DateOffset(months=1))
+
+        # Rendements mensuels puis prix cumulés (nb_trajectoires, nb_mois), départ au prix d'achat
+        rng = np.random.default_rng(graine)
+        chocs = rng.standard_normal((nb_trajectoires, len(mois) - 1))
+        rendements = (np.log1p(croissance / 100) - sigma ** 2 / 2) / 12 + sigma / np.sqrt(12) * chocs
+        trajectoires = np.zeros((nb_trajectoires, len(mois)))
+        np.cumsum(rendements, axis=1, out=trajectoires[:, 1:])
+        np.exp(trajectoires, out=trajectoires)
+        bandes_prix = self.prix_initial * np.percentile(trajectoires, percentiles, axis=0)
+
+        # Inflation déterministe lue aux dates de la grille
+        k_inflation = self._exposants(self.indexation.periodes(self.frequence_inflation, date_achat))
+        positions = np.searchsorted(dates, mois.to_numpy(), side="right") - 1
+        facteur_inflation = (1 + self.taux_inflation_ajuste) ** k_inflation[positions]
+
+        # Les autres mesures sont des transformations croissantes du prix à date donnée :
+        # leurs percentiles se déduisent de ceux du prix sans recalcul sur les trajectoires
+        mesures = {
+            "prix": bandes_prix,
+            "prix_m2": bandes_prix / self.surface,
+            "prix_corrige_total": bandes_prix * facteur_inflation,
+            "prix_corrige_total_m2": bandes_prix * facteur_inflation / self.surface,
+        }
+        colonnes = {"date": mois}
+        for mesure, bandes in mesures.items():
+            for p, bande in zip(percentiles, bandes):
+                colonnes[f"{mesure}_p{p}"] = bande
+        return pd.DataFrame(colonnes)
+
+    @staticmethod
+    def _exposants(periodes):
+        """Nombre de mises à jour intervenues à chaque date (pas de mise à jour pour la période initiale)"""
+        periodes = np.asarray(periodes)
+        changements = np.concatenate(([True], periodes[1:] != periodes[:-1]))
+        return np.cumsum(changements & (periodes > 0))
\ No newline at end of file
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+from models.advanced_simulation.computation.base_compute import BaseCompute
+from models.advanced_simulation.computation.journal import (
+    TRESORERIE, concatener, ecritures, flux_tresorerie, soldes, par_periode)
+
+
+class ComputeCashflow(BaseCompute):
+    """
+    Journal de trésorerie consolidé, en partie double.
+
+    Le journal est une table longue (date, compte, source, montant) : chaque flux de
+    trésorerie y figure deux fois, au compte 'tresorerie' et à son compte de contrepartie,
+    pour une somme nulle. Les calculateurs amont (`DEPENDANCES`) fournissent leurs écritures
+    dans `get_results()['ecritures']` ; l'acquisition (prix et frais) et les travaux, qui
+    n'ont pas de calculateur propre, sont ajoutés ici. Flux net, trésorerie cumulée et vues
+    par compte sont des réductions groupées du journal : aucun tableau large par source.
+
+    Le journal est rapproché des totaux publiés par chaque calculateur amont (paiements des
+    prêts, loyers encaissés, dépenses par poste) : un flux perdu, dupliqué ou mal signé lors
+    de la consolidation apparaît comme un écart sur sa source.
+    """
+
+    # Frais d'acquisition de la section Frais : (clé, en % du prix d'achat)
+    FRAIS_ACQUISITION = [
+        ('frais_notaire', True),
+        ('frais_agence_immo', True),
+        ('frais_courtage', False),
+        ('frais_syndic', False),
+        ('frais_divers', False),
+        ('provision_charges', False),
+    ]
+
+    SECTIONS = ('bien', 'frais_global', 'travaux')
+    DEPENDANCES = ('ComputePret', 'ComputeLoyer', 'ComputeCharges')
+
+    def __init__(self, contexte=None):
+        super().__init__(contexte)
+        self.results = {}
+        # Acquisition au premier jour du calendrier, comme pour ComputeBien
+        self.date_achat = pd.Timestamp(self.contexte.dates[0])
+
+    def run(self):
+        """
+        Consolide les écritures de tous les calculateurs et des sections sans calculateur.
+
+        Returns:
+            pd.DataFrame: Journal trié par date, colonnes 'date', 'compte', 'source', 'montant'
+        """
+        journaux = [resultats.get('ecritures') for _, resultats in self.entrees.values()]
+        journaux += [self._acquisition(), self._travaux()]
+        journal = concatener(journaux)
+
+        self.results = {
+            'flux': flux_tresorerie(journal),
+            'soldes': soldes(journal),
+            'comptes_mensuels': par_periode(journal, self.agregation.periodes('mois')),
+            'comptes_annuels': par_periode(journal, self.agregation.periodes('annee')),
+        }
+        self.results['rapprochement'] = self._rapprochement(journal)
+        self.results['rapproche'] = bool(self.results['rapprochement']['rapproche'].all())
+        return journal
+
+    def _rapprochement(self, journal):
+        """
+        Trésorerie de chaque source du journal comparée au total publié par son calculateur.
+
+        Returns:
+            pd.DataFrame: Une ligne par source amont : 'source', 'journal', 'attendu', 'ecart', 'rapproche'
+        """
+        attendus = {}
+
+        # Prêts : capital débloqué moins paiements (échéances, remboursements anticipés, frais)
+        prets, _ = self.entrees.get('ComputePret', (None, None))
+        if prets is not None and len(prets):
+            est_paiement = (prets['metrique'] == 'paiement').to_numpy() & (prets['pret'] != 'total').to_numpy()
+            paiements = prets[est_paiement].groupby('pret', observed=True)['valeur'].sum()
+            for pret in self.prets:
+                attendus[pret['pret']] = pret['montant'] - paiements.get(pret['pret'], 0.0)
+
+        # Baux : loyers et charges récupérables encaissés
+        loyers, _ = self.entrees.get('ComputeLoyer', (None, None))
+        if loyers is not None and len(loyers):
+            encaisse = (loyers['loyer'] + loyers['charges']).groupby(loyers['bail'], observed=True).sum()
+            attendus.update(encaisse.to_dict())
+
+        # Dépenses récurrentes : total de chaque poste
+        _, charges = self.entrees.get('ComputeCharges', (None, {}))
+        attendus.update({poste: -total for poste, total in charges.get('total_par_poste', {}).items() if total})
+
+        tresorerie = journal[(journal['compte'] == TRESORERIE).to_numpy()]
+        par_source = tresorerie.groupby('source', observed=True)['montant'].sum()
+        sources = list(attendus)
+        attendu = np.array([attendus[source] for source in sources], dtype=float)
+        dans_journal = np.array([par_source.get(source, 0.0) for source in sources], dtype=float)
+        ecart = dans_journal - attendu
+        return pd.DataFrame({
+            'source': sources,
+            'journal': dans_journal,
+            'attendu': attendu,
+            'ecart': ecart,
+            'rapproche': np.abs(ecart) <= 1e-6 * np.maximum(1.0, np.abs(attendu)),
+        })
+
+    def _acquisition(self):
+        """Prix d'achat ('bien') et frais d'acquisition ('frais_acquisition'), décaissés à l'achat"""
+        prix = self.bien["prix_achat"]
+        sources, montants = ['prix_achat'], [prix]
+        for cle, pourcentage in self.FRAIS_ACQUISITION:
+            valeur = self.frais_global.get(cle, 0)
+            sources.append(cle)
+            montants.append(prix * valeur / 100 if pourcentage else valeur)
+        comptes = ['bien'] + ['frais_acquisition'] * len(self.FRAIS_ACQUISITION)
+        return ecritures(self.date_achat, -np.asarray(montants, dtype=float), comptes, sources)
+
+    def _travaux(self):
+        """Budget des travaux réparti par mensualités égales sur leur durée, à partir de leur début"""
+        budget = self.travaux.get("budget_total", 0)
+        duree = max(int(self.travaux.get("duree_mois", 1)), 1)
+        if not budget:
+            return None
+        debut = pd.Timestamp(self.travaux["start_date_travaux"])
+        dates = [debut + pd.DateOffset(months=k) for k in range(duree)]
+        return ecritures(dates, np.full(duree, -budget / duree), 'travaux', 'travaux')
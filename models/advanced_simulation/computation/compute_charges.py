@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from models.advanced_simulation.computation.base_compute import BaseCompute
+from models.advanced_simulation.computation.journal import concatener, ecritures, par_periode
+
+# Mois de paiement usuels
+MENSUEL = tuple(range(1, 13))
+TRIMESTRIEL = (1, 4, 7, 10)
+
+
+class ComputeCharges(BaseCompute):
+    """
+    Dépenses récurrentes du propriétaire : une ligne par poste dans un tableau de paramètres
+    (montant annuel, hypothèse de croissance, mois de paiement).
+
+    Tous les postes sont calculés en une seule diffusion (postes × mois) sur le calendrier
+    partagé : montant par échéance × mois payé × facteur d'indexation, lu sur la courbe
+    de l'hypothèse de la section Croissance (taux et fréquence de mise à jour). Les frais de
+    gestion, en % des loyers, suivent l'échéancier des loyers de ComputeLoyer.
+    """
+
+    COLONNES = ['date', 'poste', 'montant']
+
+    # Postes de la section Charges (montants annuels) : hypothèse de croissance, mois de paiement
+    POSTES = [
+        ('taxe_fonciere', 'taux_croissance_taxe_fonciere', (10,)),
+        ('frais_assurance', 'taux_croissance_assurance_pno', (1,)),
+        ('frais_entretien', 'taux_croissance_entretien', MENSUEL),
+        ('charges_copro', 'taux_croissance_charges_copro', TRIMESTRIEL),
+        ('charges_non_recup', 'taux_inflation', MENSUEL),
+        ('frais_compta', 'taux_inflation', (5,)),
+        ('abonnements', 'taux_inflation', MENSUEL),
+    ]
+
+    # Frais de gestion locative, en % des loyers encaissés
+    POSTE_GESTION = 'frais_gestion'
+
+    SECTIONS = ('charges',) + tuple(sorted({f"croissance.{cle}" for _, cle, _ in POSTES}
+                                           | {f"croissance.frequence_{cle}" for _, cle, _ in POSTES}))
+    DEPENDANCES = ('ComputeLoyer',)
+
+    def __init__(self, contexte=None):
+        super().__init__(contexte)
+        self.results = {}
+        self.parametres = self.tableau_parametres(self.charges)
+
+        # Grille mensuelle : premier jour de chaque mois (le jour d'achat pour le premier)
+        dates = self.contexte.dates
+        self.mois = np.arange(dates[0].astype('datetime64[M]'), dates[-1].astype('datetime64[M]') + 1)
+        self.dates_paiement = np.maximum(self.mois.astype('datetime64[ns]'), dates[0])
+        self.positions = np.searchsorted(dates, self.dates_paiement)
+
+    @classmethod
+    def tableau_parametres(cls, charges):
+        """
+        Tableau de paramètres des postes récurrents, une ligne par poste.
+
+        Args:
+            charges (dict): Section Charges (montants annuels en €)
+
+        Returns:
+            dict: 'postes' et 'croissance' (nb_postes,), 'montant_echeance' (montant annuel
+                  divisé par le nombre d'échéances), 'mois_payes' (nb_postes, 12) booléen
+        """
+        mois_payes = np.zeros((len(cls.POSTES), 12), dtype=bool)
+        for i, (_, _, mois) in enumerate(cls.POSTES):
+            mois_payes[i, np.asarray(mois) - 1] = True
+        montants_annuels = np.array([float(charges.get(poste, 0) or 0) for poste, _, _ in cls.POSTES])
+        return {
+            'postes': np.array([poste for poste, _, _ in cls.POSTES], dtype=object),
+            'croissance': np.array([cle for _, cle, _ in cls.POSTES], dtype=object),
+            'montant_echeance': montants_annuels / mois_payes.sum(axis=1),
+            'mois_payes': mois_payes,
+        }
+
+    def run(self):
+        """
+        Échéancier des dépenses récurrentes et des frais de gestion.
+
+        Returns:
+            pd.DataFrame: Colonnes 'date', 'poste' (catégorielle), 'montant' (> 0), une ligne par
+                          échéance non nulle, triées par date
+        """
+        montants = self.series()
+        postes, colonnes = np.nonzero(montants)
+        ordre = np.lexsort((postes, colonnes))
+        postes, colonnes = postes[ordre], colonnes[ordre]
+        recurrentes = pd.DataFrame({
+            'date': self.dates_paiement[colonnes],
+            'poste': self.parametres['postes'][postes],
+            'montant': montants[postes, colonnes],
+        })
+
+        gestion = self._frais_gestion()
+        if gestion is not None:
+            recurrentes = pd.concat([recurrentes, gestion], ignore_index=True)
+        df = recurrentes.iloc[np.argsort(recurrentes['date'].to_numpy(), kind='stable')].reset_index(drop=True)
+        categories = list(self.parametres['postes']) + [self.POSTE_GESTION]
+        df['poste'] = pd.Categorical(df['poste'], categories=categories)
+
+        self.results = {
+            'total_par_poste': df.groupby('poste', observed=False)['montant'].sum().to_dict(),
+            'total_charges': float(df['montant'].sum()),
+            'charges_annuelles': par_periode(df, self.agregation.periodes('annee'), colonne='poste'),
+            'ecritures': concatener([ecritures(df['date'], -df['montant'].to_numpy(), 'charges',
+                                               df['poste'].to_numpy(dtype=object))]),
+        }
+        return df
+
+    def series(self):
+        """
+        Montant de chaque poste à chaque échéance de la grille mensuelle, en une diffusion.
+
+        Returns:
+            np.ndarray: (nb_postes, nb_mois), 0 hors des mois de paiement
+        """
+        p = self.parametres
+        mois_annee = self.mois.astype(np.int64) % 12
+
+        # Une courbe par hypothèse (partagée via le service d'indexation), lue aux échéances
+        hypotheses, indices = np.unique(p['croissance'], return_inverse=True)
+        date_achat = self.contexte.dates[0]
+        courbes = np.stack([self.indexation.courbe_croissance(cle, date_achat)[self.positions]
+                            for cle in hypotheses])
+
+        return p['montant_echeance'][:, None] * p['mois_payes'][:, mois_annee] * courbes[indices]
+
+    def _frais_gestion(self):
+        """Frais de gestion : pourcentage de chaque loyer encaissé, à la date de l'encaissement (None sans frais)"""
+        taux = self.charges.get(self.POSTE_GESTION, 0) / 100
+        loyers, _ = self.entrees.get('ComputeLoyer', (None, None))
+        if not taux or loyers is None or loyers.empty:
+            return None
+
+        # Une échéance par date d'encaissement (échéancier des loyers trié par date)
+        dates = loyers['date'].to_numpy(dtype='datetime64[ns]')
+        debuts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1])))
+        return pd.DataFrame({
+            'date': dates[debuts],
+            'poste': self.POSTE_GESTION,
+            'montant': taux * np.add.reduceat(loyers['loyer'].to_numpy(dtype=float), debuts),
+        })
@@ -5,192 +5,110 @@ from dateutil.relativedelta import relativedelta
 
 from models.advanced_simulation.component.data_store import DataStore
 from models.advanced_simulation.computation.base_compute import BaseCompute
+from models.advanced_simulation.computation.etat_locatif import EtatLocatif
+from models.advanced_simulation.computation.journal import concatener, ecritures
 
 class ComputeLoyer(BaseCompute):
     """
     Classe pour calculer les revenus locatifs basés sur différents contrats de location.
     Permet de gérer plusieurs baux, avec leurs dates de début et de fin, taux d'occupation,
     et possibilité d'indexation.
+    
+    Les baux sont portés par un état locatif (`EtatLocatif`, un lot par ligne en tableaux
+    NumPy). Le résultat principal est un échéancier des loyers : une ligne par paiement
+    effectif, au jour de paiement du bail (`jour_paiement`, ou "last" pour le dernier jour du mois).
+    Une vue journalière en comptabilité d'engagement reste disponible via `vue_journaliere()`.
     """
     
-    def __init__(self):
-        super().__init__()  
+    COLONNES = ['date', 'bail', 'lot', 'loyer', 'charges']
+    
+    SECTIONS = ('loyers', 'croissance.taux_augmentation_loyer', 'croissance.frequence_taux_augmentation_loyer')
+
+    def __init__(self, contexte=None):
+        super().__init__(contexte)  
         self.results = {}   # Pour stocker les résultats des calculs
+        self.dates = self.contexte.dates
+        # Un lot par ligne (un bail avec `nb_lots` > 1 en donne plusieurs)
+        self.etat_locatif = EtatLocatif.depuis_loyers(self.loyers, self.croissance)
      
     def run(self):
         """
-        Crée un DataFrame des revenus locatifs quotidiens pour tous les baux.
+        Crée l'échéancier des paiements de loyer de tous les baux.
         
-        Args:
-            date_debut_min (datetime, optional): Date de début pour la période de calcul
-            date_fin_max (datetime, optional): Date de fin pour la période de calcul
+        Les paiements de tous les lots sont calculés en une seule diffusion sur l'état
+        locatif (indexation et saisonnalité comprises), puis triés par date.
             
         Returns:
-            pd.DataFrame: DataFrame avec les revenus locatifs quotidiens
+            pd.DataFrame: Colonnes 'date', 'bail', 'lot', 'loyer', 'charges' (un paiement par ligne)
         """
 
         if not self.loyers:
-            return pd.DataFrame(columns=['date', 'loyer_total', 'charges_total'])
+            return pd.DataFrame(columns=self.COLONNES)
         
-        self.df_loyers = self.df_dates
+        self.df_loyers = self.etat_locatif.journal()
         
-        # Traiter chaque contrat de location
-        for loyer in self.loyers:
-            self._calculer_loyer(loyer)
+        # Calculer les statistiques agrégées
+        self._calculer_statistiques_loyers(self.df_loyers, self.loyers)
         
-        # Calculer Rooling des statistiques agrégées
-        self._calculer_statistiques_loyers(loyers)
+        # Encaissements du journal de trésorerie : loyers et charges récupérables, par bail
+        dates, baux = self.df_loyers['date'], self.df_loyers['bail'].to_numpy(dtype=object)
+        self.results['ecritures'] = concatener([
+            ecritures(dates, self.df_loyers['loyer'].to_numpy(), 'loyers', baux),
+            ecritures(dates, self.df_loyers['charges'].to_numpy(), 'charges_recuperables', baux),
+        ])
 
         return self.df_loyers
     
-
-    def _calculer_loyer(self,loyer):
-        """
-        Ajoute un contrat de location au DataFrame.
-        
-        Args:
-            df (pd.DataFrame): DataFrame des revenus locatifs
-            loyer (dict): Informations sur le contrat de location
-            
-        Returns:
-            pd.DataFrame: DataFrame mis à jour
+    def vue_journaliere(self):
         """
-        label = loyer.get('label', f"Loyer_{loyer.get('id', '')}")
-        loyer_mensuel = loyer.get('loyer_mensuel', 0)
-        charges_mensuelles = loyer.get('charges_mensuelles', 0)
-        taux_occupation = loyer.get('taux_occupation', 100) / 100  # Conversion en décimal
-        start_date = loyer.get('start_date')
-        end_date = loyer.get('end_date')
-        
-        # Création et initialisation des colonnes
-        col_loyer = f'loyer_{label}'
-        col_charges = f'charges_{label}'
-        self.df_loyers[col_loyer] = 0.0
-        self.df_loyers[col_charges] = 0.0
-
-        # Calculs journaliers
-        loyer_journalier = (loyer_mensuel * 12 / 365) * taux_occupation
-        charges_journalieres = (charges_mensuelles * 12 / 365) * taux_occupation
-
-        # Application sur la période active
-        mask = (self.df_loyers['date'] >= start_date) & (self.df_loyers['date'] <= end_date)
-        self.df_loyers.loc[mask, [f'loyer_{label}', f'charges_{label}']] = loyer_journalier, charges_journalieres
-
-        # Appliquer l'indexation si elle est activée
-        if loyer.get('indexation', False):
-            self._appliquer_indexation(loyer, col_loyer, col_charges)
-        
-        # Appliquer la saisonnalité si définie
-        if 'mois_occupes' in loyer and loyer['mois_occupes'] < 12:
-            self._appliquer_saisonnalite(loyer, col_loyer, col_charges)
-        
-    def _appliquer_indexation(self, loyer, col_loyer, col_charges):
-        """
-        Applique l'indexation annuelle aux loyers et charges.
-        
-        Args:
-            df (pd.DataFrame): DataFrame des revenus locatifs
-            loyer (dict): Informations sur le contrat de location
-            col_loyer (str): Nom de la colonne des loyers
-            col_charges (str): Nom de la colonne des charges
+        Revenus locatifs lissés par jour (loyer mensuel * 12 / 365) sur tout le calendrier.
             
         Returns:
-            pd.DataFrame: DataFrame avec indexation appliquée
+            pd.DataFrame: Colonnes 'date', 'loyer_{label}', 'charges_{label}', 'loyer_total', 'charges_total'
         """
-        # Taux d'indexation (par défaut IRL = 2%)
-        taux_indexation = loyer.get('taux_indexation', 2) / 100
-        date_premiere_indexation = loyer.get('date_premiere_indexation')
-        
-        # Si la date de première indexation n'est pas définie, utiliser la date de début + 1 an
-        if date_premiere_indexation is None:
-            date_premiere_indexation = loyer['start_date'] + relativedelta(years=1)
-        
-        # Déterminer toutes les dates d'indexation (chaque année)
-        start_year = date_premiere_indexation.year
-        end_year = self.df_loyers['date'].max().year
-        
-        for year in range(start_year, end_year + 1):
-            date_indexation = datetime(year, date_premiere_indexation.month, date_premiere_indexation.day)
-            
-            # Vérifier si cette date est dans notre DataFrame
-            if date_indexation in self.df_loyers['date'].values:
-                # Calculer l'année d'indexation (1ère, 2ème, etc.)
-                annee_indexation = year - start_year + 1
-                
-                # Facteur d'indexation cumulé
-                facteur_indexation = (1 + taux_indexation) ** annee_indexation
-                
-                # Appliquer l'indexation à partir de cette date
-                mask_apres_indexation = self.df_loyers['date'] >= date_indexation
-                
-                # Valeurs de base pour cette période
-                base_date_idx = self.df_loyers['date'] == loyer['start_date']
-                if any(base_date_idx):
-                    valeur_base_loyer = self.df_loyers.loc[base_date_idx, col_loyer].values[0]
-                    valeur_base_charges = self.df_loyers.loc[base_date_idx, col_charges].values[0]
-                    
-                    # Appliquer l'indexation
-                    self.df_loyers.loc[mask_apres_indexation, col_loyer] = valeur_base_loyer * facteur_indexation
-                    self.df_loyers.loc[mask_apres_indexation, col_charges] = valeur_base_charges * facteur_indexation
-        
+        etat = self.etat_locatif
+        facteurs = etat.facteurs(self.dates, journalier=True)
+        loyers = etat.loyer_mensuel[:, None] * facteurs
+        charges = etat.charges_mensuelles[:, None] * facteurs
+        
+        colonnes = {'date': self.dates}
+        for i, label in enumerate(etat.labels):
+            colonnes[f'loyer_{label}'] = loyers[i]
+            colonnes[f'charges_{label}'] = charges[i]
+        colonnes['loyer_total'] = loyers.sum(axis=0)
+        colonnes['charges_total'] = charges.sum(axis=0)
+        
+        self.results['loyer_quotidien'] = pd.DataFrame(colonnes)
+        return self.results['loyer_quotidien']
     
-    def _appliquer_saisonnalite(self, loyer, col_loyer, col_charges):
-        """
-        Applique la saisonnalité au contrat de location.
-        Ajuste les loyers en fonction du nombre de mois occupés par an.
-        
-        Args:
-            df (pd.DataFrame): DataFrame des revenus locatifs
-            loyer (dict): Informations sur le contrat de location
-            col_loyer (str): Nom de la colonne des loyers
-            col_charges (str): Nom de la colonne des charges
-            
-        Returns:
-            pd.DataFrame: DataFrame avec saisonnalité appliquée
-        """
-        mois_occupes = loyer.get('mois_occupes', 12)
-        
-        if mois_occupes >= 12:
-            return  # Pas de saisonnalité à appliquer
-            
-        # Définir les mois d'occupation (par défaut les premiers mois de l'année)
-        mois_occupation = loyer.get('mois_occupation', list(range(1, int(mois_occupes) + 1)))
-        
-        # Appliquer la saisonnalité
-        mask_non_occupe = ~self.df_loyers['date'].dt.month.isin(mois_occupation)
-        self.df_loyers.loc[mask_non_occupe, col_loyer] = 0
-        self.df_loyers.loc[mask_non_occupe, col_charges] = 0
-        
-        return self.df_loyers
+    @staticmethod
+    def _label(loyer):
+        return loyer.get('label', f"Loyer_{loyer.get('id', '')}")
     
     def _calculer_statistiques_loyers(self, df, loyers):
         """
-        Calcule diverses statistiques sur les revenus locatifs et les stocke dans self.results.
+        Calcule diverses statistiques sur les loyers encaissés et les stocke dans self.results.
         
         Args:
-            df (pd.DataFrame): DataFrame des revenus locatifs
+            df (pd.DataFrame): Échéancier des loyers
             loyers (list): Liste des contrats de location
         """
+        # Agrégats mensuels et annuels lus dans le cube partagé
+        cube = self.agregation.cube(df[['date', 'loyer', 'charges']], type(self).__name__)
+        colonnes = {'loyer': 'loyer_total', 'charges': 'charges_total'}
+        
         # Calculs annuels
-        df_annuel = df.copy()
-        df_annuel['year'] = df_annuel['date'].dt.year
-        stats_annuelles = df_annuel.groupby('year').agg({
-            'loyer_total': 'sum',
-            'charges_total': 'sum'
-        }).reset_index()
+        stats_annuelles = cube['annee'].rename(columns=colonnes)
+        stats_annuelles.insert(0, 'year', stats_annuelles.pop('periode').dt.year)
         
         # Calculs mensuels
-        df_mensuel = df.copy()
-        df_mensuel['year_month'] = df_mensuel['date'].dt.strftime('%Y-%m')
-        stats_mensuelles = df_mensuel.groupby('year_month').agg({
-            'loyer_total': 'sum',
-            'charges_total': 'sum'
-        }).reset_index()
+        stats_mensuelles = cube['mois'].rename(columns=colonnes)
+        stats_mensuelles.insert(0, 'year_month', stats_mensuelles.pop('periode').dt.strftime('%Y-%m'))
         
         # Résumé global
-        total_loyers = df['loyer_total'].sum()
-        total_charges = df['charges_total'].sum()
-        duree_jours = len(df)
+        total_loyers = df['loyer'].sum()
+        total_charges = df['charges'].sum()
+        duree_jours = len(self.dates)
         
         # Moyenne mensuelle
         loyer_mensuel_moyen = total_loyers / (duree_jours / 30.4375)  # Moyenne de jours par mois
@@ -198,7 +116,7 @@ class ComputeLoyer(BaseCompute):
         
         # Stockage des résultats
         self.results.update({
-            'loyer_quotidien': df,
+            'echeancier_loyers': df,
             'loyer_annuel': stats_annuelles,
             'loyer_mensuel': stats_mensuelles,
             'total_loyers': total_loyers,
@@ -206,27 +124,26 @@ class ComputeLoyer(BaseCompute):
             'loyer_mensuel_moyen': loyer_mensuel_moyen,
             'charges_mensuelles_moyennes': charges_mensuelles_moyennes,
             'duree_jours': duree_jours,
-            'nb_baux': len(loyers)
+            'nb_baux': len(loyers),
+            'nb_lots': len(self.etat_locatif),
+            'synthese_lots': self.etat_locatif.synthese(self.dates[0], self.dates[-1]),
         })
         
         # Statistiques par bail
+        par_bail = df.groupby('bail', observed=False)[['loyer', 'charges']].sum()
         stats_par_bail = []
         for loyer in loyers:
-            label = loyer.get('label', f"Loyer_{loyer.get('id', '')}")
-            col_loyer = f'loyer_{label}'
-            col_charges = f'charges_{label}'
-            
-            if col_loyer in df.columns:
-                stats_bail = {
-                    'label': label,
-                    'loyer_total': df[col_loyer].sum(),
-                    'charges_total': df[col_charges].sum() if col_charges in df.columns else 0,
-                    'debut': loyer.get('start_date'),
-                    'fin': loyer.get('end_date'),
-                    'duree_mois': loyer.get('duree_contrat_mois', 0),
-                    'taux_occupation': loyer.get('taux_occupation', 100)
-                }
-                stats_par_bail.append(stats_bail)
+            label = self._label(loyer)
+            stats_bail = {
+                'label': label,
+                'loyer_total': par_bail.loc[label, 'loyer'],
+                'charges_total': par_bail.loc[label, 'charges'],
+                'debut': loyer.get('start_date'),
+                'fin': loyer.get('end_date'),
+                'duree_mois': loyer.get('duree_contrat_mois', 0),
+                'taux_occupation': loyer.get('taux_occupation', 100)
+            }
+            stats_par_bail.append(stats_bail)
         
         self.results['stats_par_bail'] = stats_par_bail
         
@@ -245,6 +162,10 @@ class ComputeLoyer(BaseCompute):
 # Exemple d'utilisation avec les données fournies
 if __name__ == "__main__":
     from datetime import date
+    from pathlib import Path
+
+    from models.advanced_simulation.computation.contexte import ContexteSimulation
+    from models.advanced_simulation.computation.moteur import charger_scenario
 
     # Les loyers fournis
     loyers = [
@@ -274,15 +195,19 @@ if __name__ == "__main__":
         }
     ]
     
+    # Scénario d'exemple (calendrier, croissance) dont les baux sont remplacés
+    scenario = charger_scenario(Path(__file__).resolve().parents[3] / "scenarios" / "exemple.json")
+    scenario['loyers'] = loyers
+
     # Créer l'instance et calculer le DataFrame
-    compute_loyer = ComputeLoyer(loyers)
+    compute_loyer = ComputeLoyer(ContexteSimulation(scenario))
     df_loyers = compute_loyer.run()
     
     # Obtenir les résultats
     resultats = compute_loyer.get_results()
     
     # Afficher un aperçu du DataFrame
-    print("Aperçu du DataFrame des loyers quotidiens:")
+    print("Aperçu de l'échéancier des loyers:")
     print(df_loyers.head())
     
     # Afficher les statistiques annuelles
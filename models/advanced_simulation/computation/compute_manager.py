@@ -1,34 +1,120 @@
-from models.advanced_simulation.computation.compute_bien import ComputeBien
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
 from models.advanced_simulation.computation.compute_loyer import ComputeLoyer
 from models.advanced_simulation.computation.compute_bien import ComputeBien
 from models.advanced_simulation.computation.compute_indicateur import ComputeIndicateur
 from models.advanced_simulation.computation.compute_pret import ComputePret
+from models.advanced_simulation.computation.compute_monte_carlo import ComputeMonteCarlo
+from models.advanced_simulation.computation.compute_charges import ComputeCharges
+from models.advanced_simulation.computation.compute_cashflow import ComputeCashflow
+from models.advanced_simulation.computation.contexte import ContexteSimulation
+from models.advanced_simulation.computation.cache import CACHE_CALCULS, copie_profonde
 
-# from .compute_charges import ComputeCharges
 # from .compute_rentabilite import ComputeRentabilite
-# from .compute_cashflow import ComputeCashflow
 # from .compute_fiscalite import ComputeFiscalite
 
 class ComputeManager:
-    def __init__(self):
-        self.calculateurs = [
-            ComputePret(),  
-            ComputeLoyer(),  
-            ComputeBien(), 
-            # ComputeCharges(),  
-            # ComputeFiscalite(),  
-            # ComputeCashflow(),  
-            # ComputeRentabilite()
-            ComputeIndicateur(),
-        ]
+    
+    # Calculateurs exécutés ; l'ordre de la liste est celui des résultats
+    CALCULATEURS = [
+        ComputePret,
+        ComputeLoyer,
+        ComputeBien,
+        ComputeCharges,
+        # ComputeFiscalite,
+        ComputeCashflow,
+        # ComputeRentabilite,
+        ComputeIndicateur,
+        ComputeMonteCarlo,
+    ]
+    
+    # Nombre de calculateurs exécutés simultanément par défaut
+    NB_WORKERS = min(4, os.cpu_count() or 1)
+    
+    def __init__(self, cache=CACHE_CALCULS, nb_workers=None, contexte=None):
+        """
+        Args:
+            cache (CacheLRU): Cache des sorties des calculateurs
+            nb_workers (int, optional): Nombre de threads d'exécution (1 : exécution séquentielle)
+            contexte (ContexteSimulation, optional): Contexte du scénario (DataStore par défaut)
+        """
+        # Calendrier, indexation et agrégation construits une fois par simulation,
+        # partagés en lecture seule par les calculateurs
+        self.contexte = contexte or ContexteSimulation.depuis_datastore()
+        self.indexation = self.contexte.indexation
+        self.agregation = self.contexte.agregation
+        self.cache = cache
+        self.nb_workers = max(int(nb_workers or self.NB_WORKERS), 1)
+        
         self.resultats = {}  # Maintenant c'est un dict
+        self.details = {}  # Résultats détaillés de chaque calculateur (get_results)
+        self.recalcules = []  # Calculateurs exécutés lors du dernier run_all (les autres sont lus en cache)
         
     def run_all(self):
-        """Exécute tous les calculateurs dans l'ordre défini"""
-        for calculateur in self.calculateurs:
-            resultat = calculateur.run()
-            # Utiliser le nom de la classe comme clé, ou une propriété .name
-            key = type(calculateur).__name__  # Exemple: "ComputeBien"
-            self.resultats[key] = resultat
+        """
+        Exécute les calculateurs, en parallèle quand leurs dépendances le permettent.
+        
+        Un calculateur est lancé dans le pool de threads dès que tous ceux qu'il déclare dans
+        `DEPENDANCES` sont terminés ; les calculateurs indépendants (prêts, loyers, bien)
+        s'exécutent donc simultanément. Un calculateur n'est ré-exécuté que si le calendrier,
+        l'une des sections qu'il lit (`SECTIONS`) ou l'un de ses calculateurs amont a changé ;
+        sinon sa sortie et ses résultats détaillés sont relus dans le cache.
+        
+        Le cache ne conserve et ne distribue que des copies, et chaque calculateur reçoit ses
+        propres copies des résultats amont : une modification en place n'altère ni les
+        résultats des autres calculateurs ni ceux des exécutions suivantes.
+        
+        Raises:
+            ValueError: Dépendance inconnue ou circulaire
+        """
+        self.recalcules = []
+        entrees = {}  # Nom -> (sortie de run, get_results)
+        cles = {}  # Nom -> clé de cache (inclut les clés des calculateurs amont)
+        restants = list(self.CALCULATEURS)
+        
+        with ThreadPoolExecutor(max_workers=self.nb_workers) as pool:
+            en_cours = {}
+            while restants or en_cours:
+                prets = [classe for classe in restants if all(d in entrees for d in classe.DEPENDANCES)]
+                if not prets and not en_cours:
+                    raise ValueError("Dépendances inconnues ou circulaires : "
+                                     + ", ".join(classe.__name__ for classe in restants))
+                
+                lus_en_cache = False
+                for classe in prets:
+                    restants.remove(classe)
+                    # Utiliser le nom de la classe comme clé, ou une propriété .name
+                    key = classe.__name__  # Exemple: "ComputeBien"
+                    cles[key] = (key, self.contexte.empreinte(classe.SECTIONS),
+                                 tuple(cles[d] for d in classe.DEPENDANCES))
+                    entree = self.cache.get(cles[key])
+                    if entree is None:
+                        amont = {d: copie_profonde(entrees[d]) for d in classe.DEPENDANCES}
+                        en_cours[pool.submit(self._executer, classe, amont)] = key
+                    else:
+                        entrees[key] = copie_profonde(entree)
+                        lus_en_cache = True
+                
+                # Une lecture en cache peut débloquer d'autres calculateurs sans attendre
+                if lus_en_cache or not en_cours:
+                    continue
+                
+                termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                for futur in termines:
+                    key = en_cours.pop(futur)
+                    entrees[key] = futur.result()
+                    self.cache.set(cles[key], copie_profonde(entrees[key]))
+                    self.recalcules.append(key)
+        
+        for classe in self.CALCULATEURS:
+            key = classe.__name__
+            self.resultats[key], self.details[key] = entrees[key]
         
         return self.resultats
+    
+    def _executer(self, classe, entrees):
+        """Instancie et exécute un calculateur avec les résultats de ses calculateurs amont"""
+        calculateur = classe(self.contexte)
+        calculateur.entrees = entrees
+        return calculateur.run(), calculateur.get_results()
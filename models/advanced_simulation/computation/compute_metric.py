@@ -12,8 +12,10 @@ class ComputeMetric(BaseCompute):
     Les prix restent fixes entre les mises à jour et les taux sont ajustés en fonction de la fréquence.
     """
 
-    def __init__(self):
-        super().__init__()
+    SECTIONS = ('bien', 'loyers')
+
+    def __init__(self, contexte=None):
+        super().__init__(contexte)
         self.results = {}
         self.prix_initial = self.bien["prix_achat"]
         self.loyers
@@ -25,7 +27,7 @@ class ComputeMetric(BaseCompute):
         avec des taux ajustés selon la fréquence.
         Entre ces dates, les prix restent fixes.
         """
-        df = self.df_dates.copy()
+        df = self.df_dates
         df["prix"] = self.prix_initial
 
 
@@ -0,0 +1,246 @@
+import numpy as np
+import pandas as pd
+
+from models.advanced_simulation.computation.base_compute import BaseCompute
+from models.advanced_simulation.computation.compute_bien import ComputeBien
+from models.advanced_simulation.computation.compute_charges import ComputeCharges
+from models.advanced_simulation.computation.etat_locatif import EtatLocatif
+
+
+class ComputeMonteCarlo(BaseCompute):
+    """
+    Simulation Monte Carlo des hypothèses de la section Croissance.
+
+    Chaque hypothèse munie d'une loi (`croissance['distributions']`) est tirée `nb_tirages`
+    fois ; les autres gardent leur valeur. Les tirages forment un axe de scénarios : valeur du
+    bien, loyers, charges, cash-flow et patrimoine net sont des tableaux (nb_tirages, nb_mois)
+    calculés en une passe, sans relancer les calculateurs. L'échéancier des prêts (taux fixés
+    au départ) est celui de ComputePret. Seules les bandes de percentiles sont conservées.
+
+    Le mode est actif quand `croissance['monte_carlo']` est vrai ; sinon le résultat est vide.
+    """
+
+    PERCENTILES = (5, 50, 95)
+
+    MESURES = ['cashflow', 'tresorerie', 'valeur_bien', 'patrimoine_net']
+
+    SECTIONS = ('croissance', 'loyers', 'bien', 'charges', 'frais_global', 'travaux')
+    DEPENDANCES = ('ComputePret',)
+
+    def __init__(self, contexte=None):
+        super().__init__(contexte)
+        self.results = {}
+        self.nb_tirages = int(self.croissance.get("nb_tirages", 10000))
+        self.distributions = self.croissance.get("distributions", {})
+
+        # Grille mensuelle du calendrier, départ au mois d'achat
+        self.date_achat = pd.Timestamp(self.contexte.dates[0])
+        self.mois = np.arange(self.contexte.dates[0].astype('datetime64[M]'),
+                              self.contexte.dates[-1].astype('datetime64[M]') + 1)
+        # Premier jour de chaque mois (le jour d'achat pour le premier) dans le calendrier journalier
+        debuts = np.maximum(self.mois.astype('datetime64[ns]'), self.contexte.dates[0])
+        self.positions = np.searchsorted(self.contexte.dates, debuts)
+
+    def run(self):
+        """
+        Returns:
+            pd.DataFrame: Colonne 'date' (grille mensuelle) puis '{mesure}_p{percentile}' pour
+                          'cashflow' (mensuel), 'tresorerie' (cash-flow cumulé), 'valeur_bien' et
+                          'patrimoine_net' ; vide si le mode Monte Carlo n'est pas actif
+        """
+        colonnes = ['date'] + [f"{m}_p{p}" for m in self.MESURES for p in self.PERCENTILES]
+        if not self.croissance.get("monte_carlo", False):
+            return pd.DataFrame(columns=colonnes)
+        return self.simuler()
+
+    def simuler(self, nb_tirages=None, graine=None):
+        """
+        Tire les hypothèses et calcule les bandes de percentiles.
+
+        Args:
+            nb_tirages (int, optional): Nombre de tirages (section Croissance, 10 000 par défaut)
+            graine (int, optional): Graine du générateur aléatoire (`croissance['graine']` par défaut)
+
+        Returns:
+            pd.DataFrame: Bandes mensuelles (voir `run`) ; les bandes du cash-flow annuel, les
+                          tirages et la synthèse finale sont dans `get_results()`
+        """
+        nb_tirages = int(nb_tirages or self.nb_tirages)
+        graine = self.croissance.get("graine") if graine is None else graine
+        tirages = self.tirer(nb_tirages, graine)
+
+        # Flux déterministes des prêts et de l'acquisition (nb_mois,)
+        paiements, capital_restant = self._flux_prets()
+        apport = self._apport()
+
+        # Flux stochastiques : (nb_tirages, nb_mois) ou (nb_mois,) si aucune hypothèse en jeu n'est tirée
+        valeur_bien = self._valeur_bien(tirages)
+        loyers = self._loyers(tirages)
+        charges = self._charges(tirages) + loyers * self.charges.get(ComputeCharges.POSTE_GESTION, 0) / 100
+
+        forme = (nb_tirages, len(self.mois))
+        cashflow = np.broadcast_to(loyers - charges - paiements, forme)
+        tresorerie = np.cumsum(cashflow, axis=1)
+        valeur_bien = np.broadcast_to(valeur_bien, forme)
+        patrimoine_net = valeur_bien - capital_restant + tresorerie - apport
+
+        mesures = {'cashflow': cashflow, 'tresorerie': tresorerie,
+                   'valeur_bien': valeur_bien, 'patrimoine_net': patrimoine_net}
+        bandes = {'date': self.mois.astype('datetime64[ns]')}
+        for nom, valeurs in mesures.items():
+            for p, bande in zip(self.PERCENTILES, np.percentile(valeurs, self.PERCENTILES, axis=0)):
+                bandes[f"{nom}_p{p}"] = bande
+
+        # Cash-flow annuel : somme des mois de chaque année civile, puis percentiles
+        annees = self.mois.astype('datetime64[Y]').astype(np.int64) + 1970
+        debuts_annees = np.flatnonzero(np.diff(annees, prepend=annees[0] - 1))
+        cashflow_annuel = np.add.reduceat(cashflow, debuts_annees, axis=1)
+        bandes_annuelles = {'annee': annees[debuts_annees]}
+        for p, bande in zip(self.PERCENTILES, np.percentile(cashflow_annuel, self.PERCENTILES, axis=0)):
+            bandes_annuelles[f"cashflow_p{p}"] = bande
+
+        self.results = {
+            'nb_tirages': nb_tirages,
+            'tirages': pd.DataFrame(tirages),
+            'bandes_annuelles': pd.DataFrame(bandes_annuelles),
+            'synthese': {
+                nom: dict(zip([f"p{p}" for p in self.PERCENTILES],
+                              np.percentile(valeurs[:, -1], self.PERCENTILES).tolist()))
+                for nom, valeurs in mesures.items() if nom != 'cashflow'
+            },
+            'probabilite_tresorerie_negative': float(np.mean(tresorerie[:, -1] < 0)),
+        }
+        return pd.DataFrame(bandes)
+
+    def tirer(self, nb_tirages, graine=None):
+        """
+        Tirages conjoints des hypothèses munies d'une loi, en %.
+
+        Lois reconnues (`croissance['distributions'][cle]['loi']`) :
+        - 'normale' : centrée sur la valeur de l'hypothèse, `ecart_type` en points ;
+        - 'uniforme' : entre `min` et `max` ;
+        - 'triangulaire' : entre `min` et `max`, de mode `mode` (la valeur de l'hypothèse par défaut).
+
+        Args:
+            nb_tirages (int): Nombre de tirages
+            graine (int, optional): Graine du générateur aléatoire
+
+        Returns:
+            dict: Hypothèse -> tirages (nb_tirages,)
+
+        Raises:
+            ValueError: Loi inconnue
+        """
+        rng = np.random.default_rng(graine)
+        tirages = {}
+        for cle, loi in self.distributions.items():
+            valeur = self.croissance.get(cle, 0.0)
+            nom = loi.get('loi', 'normale').lower()
+            if nom == 'normale':
+                tirages[cle] = rng.normal(valeur, loi.get('ecart_type', 0.0), nb_tirages)
+            elif nom == 'uniforme':
+                tirages[cle] = rng.uniform(loi['min'], loi['max'], nb_tirages)
+            elif nom == 'triangulaire':
+                tirages[cle] = rng.triangular(loi['min'], loi.get('mode', valeur), loi['max'], nb_tirages)
+            else:
+                raise ValueError(f"Loi inconnue pour {cle} : '{loi.get('loi')}'")
+            # Un taux inférieur à -100 % n'a pas de sens
+            np.maximum(tirages[cle], -99.0, out=tirages[cle])
+        return tirages
+
+    def _croissance(self, tirages, cle, exposants):
+        """
+        Facteurs de croissance (1 + taux ajusté)^k d'une hypothèse sur la grille mensuelle.
+
+        Returns:
+            np.ndarray: (nb_tirages, nb_mois) si l'hypothèse est tirée, (nb_mois,) sinon
+        """
+        fraction = self.indexation.FREQUENCES.get(self._frequence(cle), 1)
+        if cle not in tirages:
+            return (1 + self.croissance.get(cle, 0) / 100) ** (fraction * exposants)
+        # (1 + taux)^(fraction * k) pour tous les tirages en un produit extérieur
+        return np.exp(np.multiply.outer(fraction * np.log1p(tirages[cle] / 100), exposants))
+
+    def _periodes(self, cle):
+        """Périodes de mise à jour de l'hypothèse à chaque mois de la grille"""
+        return self.indexation.periodes(self._frequence(cle), self.date_achat)[self.positions]
+
+    def _frequence(self, cle):
+        return self.croissance.get(f"frequence_{cle}", "Annuelle")
+
+    def _valeur_bien(self, tirages):
+        """Prix corrigé de l'inflation et de la croissance, mêmes mises à jour que ComputeBien"""
+        valeur = float(self.bien["prix_achat"])
+        for cle in ('taux_inflation', 'taux_croissance_annuel'):
+            periodes = self.indexation.periodes(self._frequence(cle), self.date_achat)
+            valeur = valeur * self._croissance(tirages, cle, ComputeBien._exposants(periodes)[self.positions])
+        return valeur
+
+    def _loyers(self, tirages):
+        """
+        Loyers encaissés par mois et par tirage.
+
+        Les lots indexés au taux de la section Croissance sont regroupés par nombre
+        d'indexations : loyers = G @ W, où G[n, e] = (1 + taux_n)^e et W[e, m] est la somme
+        des loyers hors indexation des lots indexés e fois au mois m.
+        """
+        if not self.loyers:
+            return np.zeros(len(self.mois))
+
+        etat = EtatLocatif.depuis_loyers(self.loyers, self.croissance)
+        dates = etat.dates_paiement(self.mois[0], self.mois[-1])
+        base = etat.loyer_mensuel[:, None] * etat.facteurs(dates, indexation=False)
+        nb_indexations = etat.nb_indexations(dates)
+
+        # Lots à taux propre (ou non indexés) : flux déterministe
+        fixes = ~etat.indexation_croissance
+        loyers = (base[fixes] * (1 + etat.taux_indexation[fixes, None]) ** nb_indexations[fixes]).sum(axis=0)
+
+        cle = 'taux_augmentation_loyer'
+        variables = etat.indexation_croissance
+        if cle not in tirages or not variables.any():
+            return loyers + (base[variables] * (1 + etat.taux_indexation[variables, None])
+                             ** nb_indexations[variables]).sum(axis=0)
+
+        exposants = nb_indexations[variables]
+        poids = np.zeros((exposants.max() + 1, len(self.mois)))
+        np.add.at(poids, (exposants, np.broadcast_to(np.arange(len(self.mois)), exposants.shape)), base[variables])
+        taux = (1 + tirages[cle] / 100) ** self.indexation.FREQUENCES.get(self._frequence(cle), 1)
+        return np.power.outer(taux, np.arange(len(poids))) @ poids + loyers
+
+    def _charges(self, tirages):
+        """Dépenses récurrentes de ComputeCharges (mêmes postes et mois de paiement), par hypothèse de croissance"""
+        p = ComputeCharges.tableau_parametres(self.charges)
+        echeances = p['montant_echeance'][:, None] * p['mois_payes'][:, self.mois.astype(np.int64) % 12]
+        charges = np.zeros(len(self.mois))
+        for cle in np.unique(p['croissance']):
+            montants = echeances[p['croissance'] == cle].sum(axis=0)
+            if montants.any():
+                charges = charges + montants * self._croissance(tirages, cle, self._periodes(cle))
+        return charges
+
+    def _flux_prets(self):
+        """Paiements mensuels (échéances et frais) et capital restant dû en fin de mois, tous prêts"""
+        prets, _ = self.entrees['ComputePret']
+        total = prets[prets['pret'] == 'total']
+        mois = total['date'].to_numpy().astype('datetime64[M]')
+        paiements = np.zeros(len(self.mois))
+        capital = np.full(len(self.mois), np.nan)
+        if len(total):
+            est_paiement = (total['metrique'] == 'paiement').to_numpy()
+            indices = np.searchsorted(self.mois, mois)
+            dans_grille = indices < len(self.mois)
+            np.add.at(paiements, indices[est_paiement & dans_grille], total['valeur'].to_numpy()[est_paiement & dans_grille])
+            # Dernier encours connu de chaque mois (lignes triées par date)
+            est_capital = (total['metrique'] == 'capital_restant').to_numpy() & dans_grille
+            capital[indices[est_capital]] = total['valeur'].to_numpy()[est_capital]
+        capital = pd.Series(capital).ffill().fillna(0.0).to_numpy()
+        return paiements, capital
+
+    def _apport(self):
+        """Apport personnel : prix, frais d'acquisition et travaux non financés par les prêts"""
+        prix = self.bien["prix_achat"]
+        frais = prix * (self.frais_global.get("frais_notaire", 0) + self.frais_global.get("frais_agence_immo", 0)) / 100
+        frais += self.frais_global.get("frais_courtage", 0)
+        cout = prix + frais + self.travaux.get("budget_total", 0)
+        return cout - sum(pret['montant'] for pret in self.prets)
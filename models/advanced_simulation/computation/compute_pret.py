@@ -4,34 +4,69 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
 from models.advanced_simulation.computation.base_compute import BaseCompute
+from models.advanced_simulation.computation.journal import concatener, ecritures
+from models.advanced_simulation.computation.amortissement import echeancier_en_cache
+from models.advanced_simulation.computation.taeg import taeg_prets
+from models.advanced_simulation.computation.taux_variable import chemin_index_lineaire, construire_chemins_taux
 
 class ComputePret(BaseCompute):
-    
-    def __init__(self):
-        super().__init__()  # Appelle le constructeur parent pour initialiser les données
-        self.results = {}   # Pour stocker les résultats des calculsteur parent pour initialiser les données
+    """
+    Calcule les flux de tous les prêts au format long : une ligne par (date, prêt, métrique).
+
+    Les dates retenues sont celles où un prêt a un mouvement (échéance, frais, assurance).
+    Les totaux sont ajoutés sous le prêt 'total' : somme par date pour les flux, somme des
+    capitaux restants propagés dans le temps pour les encours.
+    """
+
+    COLONNES = ['date', 'pret', 'metrique', 'valeur']
+
+    # Encours (valeurs de stock) : leurs totaux ne s'obtiennent pas par simple somme par date
+    METRIQUES_STOCK = ['capital_restant', 'capital_restant_reel']
+
+    METRIQUES_FRAIS = [
+        'frais_dossier',
+        'frais_courtage',
+        'frais_divers',
+        'frais_caution',
+        'frais_garantie_hypothecaire',
+        'frais_assurance',
+    ]
+
+    # Compte de contrepartie des flux de trésorerie de chaque métrique (journal de trésorerie).
+    # Seuls les intérêts payés sont décaissés : ceux capitalisés pendant un différé total
+    # sont remboursés avec le principal.
+    COMPTES = {
+        'principal': 'emprunt',
+        'interets_payes': 'interets',
+        'penalite': 'penalites',
+        'frais_dossier': 'frais_pret',
+        'frais_courtage': 'frais_pret',
+        'frais_divers': 'frais_pret',
+        'frais_caution': 'frais_pret',
+        'frais_garantie_hypothecaire': 'frais_pret',
+        'frais_assurance': 'assurance_emprunteur',
+    }
+
+    SECTIONS = ('prets',
+                'croissance.taux_inflation', 'croissance.frequence_taux_inflation',
+                'croissance.taux_croissance_assurance_emprunteur',
+                'croissance.frequence_taux_croissance_assurance_emprunteur')
+
+    def __init__(self, contexte=None):
+        super().__init__(contexte)  # Appelle le constructeur parent pour initialiser les données
+        self.results = {}   # Pour stocker les résultats des calculs
     
     def run(self):
         """
-        Crée un DataFrame des paiements quotidiens pour chaque prêt de manière optimisée.
+        Calcule l'échéancier, les frais et les valeurs réelles de chaque prêt.
         
         Returns:
-            pd.DataFrame: DataFrame avec les paiements quotidiens pour chaque prêt
+            pd.DataFrame: Colonnes 'date', 'pret', 'metrique', 'valeur' (prêts et 'total')
         """
         if not self.prets:
-            return
+            return pd.DataFrame(columns=self.COLONNES)
         
-        # Déterminer les dates extrêmes pour tous les prêts
         dates_debut = [pret['start_date'] for pret in self.prets]
-        date_debut_min = min(dates_debut)
-        
-        # Calculer les dates de fin en une seule passe
-        dates_fin = [date_debut + relativedelta(months=pret['duree_mois']) for date_debut, pret in zip(dates_debut, self.prets)]
-        date_fin_max = max(dates_fin)
-        
-        # Créer la plage de dates une seule fois
-        jours = pd.date_range(start=date_debut_min, end=date_fin_max, freq='D')
-        df = pd.DataFrame({'date': jours})
         
         # Dictionnaires pour stocker les périodicités et intervalles
         periodicite_map = {
@@ -41,7 +76,9 @@ class ComputePret(BaseCompute):
             'Annuelle': {'freq': 'AS', 'periodes_par_an': 1, 'delta': relativedelta(years=1)}
         }
         
-        # Parcourir chaque prêt une seule fois
+        # Un bloc (dates, métriques) par prêt, assemblés en une seule allocation à la fin
+        blocs = []
+        
         for i, pret in enumerate(self.prets):
             # Extraire les informations du prêt
             nom_pret = pret['pret']
@@ -69,45 +106,67 @@ class ComputePret(BaseCompute):
             # Calculer les paramètres du prêt
             taux_par_periode = taux_interet / periodes_par_an
             
-            # Simuler l'amortissement en une seule opération vectorisée si possible
-            amortissement = self._calculer_tableau_amortissement(
-                montant, taux_par_periode, nb_periodes, dates_paiement, differe)
-            
-            # Appliquer les remboursements anticipés
-            amortissement = self._appliquer_remboursements_anticipes(
-                amortissement, pret.get('remboursements_anticipes', []), taux_par_periode)
-            
-            # Créer les colonnes pour ce prêt
-            colonnes_pret = [
-                f'principal_{nom_pret}', 
-                f'interets_{nom_pret}', 
-                f'paiement_{nom_pret}', 
-                f'capital_restant_{nom_pret}'
-            ]
+            # Révisions du taux pour les prêts Variable, Capé et Taux Mixte
+            revisions_taux = self._calculer_revisions_taux(pret, nb_periodes, periodes_par_an)
             
-            for col in colonnes_pret:
-                df[col] = 0.0
+            # Simuler l'amortissement, remboursements anticipés compris, en une seule passe vectorisée
+            amortissement = self._calculer_tableau_amortissement(
+                montant, taux_par_periode, nb_periodes, dates_paiement, differe, periodes_par_an,
+                pret.get('remboursements_anticipes', []), revisions_taux,
+                pret.get('type_remboursement', "Amortissable"))
             
-            # Remplir les données du tableau d'amortissement dans le DataFrame principal
-            df = self._ajouter_amortissement(df, amortissement, nom_pret, montant)
+            # Aligner échéances et frais sur les dates de mouvement du prêt
+            dates, metriques = self._ajouter_amortissement(amortissement, date_debut, montant)
+            metriques.update(self._ajouter_frais(dates, pret, date_debut))
             
-            # Calculer et ajouter les frais du prêt
-            df = self._ajouter_frais(df, pret, date_debut, nom_pret)
+            # Paiement total du prêt : échéance et frais
+            metriques['paiement'] = metriques['echeance'] + metriques['frais']
             
             # Simuler croissance et inflation
-            df = self._ajouter_croissance(df, date_debut, nom_pret)
+            metriques.update(self._ajouter_croissance(dates, metriques, date_debut))
             
-            # Recalculer le paiement total pour ce prêt
-            cols = [f'paiement_{nom_pret}', f'frais_{nom_pret}']
-            df[f'paiement_{nom_pret}'] = df[cols].sum(axis=1)
+            blocs.append((nom_pret, dates, metriques))
+        
+        df = self._assembler(blocs)
+        self.results['ecritures'] = self.ecritures(df)
+        # TAEG de chaque prêt : échéances et frais datés, résolus en un seul appel
+        self.results['taeg'] = {pret: float(taeg) for pret, taeg in taeg_prets(df, self.prets).items()}
         
         # Calculer tous les totaux à la fin
-        df = self._calculer_totaux(df)
+        return self._calculer_totaux(df)
+    
+    def ecritures(self, df):
+        """
+        Écritures du journal de trésorerie : déblocage de chaque prêt, puis principal,
+        intérêts, pénalités et frais décaissés (compte de contrepartie : `COMPTES`).
+        
+        Args:
+            df (pd.DataFrame): Résultat au format long, hors prêt 'total'
+        
+        Returns:
+            pd.DataFrame: Journal (voir `journal.ecritures`), source : nom du prêt
+        """
+        flux = df[df['metrique'].isin(list(self.COMPTES)).to_numpy()]
+        deblocages = ecritures([pret['start_date'] for pret in self.prets], [pret['montant'] for pret in self.prets],
+                               'emprunt', [pret['pret'] for pret in self.prets])
+        decaissements = ecritures(flux['date'], -flux['valeur'].to_numpy(),
+                                  flux['metrique'].map(self.COMPTES).to_numpy(dtype=object),
+                                  flux['pret'].to_numpy(dtype=object))
+        return concatener([deblocages, decaissements])
+    
+    @staticmethod
+    def en_colonnes(df):
+        """
+        Vue large du résultat : une ligne par date, colonnes MultiIndex (pret, metrique).
         
-        # Merge onthe self.df_Dates
-        df
+        Args:
+            df (pd.DataFrame): Résultat au format long de `run`
         
-        return df
+        Returns:
+            pd.DataFrame: Tableau croisé, 0 pour les dates sans mouvement
+        """
+        return df.pivot_table(index='date', columns=['pret', 'metrique'], values='valeur',
+                              aggfunc='sum', fill_value=0.0, observed=True)
     
     def _calculer_date_premier_remboursement(self, date_debut, periodicite, option):
         """Calcule la date du premier remboursement selon l'option choisie"""
@@ -152,267 +211,240 @@ class ComputePret(BaseCompute):
         else:
             return date_debut
     
-    def _calculer_tableau_amortissement(self, montant, taux_par_periode, nombre_paiements, 
-                                        dates_paiement, differe):
-        """Calcule le tableau d'amortissement de manière optimisée"""
-        # Initialiser le DataFrame d'amortissement
-        amortissement = pd.DataFrame({
-            'date_paiement': dates_paiement,
-            'paiement': 0.0,
-            'interets': 0.0,
-            'principal': 0.0,
-            'capital_restant': montant  # Valeur initiale
-        })
-        
-        capital_restant = montant
-        duree_differe = 0
-        taux_differe = taux_par_periode * 100  # Convertir en pourcentage pour le différé
+    def _calculer_revisions_taux(self, pret, nb_periodes, periodes_par_an):
+        """
+        Calcule les révisions de taux d'un prêt à taux Variable, Capé ou Mixte.
         
-        # Gérer le différé
-        if differe.get('active', False):
-            duree_differe = differe.get('duree', 0)
-            taux_differe = differe.get('taux', taux_differe) / 100  # Convertir en décimal
-            periode_differe = int(duree_differe / (12 / (100 / taux_par_periode)))
-        else:
-            periode_differe = 0
-            
-        # Pré-calculer la mensualité hors période de différé
-        if taux_par_periode > 0:
-            paiement_periodique = montant * (taux_par_periode * (1 + taux_par_periode) ** 
-                                           (nombre_paiements - periode_differe)) / \
-                                ((1 + taux_par_periode) ** (nombre_paiements - periode_differe) - 1)
-        else:
-            paiement_periodique = montant / (nombre_paiements - periode_differe)
-        
-        # Remplir le tableau d'amortissement
-        for idx in range(len(amortissement)):
-            if idx < periode_differe and differe.get('active', False):
-                # Période de différé
-                type_differe = differe.get('type', '')
-                taux_periode_differe = taux_differe / (100 / taux_par_periode)
-                
-                if 'Partiel' in type_differe or 'Intérêts' in type_differe:
-                    # Paiement des intérêts uniquement
-                    amortissement.loc[idx, 'interets'] = capital_restant * taux_periode_differe
-                    amortissement.loc[idx, 'principal'] = 0
-                    amortissement.loc[idx, 'paiement'] = amortissement.loc[idx, 'interets']
-                elif 'Total' in type_differe:
-                    # Aucun paiement (capitalisation des intérêts)
-                    amortissement.loc[idx, 'interets'] = capital_restant * taux_periode_differe
-                    amortissement.loc[idx, 'principal'] = 0
-                    amortissement.loc[idx, 'paiement'] = 0
-                    capital_restant += amortissement.loc[idx, 'interets']
-                
-                amortissement.loc[idx, 'capital_restant'] = capital_restant
-            else:
-                # Calcul normal post-différé
-                amortissement.loc[idx, 'interets'] = capital_restant * taux_par_periode
-                amortissement.loc[idx, 'paiement'] = paiement_periodique
-                amortissement.loc[idx, 'principal'] = paiement_periodique - amortissement.loc[idx, 'interets']
-                
-                capital_restant -= amortissement.loc[idx, 'principal']
-                amortissement.loc[idx, 'capital_restant'] = capital_restant
+        L'index suit une évolution linéaire depuis sa valeur initiale ; le taux révisé vaut
+        index + marge, la marge étant l'écart entre le taux initial et l'index initial.
+        Un prêt Capé est borné autour du taux initial, un Taux Mixte commence par une phase fixe.
         
-        return amortissement
-    
-    def _appliquer_remboursements_anticipes(self, amortissement, remboursements_anticipes, taux_par_periode):
-        """Applique les remboursements anticipés au tableau d'amortissement"""
-        if not remboursements_anticipes:
-            return amortissement
-            
-        # Trier les remboursements par date
-        remboursements_anticipes = sorted(remboursements_anticipes, 
-                                         key=lambda r: r['date'] if isinstance(r['date'], datetime) 
-                                                              else datetime.strptime(r['date'], '%Y-%m-%d'))
-        
-        for remb in remboursements_anticipes:
-            date_remb = remb['date'] if isinstance(remb['date'], datetime) else datetime.strptime(remb['date'], '%Y-%m-%d')
-            montant_remb = remb['montant']
-            
-            if montant_remb <= 0:
-                continue
-                
-            penalite = remb.get('penalite', 0) / 100
-            montant_penalite = montant_remb * penalite
-            montant_effectif = montant_remb - montant_penalite
-            type_remb = remb.get('type', 'Partiel')
-            
-            # Trouver l'index après remboursement
-            idx_remb = amortissement[amortissement['date_paiement'] > date_remb].index
-            
-            if len(idx_remb) > 0:
-                idx_remb = idx_remb[0]
-                
-                # Capital restant avant remboursement
-                capital_restant_avant = amortissement.loc[idx_remb - 1, 'capital_restant'] if idx_remb > 0 else amortissement.loc[0, 'capital_restant']
-                nouveau_capital = max(0, capital_restant_avant - montant_effectif)
-                
-                if type_remb == 'Total' and nouveau_capital == 0:
-                    # Remboursement total
-                    amortissement = amortissement[:idx_remb].copy()
-                    if idx_remb > 0:
-                        amortissement.loc[idx_remb - 1, 'paiement'] += montant_remb
-                else:
-                    # Remboursement partiel
-                    if idx_remb > 0:
-                        amortissement.loc[idx_remb - 1, 'paiement'] += montant_penalite
-                    
-                    if 'reduction_duree' in type_remb.lower():
-                        # Réduction de durée
-                        paiement_periodique = amortissement.loc[idx_remb, 'paiement']
-                        duree_restante = self._calculer_duree_restante(nouveau_capital, taux_par_periode, paiement_periodique)
-                        
-                        if duree_restante < len(amortissement) - idx_remb:
-                            amortissement = amortissement[:idx_remb + int(duree_restante)].copy()
-                    else:
-                        # Réduction des mensualités
-                        duree_restante = len(amortissement) - idx_remb
-                        
-                        if taux_par_periode > 0:
-                            nouvelle_mensualite = nouveau_capital * (taux_par_periode * (1 + taux_par_periode) ** duree_restante) / \
-                                               ((1 + taux_par_periode) ** duree_restante - 1)
-                        else:
-                            nouvelle_mensualite = nouveau_capital / duree_restante
-                        
-                        # Vectorisation du recalcul pour les périodes restantes
-                        capital_temp = nouveau_capital
-                        for j in range(idx_remb, len(amortissement)):
-                            interets = capital_temp * taux_par_periode
-                            amortissement.loc[j, 'interets'] = interets
-                            amortissement.loc[j, 'paiement'] = nouvelle_mensualite
-                            amortissement.loc[j, 'principal'] = nouvelle_mensualite - interets
-                            capital_temp -= amortissement.loc[j, 'principal']
-                            amortissement.loc[j, 'capital_restant'] = capital_temp
-        
-        return amortissement
+        Returns:
+            list: Tuples (échéance de révision, taux par période)
+        """
+        type_taux = pret.get('type_taux', 'Fixe')
+        if type_taux not in ("Variable", "Capé", "Taux Mixte"):
+            return []
+        
+        params = pret.get('taux_variable', {})
+        taux_initial = pret['taux_interet'] / 100
+        index_initial = params.get('index_initial', pret['taux_interet']) / 100
+        duree_fixe_mois = params.get('duree_fixe_mois', 60 if type_taux == "Taux Mixte" else 0)
+        
+        chemin_index = chemin_index_lineaire(
+            index_initial, params.get('variation_index', 0) / 100, nb_periodes, periodes_par_an)
+        
+        cap = plancher = None
+        if type_taux == "Capé":
+            cap = taux_initial + params.get('cap', 1.0) / 100
+            plancher = max(taux_initial - params.get('plancher', 1.0) / 100, 0.0)
+        
+        taux, revisions = construire_chemins_taux(
+            taux_initial, chemin_index,
+            periode_fixe=int(round(duree_fixe_mois * periodes_par_an / 12)),
+            periodicite_revision=max(int(round(params.get('periodicite_revision_mois', 12) * periodes_par_an / 12)), 1),
+            marge=taux_initial - index_initial,
+            cap=cap,
+            plancher=plancher)
+        
+        return [(int(periode), taux[0, periode] / periodes_par_an) for periode in revisions]
     
-    def _ajouter_amortissement(self, df, amortissement, nom_pret, montant_initial):
-        """Remplit le DataFrame principal avec les données du tableau d'amortissement"""
-        
-        # Sélectionner et renommer les colonnes de l'amortissement
-        cols_to_use = ['date_paiement', 'paiement', 'principal', 'interets', 'capital_restant']
-        df_amort = amortissement[cols_to_use].rename(columns={
-            'date_paiement': 'date',
-            'paiement': f'paiement_{nom_pret}',
-            'principal': f'principal_{nom_pret}',
-            'interets': f'interets_{nom_pret}',
-            'capital_restant': f'capital_restant_{nom_pret}'
-        })
+    def _calculer_tableau_amortissement(self, montant, taux_par_periode, nombre_paiements,
+                                        dates_paiement, differe, periodes_par_an,
+                                        remboursements_anticipes=None, revisions_taux=None,
+                                        type_remboursement="Amortissable"):
+        """Lit le tableau d'amortissement dans le cache partagé des échéanciers, puis construit le DataFrame"""
+        periode_differe = 0
+        taux_differe = taux_par_periode
+        type_differe = "Aucun"
 
-        df_amort.set_index('date', inplace=True)
-        df.set_index('date', inplace=True)
-        df.update(df_amort)
-        df.reset_index(inplace=True)
-        
-        # Capital restant : remplir avec le montant initial puis forward-fill
-        cap_col = f'capital_restant_{nom_pret}'
-        df[cap_col] = df[cap_col].fillna(montant_initial)
-        df[cap_col] = df[cap_col].replace(0, method='ffill')
-        
-        return df
-    
-    def _ajouter_frais(self, df, pret, date_debut, nom_pret):
-        """Ajoute les frais de prêt au DataFrame, avec colonnes détaillées"""
+        # Gérer le différé (durée saisie en mois, taux annuel en %)
+        if differe.get('active', False):
+            periode_differe = int(round(differe.get('duree', 0) * periodes_par_an / 12))
+            taux_differe = differe.get('taux', taux_par_periode * periodes_par_an * 100) / 100 / periodes_par_an
+            type_differe = differe.get('type', '')
 
-        # Initialisation des colonnes individuelles
-        frais_colonnes = {
-            f'frais_dossier_{nom_pret}': pret['frais_dossier'],
-            f'frais_courtage_{nom_pret}': pret['frais_courtage'],
-            f'frais_divers_{nom_pret}': pret['frais_divers'],
-            f'frais_caution_{nom_pret}': pret['montant'] * pret['frais_caution'] / 100,
-            f'frais_garantie_hypothecaire_{nom_pret}': pret['montant'] * pret['frais_garantie_hypothecaire'] / 100,
-        }
+        # Révisions de taux et remboursements anticipés, appliqués sur les segments de l'échéancier
+        evenements = self._evenements_echeancier(
+            dates_paiement, remboursements_anticipes or [], revisions_taux or [])
 
-        # Créer toutes les colonnes avec 0 par défaut
-        for col in frais_colonnes:
-            df[col] = 0
+        tableau = echeancier_en_cache(
+            montant, taux_par_periode, nombre_paiements,
+            periode_differe=periode_differe,
+            taux_differe_par_periode=taux_differe,
+            type_differe=type_differe,
+            type_remboursement=type_remboursement,
+            evenements=evenements)
+        return pd.DataFrame({'date_paiement': dates_paiement[:len(tableau['paiement'])], **tableau})
+    
+    def _evenements_echeancier(self, dates_paiement, remboursements_anticipes, revisions_taux=()):
+        """
+        Traduit remboursements anticipés et révisions de taux en événements de l'échéancier segmenté.
 
-        # Remplir les frais uniquement à la date de début
-        for col, montant in frais_colonnes.items():
-            df.loc[df['date'] == date_debut, col] = montant
+        Chaque remboursement est localisé par recherche dichotomique dans les dates de paiement
+        puis traité en forme fermée : le coût est proportionnel au nombre d'événements,
+        pas au nombre de périodes. Les événements sont renvoyés dans l'ordre chronologique.
 
-        # Ajouter l'assurance annuelle
-        montant_assurance_annuelle = pret['frais_assurance']
-        col_assurance = f'frais_assurance_{nom_pret}'
-        df[col_assurance] = 0
-        df.loc[(df['date'].dt.month == 12) & (df['date'].dt.day == 31), col_assurance] = montant_assurance_annuelle
+        Returns:
+            list: Événements au format de `Echeancier.appliquer`
+        """
+        evenements = [(periode, 'revision', taux) for periode, taux in revisions_taux]
+        if not remboursements_anticipes:
+            return evenements
 
-        # Mettre à jour aussi la colonne principale avec la somme des frais
-        all_frais_cols = list(frais_colonnes.keys()) + [col_assurance]
-        df[f'frais_{nom_pret}'] = df[all_frais_cols].sum(axis=1)
+        dates = pd.to_datetime(pd.Series(dates_paiement)).values
 
-        return df
-      
-    def _ajouter_croissance(self, df, date_debut, nom_pret):
-        """Ajoute les colonnes en valeur réelle pour assurance, intérêts, principal, paiements et capital restant dû"""
+        for remb in sorted(remboursements_anticipes, key=lambda r: pd.Timestamp(r['date'])):
+            # Première échéance strictement postérieure au remboursement
+            idx_remb = int(np.searchsorted(dates, pd.Timestamp(remb['date']).to_datetime64(), side='right'))
+            evenements.append((idx_remb, 'remboursement', remb['montant'],
+                               remb.get('penalite', 0) / 100, remb.get('type', 'Partiel')))
+
+        return sorted(evenements, key=lambda e: e[0])
+    
+    def _ajouter_amortissement(self, amortissement, date_debut, montant_initial):
+        """
+        Construit l'axe des dates de mouvement du prêt et y aligne le tableau d'amortissement.
         
-        # Extraction des taux
-        taux_croissance_assurance = self.croissance["taux_croissance_assurance_emprunteur"]/100
-        taux_inflation = self.croissance["taux_inflation"]/100
+        Les dates retenues sont la date de début, les échéances et les 31 décembre (assurance)
+        compris dans la durée du prêt. Le capital restant est propagé entre deux échéances.
         
-        # Ajustement: vérifiez si ces taux sont cohérents (par exemple, 2% = 0.02)
-        print(f"Taux inflation: {taux_inflation}, Taux croissance assurance: {taux_croissance_assurance}")
+        Returns:
+            tuple: (dates datetime64 triées, dict métrique -> tableau NumPy aligné)
+        """
+        dates_paiement = pd.to_datetime(amortissement['date_paiement']).values.astype('datetime64[ns]')
+        debut = np.datetime64(pd.Timestamp(date_debut), 'ns')
+        fin = dates_paiement[-1] if len(dates_paiement) else debut
+        
+        dates = np.unique(np.concatenate([[debut], dates_paiement, self._dates_assurance(debut, fin)]))
+        idx = np.searchsorted(dates, dates_paiement)
+        
+        metriques = {}
+        for source, metrique in [('paiement', 'echeance'), ('principal', 'principal'),
+                                 ('interets', 'interets'), ('interets_payes', 'interets_payes'),
+                                 ('remboursement_anticipe', 'remboursement_anticipe'),
+                                 ('penalite', 'penalite')]:
+            valeurs = np.zeros(len(dates))
+            np.add.at(valeurs, idx, amortissement[source].to_numpy())
+            metriques[metrique] = valeurs
+        
+        # Capital restant : montant initial jusqu'à la première échéance puis propagation
+        dernier_paiement = np.searchsorted(dates_paiement, dates, side='right') - 1
+        capital = amortissement['capital_restant'].to_numpy()
+        metriques['capital_restant'] = np.where(
+            dernier_paiement >= 0, capital[np.maximum(dernier_paiement, 0)], montant_initial)
+        
+        return dates, metriques
+    
+    def _dates_assurance(self, debut, fin):
+        """31 décembre de chaque année comprise entre `debut` et `fin`"""
+        annees = np.arange(pd.Timestamp(debut).year, pd.Timestamp(fin).year + 1)
+        dates = (annees - 1970 + 1).astype('datetime64[Y]').astype('datetime64[D]') - np.timedelta64(1, 'D')
+        dates = dates.astype('datetime64[ns]')
+        return dates[(dates >= debut) & (dates <= fin)]
+    
+    def _ajouter_frais(self, dates, pret, date_debut):
+        """Calcule les frais du prêt alignés sur les dates de mouvement, avec leur total"""
+        
+        # Frais ponctuels, payés à la date de début
+        frais_ponctuels = {
+            'frais_dossier': pret['frais_dossier'],
+            'frais_courtage': pret['frais_courtage'],
+            'frais_divers': pret['frais_divers'],
+            'frais_caution': pret['montant'] * pret['frais_caution'] / 100,
+            'frais_garantie_hypothecaire': pret['montant'] * pret['frais_garantie_hypothecaire'] / 100,
+        }
         
-        # Conversion en taux journalier avec une méthode plus précise
-        taux_croissance_assurance_journalier = pow((1 + taux_croissance_assurance), (1 / 365.25)) - 1
-        taux_inflation_journalier = pow((1 + taux_inflation), (1 / 365.25)) - 1
+        est_debut = dates == np.datetime64(pd.Timestamp(date_debut), 'ns')
+        frais = {col: np.where(est_debut, montant, 0.0) for col, montant in frais_ponctuels.items()}
         
-        # Calcul des jours depuis le début
-        df['jours_depuis_debut'] = (df['date'] - pd.to_datetime(date_debut)).dt.days
+        # Assurance annuelle, payée chaque 31 décembre
+        jours = pd.DatetimeIndex(dates)
+        est_fin_annee = (jours.month == 12) & (jours.day == 31)
+        frais['frais_assurance'] = np.where(est_fin_annee, pret['frais_assurance'], 0.0)
         
-        # Facteur d'actualisation pour chaque jour
-        df['facteur_inflation'] = pow((1 + taux_inflation_journalier), df['jours_depuis_debut'])
+        frais['frais'] = np.sum([frais[col] for col in self.METRIQUES_FRAIS], axis=0)
         
-        # Croissance réelle des frais d'assurance (avec vérification des valeurs)
-        df[f'frais_assurance_reel_{nom_pret}'] = (
-            df[f'frais_assurance_{nom_pret}'] * 
-            pow((1 + taux_croissance_assurance_journalier), df['jours_depuis_debut']) /
-            df['facteur_inflation']
-        )
+        return frais
+      
+    def _ajouter_croissance(self, dates, metriques, date_debut):
+        """Calcule les valeurs réelles pour assurance, intérêts, principal, paiements et capital restant dû"""
         
-        # df[f'frais_reel_{nom_pret}'] = df[f'frais_assurance_reel_{nom_pret}'] + 
+        # Courbes partagées d'inflation et de croissance de l'assurance, depuis le début du prêt
+        facteur_inflation = self.indexation.aux_dates(
+            self.indexation.courbe_croissance("taux_inflation", date_debut), dates)
+        facteur_assurance = self.indexation.aux_dates(
+            self.indexation.courbe_croissance("taux_croissance_assurance_emprunteur", date_debut), dates)
         
-        # Liste des colonnes à actualiser en valeur réelle
-        colonnes = ['interets', 'principal', 'paiement', 'capital_restant']
-        for col in colonnes:
-            df[f'{col}_reel_{nom_pret}'] = df[f'{col}_{nom_pret}'] / df['facteur_inflation']
+        reels = {
+            'frais_assurance_reel': metriques['frais_assurance'] * facteur_assurance / facteur_inflation,
+        }
         
-        return df
-
+        for col in ['interets', 'principal', 'paiement', 'capital_restant']:
+            reels[f'{col}_reel'] = metriques[col] / facteur_inflation
         
-    def _calculer_totaux(self, df):
-        """Calcule les totaux pour tous les prêts"""
-        # Identifier les colonnes par type
-        prefixes = [
-            'paiement_pret_', 
-            'principal_pret_', 
-            'interets_pret_', 
-            'frais_pret_', 
-            'capital_restant_pret_',
-            
-            # 'frais_reel_',
-            'frais_assurance_reel_',
-            'principal_reel_',
-            'interets_reel_',
-            'paiement_reel_',
-            'capital_restant_reel_'
-            ]
-        
-        suffix = '_total'
-        
-        for prefix in prefixes:
-            cols = [col for col in df.columns if col.startswith(prefix) and not col.endswith(suffix)]
-            if cols:
-                df[f'{prefix}total'] = df[cols].sum(axis=1)
-        
-        return df
+        return reels
     
-    def _calculer_duree_restante(self, capital, taux, mensualite):
-        """Calcule la durée restante du prêt après un remboursement anticipé"""
-        if taux == 0:
-            return capital / mensualite
+    def _assembler(self, blocs):
+        """
+        Assemble les blocs de tous les prêts en un DataFrame long, en une seule allocation.
+        
+        Args:
+            blocs (list): Tuples (nom du prêt, dates, dict métrique -> valeurs)
+        
+        Returns:
+            pd.DataFrame: Colonnes 'date', 'pret', 'metrique', 'valeur'
+        """
+        noms_prets = [nom for nom, _, _ in blocs] + ['total']
+        noms_metriques = list(blocs[0][2].keys())
+        nb_metriques = len(noms_metriques)
+        nb_lignes = sum(len(dates) for _, dates, _ in blocs) * nb_metriques
+        
+        date = np.empty(nb_lignes, dtype='datetime64[ns]')
+        code_pret = np.empty(nb_lignes, dtype=np.int16)
+        code_metrique = np.empty(nb_lignes, dtype=np.int16)
+        valeur = np.empty(nb_lignes)
+        
+        debut = 0
+        for code, (_, dates, metriques) in enumerate(blocs):
+            n = len(dates)
+            fin = debut + n * nb_metriques
+            date[debut:fin] = np.tile(dates, nb_metriques)
+            code_pret[debut:fin] = code
+            code_metrique[debut:fin] = np.repeat(np.arange(nb_metriques), n)
+            valeur[debut:fin] = np.concatenate([metriques[m] for m in noms_metriques])
+            debut = fin
+        
+        return pd.DataFrame({
+            'date': date,
+            'pret': pd.Categorical.from_codes(code_pret, categories=noms_prets),
+            'metrique': pd.Categorical.from_codes(code_metrique, categories=noms_metriques),
+            'valeur': valeur,
+        })
+        
+    def _calculer_totaux(self, df):
+        """
+        Ajoute les totaux tous prêts confondus sous le prêt 'total'.
+        
+        Les flux sont sommés par (date, métrique). Les encours sont d'abord propagés
+        dans le temps pour chaque prêt, puis sommés.
+        """
+        est_stock = df['metrique'].isin(self.METRIQUES_STOCK)
+        
+        flux = df[~est_stock].groupby(['date', 'metrique'], observed=True)['valeur'].sum()
+        
+        stocks = (df[est_stock]
+                  .pivot_table(index='date', columns=['metrique', 'pret'], values='valeur',
+                               aggfunc='sum', observed=True)
+                  .ffill()
+                  .fillna(0.0)
+                  .T.groupby(level='metrique', observed=True).sum().T
+                  .stack())
         
-        if mensualite <= capital * taux:
-            return float('inf')  # Mensualité insuffisante pour couvrir les intérêts
+        totaux = pd.concat([flux, stocks]).reset_index(name='valeur')
+        totaux['pret'] = 'total'
+        totaux['metrique'] = pd.Categorical(totaux['metrique'].astype(str), categories=df['metrique'].cat.categories)
+        totaux['pret'] = pd.Categorical(totaux['pret'], categories=df['pret'].cat.categories)
         
-        return np.log(mensualite / (mensualite - capital * taux)) / np.log(1 + taux)
\ No newline at end of file
+        return (pd.concat([df, totaux[self.COLONNES]], ignore_index=True)
+                .sort_values(['date', 'pret', 'metrique'], kind='stable', ignore_index=True))
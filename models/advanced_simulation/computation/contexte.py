@@ -0,0 +1,155 @@
+from collections.abc import Mapping
+from datetime import datetime
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from models.advanced_simulation.component.data_store import DataStore
+from models.advanced_simulation.computation.indexation import ServiceIndexation
+from models.advanced_simulation.computation.agregation import ServiceAgregation
+from models.advanced_simulation.computation.cache import empreinte
+
+
+class ContexteSimulation:
+    """
+    Contexte partagé d'une simulation, construit une fois par ComputeManager.
+
+    Il regroupe les sections du DataStore (figées en profondeur), le calendrier journalier et ses
+    décompositions précalculées (année, mois, jour du mois, jours écoulés), les bornes des
+    périodes mensuelles, trimestrielles et annuelles, ainsi que les services d'indexation et
+    d'agrégation. Tous les tableaux sont en lecture seule et le contexte ne peut pas être
+    modifié après sa construction : un calculateur ne peut pas altérer les données d'un autre.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): Sections du DataStore (copiées : le contexte ne dépend plus du DataStore)
+        """
+        # Sections figées à tous les niveaux : dicts en MappingProxyType, listes en tuples
+        self.data = figer_valeur(data)
+
+        dates = construire_calendrier(data)['date'].to_numpy(dtype='datetime64[ns]')
+        jours = dates.astype('datetime64[D]')
+        self.dates = _figer(dates)
+        self.annees = _figer(jours.astype('datetime64[Y]').astype(np.int64) + 1970)
+        self.mois = _figer(jours.astype('datetime64[M]').astype(np.int64) % 12 + 1)
+        self.jours = _figer((jours - jours.astype('datetime64[M]')).astype(np.int64) + 1)
+        self.jours_ecoules = _figer((jours - jours[0]).astype(np.int64))
+
+        self.indexation = ServiceIndexation(self.dates, data["croissance"])
+        self.agregation = ServiceAgregation(self.dates)
+        self.bornes = MappingProxyType({grain: self.agregation.bornes(grain) for grain in ServiceAgregation.GRAINS})
+        self._empreintes = {}  # Section -> empreinte du contenu, calculée à la demande
+        self._fige = True
+
+    @classmethod
+    def depuis_datastore(cls):
+        """Contexte construit à partir du contenu courant du DataStore"""
+        return cls(DataStore.all())
+
+    @property
+    def df_dates(self):
+        """Nouveau DataFrame d'une colonne 'date' (le calendrier partagé n'est jamais exposé en écriture)"""
+        return pd.DataFrame({'date': self.dates})
+
+    def empreinte(self, sections):
+        """
+        Empreinte des entrées d'un calculateur : calendrier et contenu des sections lues.
+
+        Une entrée 'section.cle' ne porte que sur une clé de la section : un calculateur qui
+        ne lit que quelques hypothèses de la section Croissance n'est ainsi pas invalidé par
+        la modification des autres.
+
+        Args:
+            sections (iterable): Sections du DataStore (ou clés 'section.cle') lues par le calculateur
+
+        Returns:
+            tuple: (début, nombre de jours du calendrier, empreinte de chaque section)
+        """
+        for section in sections:
+            if section not in self._empreintes:
+                nom, _, cle = section.partition('.')
+                contenu = self.data.get(nom)
+                if cle:
+                    contenu = (contenu or {}).get(cle)
+                self._empreintes[section] = empreinte(contenu)
+        return (str(self.dates[0]), len(self.dates)) + tuple(self._empreintes[section] for section in sections)
+
+    def __setattr__(self, nom, valeur):
+        if getattr(self, '_fige', False):
+            raise AttributeError(f"ContexteSimulation est en lecture seule (attribut '{nom}')")
+        super().__setattr__(nom, valeur)
+
+    def __len__(self):
+        return len(self.dates)
+
+
+def construire_calendrier(data):
+    """
+    Définit la période d'observation principale :
+    - Date de début : minimum entre loyers, prêts, travaux.
+    - Date de fin : maximum entre loyers, prêts, travaux, et horizon d'investissement.
+
+    Args:
+        data (dict): Sections du DataStore
+
+    Returns:
+        pd.DataFrame: Une ligne par jour, colonne 'date'
+    """
+
+    dates_debut = []
+    dates_fin = []
+
+    # Dates des loyers
+    for loyer in data["loyers"]:
+        dates_debut.append(loyer['start_date'])
+        dates_fin.append(loyer['end_date'])
+
+    # Dates des prêts
+    for pret in data["prets"]:
+        dates_debut.append(pret['start_date'])
+        dates_fin.append(pret['start_date'] + relativedelta(months=pret['duree_mois']))
+
+    # Dates des travaux
+    travaux = data["travaux"]
+    dates_debut.append(travaux['start_date_travaux'])
+    dates_fin.append(travaux['start_date_travaux'] + relativedelta(months=travaux['duree_mois']))
+
+    # Date d'horizon d'investissement
+    dates_fin.append(min(dates_debut) + relativedelta(years=data["bien"]['date_horizon']))
+
+    # Calcul du minimum et du maximum
+    date_min = min(dates_debut)
+    date_max = max(dates_fin)
+
+    # Conversion en datetime si nécessaire
+    date_min = datetime.combine(date_min, datetime.min.time())
+    date_max = datetime.combine(date_max, datetime.min.time())
+
+    # Créer un DataFrame avec une ligne par jour pour toute la période
+    jours = pd.date_range(start=date_min, end=date_max, freq='D')
+    return pd.DataFrame({'date': jours})
+
+
+def figer_valeur(valeur):
+    """
+    Copie en lecture seule d'une valeur de section, à tous les niveaux.
+
+    Les dicts deviennent des MappingProxyType, les listes des tuples et les tableaux NumPy des
+    copies non modifiables ; les feuilles (nombres, textes, dates) sont déjà immuables.
+    """
+    if isinstance(valeur, Mapping):
+        return MappingProxyType({cle: figer_valeur(v) for cle, v in valeur.items()})
+    if isinstance(valeur, (list, tuple)):
+        return tuple(figer_valeur(v) for v in valeur)
+    if isinstance(valeur, np.ndarray):
+        return _figer(valeur.copy())
+    return valeur
+
+
+def _figer(tableau):
+    tableau.setflags(write=False)
+    return tableau
@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+
+from models.advanced_simulation.computation.indexation import ServiceIndexation
+
+
+class EtatLocatif:
+    """
+    État locatif d'un immeuble : une ligne par lot, chaque attribut stocké en tableau NumPy.
+
+    Les flux de tous les lots sont calculés par diffusion sur une grille (lots × dates) :
+    activité du bail, taux d'occupation, indexation en escalier et saisonnalité, sans boucle
+    sur les lots. Les sorties existent par lot et agrégées.
+    """
+
+    def __init__(self, labels, loyer_mensuel, charges_mensuelles=0.0, taux_occupation=1.0,
+                 debut=None, fin=None, taux_indexation=0.0, pas_indexation_mois=12,
+                 premiere_indexation=None, jour_paiement=1, mois_occupes=None, baux=None,
+                 indexation_croissance=False):
+        """
+        Args:
+            labels (array-like): Nom de chaque lot
+            loyer_mensuel (array-like): Loyer mensuel hors charges par lot (€)
+            charges_mensuelles (array-like): Charges mensuelles par lot (€)
+            taux_occupation (array-like): Taux d'occupation par lot (décimal)
+            debut (array-like): Date de début du bail par lot
+            fin (array-like): Date de fin du bail par lot
+            taux_indexation (array-like): Taux d'indexation par pas (décimal), 0 sans indexation
+            pas_indexation_mois (array-like): Nombre de mois entre deux indexations
+            premiere_indexation (array-like, optional): Première indexation (début + un pas par défaut)
+            jour_paiement (array-like): Jour de paiement (1 à 31, borné à la fin du mois)
+            mois_occupes (np.ndarray, optional): Masque (nb_lots, 12) des mois occupés
+            baux (array-like, optional): Bail de rattachement de chaque lot (le lot lui-même par défaut)
+            indexation_croissance (array-like): Lots indexés au taux de la section Croissance
+                                                (`taux_augmentation_loyer`) plutôt qu'à un taux propre
+        """
+        self.labels = np.asarray(labels, dtype=object)
+        n = len(self.labels)
+        self.baux = self.labels.copy() if baux is None else np.broadcast_to(np.asarray(baux, dtype=object), (n,)).copy()
+
+        def colonne(valeurs, dtype=float):
+            return np.broadcast_to(np.asarray(valeurs, dtype=dtype), (n,)).copy()
+
+        self.loyer_mensuel = colonne(loyer_mensuel)
+        self.charges_mensuelles = colonne(charges_mensuelles)
+        self.taux_occupation = colonne(taux_occupation)
+        self.debut = colonne(pd.DatetimeIndex(np.atleast_1d(debut)).values, 'datetime64[D]')
+        self.fin = colonne(pd.DatetimeIndex(np.atleast_1d(fin)).values, 'datetime64[D]')
+        self.taux_indexation = colonne(taux_indexation)
+        self.pas_indexation_mois = np.maximum(colonne(pas_indexation_mois, np.int64), 1)
+        self.jour_paiement = np.clip(colonne(jour_paiement, np.int64), 1, 31)
+        self.indexation_croissance = colonne(indexation_croissance, bool)
+
+        if premiere_indexation is None:
+            mois_debut = self.debut.astype('datetime64[M]') + self.pas_indexation_mois
+            premiere_indexation = _jour_du_mois(mois_debut, _jour(self.debut))
+        self.premiere_indexation = colonne(pd.DatetimeIndex(np.atleast_1d(premiere_indexation)).values,
+                                           'datetime64[D]')
+
+        if mois_occupes is None:
+            mois_occupes = np.ones((n, 12), dtype=bool)
+        self.mois_occupes = np.broadcast_to(np.asarray(mois_occupes, dtype=bool), (n, 12)).copy()
+
+    @classmethod
+    def depuis_loyers(cls, loyers, croissance=None):
+        """
+        État locatif à partir des baux de la section Loyer.
+
+        Un bail avec `nb_lots` > 1 donne autant de lots identiques. Le taux d'indexation
+        est celui du bail (`taux_indexation`, en %) ou `taux_augmentation_loyer` de la
+        section Croissance, converti au pas de sa fréquence.
+
+        Args:
+            loyers (list): Baux de la section Loyer
+            croissance (dict, optional): Hypothèses de la section Croissance
+
+        Returns:
+            EtatLocatif: Un lot par ligne
+        """
+        croissance = croissance or {}
+        frequence = croissance.get('frequence_taux_augmentation_loyer', "Annuelle")
+        pas_mois = max(int(round(ServiceIndexation.FREQUENCES.get(frequence, 1) * 12)), 1)
+        taux_defaut = croissance.get('taux_augmentation_loyer', 2)
+
+        nb_lots = np.array([max(int(loyer.get('nb_lots', 1)), 1) for loyer in loyers], dtype=np.int64)
+
+        def par_lot(valeurs, dtype=float):
+            return np.repeat(np.asarray(valeurs, dtype=dtype), nb_lots)
+
+        labels = [cls._label(loyer) for loyer in loyers]
+        labels_lots = [label if n == 1 else f"{label} - lot {k + 1}"
+                       for label, n in zip(labels, nb_lots) for k in range(n)]
+
+        # Saisonnalité : premiers mois de l'année par défaut, ou mois d'occupation explicites
+        masques = np.ones((len(loyers), 12), dtype=bool)
+        for i, loyer in enumerate(loyers):
+            if 'mois_occupes' in loyer and loyer['mois_occupes'] < 12:
+                mois = loyer.get('mois_occupation', list(range(1, int(loyer['mois_occupes']) + 1)))
+                masques[i] = np.isin(np.arange(1, 13), mois)
+
+        taux = [(1 + loyer.get('taux_indexation', taux_defaut) / 100) ** ServiceIndexation.FREQUENCES.get(frequence, 1) - 1
+                if loyer.get('indexation', False) else 0.0 for loyer in loyers]
+        premieres = [pd.Timestamp(loyer['date_premiere_indexation']) if loyer.get('date_premiere_indexation')
+                     else pd.Timestamp(loyer['start_date']) + pd.DateOffset(months=pas_mois) for loyer in loyers]
+
+        return cls(
+            labels=labels_lots,
+            loyer_mensuel=par_lot([loyer.get('loyer_mensuel', 0) for loyer in loyers]),
+            charges_mensuelles=par_lot([loyer.get('charges_mensuelles', 0) for loyer in loyers]),
+            taux_occupation=par_lot([loyer.get('taux_occupation', 100) / 100 for loyer in loyers]),
+            debut=par_lot([pd.Timestamp(loyer['start_date']) for loyer in loyers], 'datetime64[D]'),
+            fin=par_lot([pd.Timestamp(loyer['end_date']) for loyer in loyers], 'datetime64[D]'),
+            taux_indexation=par_lot(taux),
+            pas_indexation_mois=pas_mois,
+            premiere_indexation=par_lot(premieres, 'datetime64[D]'),
+            jour_paiement=par_lot([31 if loyer.get('jour_paiement', 1) == "last" else loyer.get('jour_paiement', 1)
+                                   for loyer in loyers], np.int64),
+            mois_occupes=np.repeat(masques, nb_lots, axis=0),
+            baux=np.repeat(np.asarray(labels, dtype=object), nb_lots),
+            indexation_croissance=par_lot([loyer.get('indexation', False) and 'taux_indexation' not in loyer
+                                           for loyer in loyers], bool),
+        )
+
+    def __len__(self):
+        return len(self.labels)
+
+    def dates_paiement(self, debut, fin):
+        """
+        Grille des dates de paiement de chaque lot, un paiement par mois entre `debut` et `fin`.
+
+        Returns:
+            np.ndarray: Dates (nb_lots, nb_mois), datetime64[D]
+        """
+        mois = np.arange(np.datetime64(pd.Timestamp(debut), 'M'), np.datetime64(pd.Timestamp(fin), 'M') + 1)
+        return _jour_du_mois(mois[None, :], self.jour_paiement[:, None])
+
+    def facteurs(self, dates, journalier=False, indexation=True):
+        """
+        Facteur appliqué au loyer mensuel de chaque lot aux dates données.
+
+        Args:
+            dates (np.ndarray): Dates (nb_dates,) communes ou (nb_lots, nb_dates) par lot
+            journalier (bool): Lisser le loyer mensuel par jour (12 / 365)
+            indexation (bool): Appliquer l'indexation (sinon facteur hors indexation, voir `nb_indexations`)
+
+        Returns:
+            np.ndarray: Facteurs (nb_lots, nb_dates) : activité × occupation × indexation × saisonnalité
+        """
+        dates = np.broadcast_to(np.asarray(dates, dtype='datetime64[D]'), (len(self), np.shape(dates)[-1]))
+        actif = (dates >= self.debut[:, None]) & (dates <= self.fin[:, None])
+        mois_annee = dates.astype('datetime64[M]').astype(np.int64) % 12
+        saison = np.take_along_axis(self.mois_occupes, mois_annee, axis=1)
+        facteur = actif * saison * self.taux_occupation[:, None]
+        if indexation:
+            facteur = facteur * (1 + self.taux_indexation[:, None]) ** self.nb_indexations(dates)
+        return facteur * 12 / 365 if journalier else facteur
+
+    def journal(self, debut=None, fin=None):
+        """
+        Journal des paiements de tous les lots : une ligne par paiement effectif.
+
+        Args:
+            debut (date, optional): Début de la grille (premier début de bail par défaut)
+            fin (date, optional): Fin de la grille (dernière fin de bail par défaut)
+
+        Returns:
+            pd.DataFrame: Colonnes 'date', 'bail', 'lot', 'loyer', 'charges', triées par date
+        """
+        debut = self.debut.min() if debut is None else debut
+        fin = self.fin.max() if fin is None else fin
+        dates = self.dates_paiement(debut, fin)
+        facteur = self.facteurs(dates)
+
+        lot, colonne = np.nonzero((dates >= self.debut[:, None]) & (dates <= self.fin[:, None]))
+        ordre = np.lexsort((lot, dates[lot, colonne]))
+        lot, colonne = lot[ordre], colonne[ordre]
+
+        return pd.DataFrame({
+            'date': dates[lot, colonne].astype('datetime64[ns]'),
+            'bail': pd.Categorical(self.baux[lot], categories=pd.unique(self.baux)),
+            'lot': pd.Categorical(self.labels[lot], categories=pd.unique(self.labels)),
+            'loyer': self.loyer_mensuel[lot] * facteur[lot, colonne],
+            'charges': self.charges_mensuelles[lot] * facteur[lot, colonne],
+        })
+
+    def flux_mensuels(self, debut, fin):
+        """
+        Loyers et charges de chaque lot sur une grille mensuelle (un paiement par mois).
+
+        Returns:
+            dict: 'mois' (nb_mois,), 'loyer' et 'charges' (nb_lots, nb_mois), 'loyer_total' et
+                  'charges_total' (nb_mois,)
+        """
+        dates = self.dates_paiement(debut, fin)
+        facteur = self.facteurs(dates)
+        loyer = self.loyer_mensuel[:, None] * facteur
+        charges = self.charges_mensuelles[:, None] * facteur
+        return {
+            'mois': dates[0].astype('datetime64[M]') if len(self) else np.array([], dtype='datetime64[M]'),
+            'loyer': loyer,
+            'charges': charges,
+            'loyer_total': loyer.sum(axis=0),
+            'charges_total': charges.sum(axis=0),
+        }
+
+    def synthese(self, debut, fin):
+        """
+        Totaux par lot sur la période.
+
+        Returns:
+            pd.DataFrame: Une ligne par lot : 'lot', 'bail', 'loyer_mensuel', 'taux_occupation',
+                          'loyer_total', 'charges_total'
+        """
+        flux = self.flux_mensuels(debut, fin)
+        return pd.DataFrame({
+            'lot': self.labels,
+            'bail': self.baux,
+            'loyer_mensuel': self.loyer_mensuel,
+            'taux_occupation': self.taux_occupation,
+            'loyer_total': flux['loyer'].sum(axis=1),
+            'charges_total': flux['charges'].sum(axis=1),
+        })
+
+    def nb_indexations(self, dates):
+        """
+        Nombre d'indexations intervenues pour chaque lot aux dates données.
+
+        Args:
+            dates (np.ndarray): Dates (nb_lots, nb_dates), datetime64[D]
+
+        Returns:
+            np.ndarray: Entiers (nb_lots, nb_dates) : le facteur d'indexation vaut (1 + taux)^n
+        """
+        ecart_mois = (dates.astype('datetime64[M]').astype(np.int64)
+                      - self.premiere_indexation.astype('datetime64[M]').astype(np.int64)[:, None])
+        pas = self.pas_indexation_mois[:, None]
+        k = np.floor_divide(ecart_mois, pas)
+
+        # Anniversaire du dernier pas commencé : le pas compte si la date l'a atteint
+        mois_anniversaire = self.premiere_indexation.astype('datetime64[M]')[:, None] + k * pas
+        anniversaire = _jour_du_mois(mois_anniversaire, _jour(self.premiere_indexation)[:, None])
+        return np.where(ecart_mois >= 0, k + (dates >= anniversaire), 0)
+
+    @staticmethod
+    def _label(loyer):
+        return loyer.get('label', f"Loyer_{loyer.get('id', '')}")
+
+
+def _jour(dates):
+    """Jour du mois (1 à 31) de dates datetime64[D]"""
+    return (dates - dates.astype('datetime64[M]').astype('datetime64[D]')).astype(np.int64) + 1
+
+
+def _jour_du_mois(mois, jour):
+    """Date du jour `jour` de chaque mois, bornée au dernier jour du mois"""
+    mois = np.asarray(mois, dtype='datetime64[M]')
+    fin_mois = (mois + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+    return np.minimum(mois.astype('datetime64[D]') + (np.asarray(jour) - 1), fin_mois)
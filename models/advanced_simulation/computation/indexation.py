@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+
+class ServiceIndexation:
+    """
+    Courbes d'indexation partagées par tous les calculateurs d'une simulation.
+
+    Une courbe donne, pour chaque jour du calendrier, le facteur cumulé (1 + t)^(k * f)
+    d'un taux annuel t mis à jour par paliers de fréquence f depuis une date de départ
+    (k = nombre de paliers écoulés). Chaque courbe (taux, fréquence, date de départ) est
+    calculée une seule fois puis mise en cache ; les tableaux renvoyés sont en lecture seule.
+    """
+
+    # Conversion des fréquences en années décimales
+    FREQUENCES = {
+        "Annuelle": 1,
+        "Semestrielle": 0.5,
+        "Trimestrielle": 0.25,
+        "Mensuelle": 1 / 12,
+    }
+
+    def __init__(self, dates, croissance=None):
+        """
+        Args:
+            dates (array-like): Calendrier journalier de la simulation
+            croissance (dict, optional): Hypothèses de la section Croissance (taux en %)
+        """
+        self.dates = pd.DatetimeIndex(dates).values.astype('datetime64[ns]')
+        self.croissance = croissance or {}
+        self._periodes = {}
+        self._courbes = {}
+
+    def periodes(self, frequence="Annuelle", date_debut=None):
+        """
+        Nombre de paliers de mise à jour écoulés à chaque jour du calendrier.
+
+        Args:
+            frequence (str): "Annuelle", "Semestrielle", "Trimestrielle" ou "Mensuelle"
+            date_debut (date, optional): Départ de l'indexation (début du calendrier par défaut)
+
+        Returns:
+            np.ndarray: Entiers >= 0, un par jour du calendrier
+        """
+        debut = self._normaliser_date(date_debut)
+        cle = (frequence, debut)
+        if cle not in self._periodes:
+            annees_ecoulees = (self.dates - debut) / np.timedelta64(1, 'D') / 365.25
+            periodes = (annees_ecoulees / self.FREQUENCES.get(frequence, 1)).astype(int)
+            self._periodes[cle] = self._figer(np.maximum(periodes, 0))
+        return self._periodes[cle]
+
+    def courbe(self, taux, frequence="Annuelle", date_debut=None):
+        """
+        Facteur d'indexation cumulé pour chaque jour du calendrier.
+
+        Args:
+            taux (float): Taux annuel (décimal)
+            frequence (str): Fréquence de mise à jour
+            date_debut (date, optional): Départ de l'indexation (début du calendrier par défaut)
+
+        Returns:
+            np.ndarray: Facteurs (1 au départ), un par jour du calendrier
+        """
+        debut = self._normaliser_date(date_debut)
+        cle = (float(taux), frequence, debut)
+        if cle not in self._courbes:
+            taux_ajuste = self.taux_ajuste(taux, frequence)
+            self._courbes[cle] = self._figer((1 + taux_ajuste) ** self.periodes(frequence, debut))
+        return self._courbes[cle]
+
+    def courbe_croissance(self, cle, date_debut=None):
+        """
+        Courbe d'une hypothèse de la section Croissance, par exemple 'taux_inflation'.
+
+        Le taux (en %) et sa fréquence sont lus dans `croissance[cle]` et
+        `croissance['frequence_' + cle]`.
+        """
+        taux = self.croissance.get(cle, 0) / 100
+        frequence = self.croissance.get(f"frequence_{cle}", "Annuelle")
+        return self.courbe(taux, frequence, date_debut)
+
+    def taux_ajuste(self, taux, frequence="Annuelle"):
+        """Taux par palier équivalent au taux annuel : (1 + taux)^(fraction d'année) - 1"""
+        return (1 + taux) ** self.FREQUENCES.get(frequence, 1) - 1
+
+    def aux_dates(self, courbe, dates):
+        """
+        Lit une courbe du calendrier aux dates données (dernier jour connu à chaque date).
+
+        Args:
+            courbe (np.ndarray): Courbe alignée sur le calendrier
+            dates (array-like): Dates à évaluer
+
+        Returns:
+            np.ndarray: Valeurs de la courbe, une par date
+        """
+        dates = pd.DatetimeIndex(dates).values.astype('datetime64[ns]')
+        idx = np.searchsorted(self.dates, dates, side='right') - 1
+        return courbe[np.clip(idx, 0, len(courbe) - 1)]
+
+    def _normaliser_date(self, date_debut):
+        if date_debut is None:
+            return self.dates[0]
+        return np.datetime64(pd.Timestamp(date_debut), 'ns')
+
+    @staticmethod
+    def _figer(tableau):
+        tableau.setflags(write=False)
+        return tableau
@@ -1,16 +1,23 @@
 import streamlit as st
 from models.advanced_simulation.component.input_validator import InputValidator
 from models.advanced_simulation.component.data_store import DataStore
-from models.advanced_simulation.computation.compute_manager import ComputeManager
+from models.advanced_simulation.computation.cache import CACHE_MODELES
+from models.advanced_simulation.computation.moteur import simuler, empreinte_scenario
 
 
 class InvestmentModel:
+    """
+    Exécution du modèle depuis l'interface : lit le DataStore, affiche les messages de
+    validation, délègue le calcul au moteur (`moteur.simuler`) et publie les résultats
+    dans le DataStore pour les affichages.
+    """
     
-    def __init__(self):
+    def __init__(self, cache=CACHE_MODELES):
         self.data = DataStore.get_all()
         self.validator = InputValidator(self.data)
-        self.compute_manager = ComputeManager()
+        self.cache = cache
         self.resultats = None
+        self.depuis_cache = False
         
     def run(self):
         """Exécute le modèle complet et retourne les résultats"""
@@ -35,11 +42,21 @@ class InvestmentModel:
         if errors:
             return False
         
-        self.resultats = self.compute_manager.run_all()
+        # Calcul sans Streamlit (résultats relus en cache si le scénario n'a pas changé)
+        simulation = simuler(self.data, cache=self.cache, valider=False)
+        self.resultats = simulation['resultats']
+        self.depuis_cache = simulation['depuis_cache']
+        
         DataStore.set("resultats", self.resultats)
+        DataStore.set("details_resultats", simulation['details'])
+        DataStore.set("agregation", simulation['agregation'])
         
         return True
         
+    def empreinte(self):
+        """Empreinte canonique du contenu des sections saisies (clés triées, dates en texte)"""
+        return empreinte_scenario(self.data)
+        
     def get_resultats(self):
         """Retourne les résultats du modèle"""
         return self.resultats
\ No newline at end of file
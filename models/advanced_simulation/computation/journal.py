@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Journal de trésorerie en partie double : une ligne par écriture, au format long
+COLONNES = ['date', 'compte', 'source', 'montant']
+
+# Compte de trésorerie : ses écritures sont les flux de cash (> 0 : encaissement)
+TRESORERIE = 'tresorerie'
+
+
+def ecritures(dates, montants, contrepartie, source):
+    """
+    Écritures en partie double d'une série de flux de trésorerie.
+
+    Chaque flux non nul donne deux lignes de somme nulle : le flux au compte de trésorerie
+    et son opposé au compte de contrepartie (un encaissement de loyer crédite 'loyers',
+    une échéance de prêt débite 'emprunt' et 'interets', ...).
+
+    Args:
+        dates (array-like): Date de chaque flux
+        montants (array-like): Flux de trésorerie (> 0 : encaissement, < 0 : décaissement)
+        contrepartie (str | array-like): Compte de contrepartie, commun ou par flux
+        source (str | array-like): Origine, commune ou par flux (prêt, bail, poste de charge...)
+
+    Returns:
+        pd.DataFrame: Colonnes 'date', 'compte', 'source' (catégorielles) et 'montant'
+    """
+    montants = np.asarray(montants, dtype=float)
+    n = len(montants)
+    dates = np.broadcast_to(pd.DatetimeIndex(np.atleast_1d(dates)).values.astype('datetime64[ns]'), (n,))
+    contrepartie = np.broadcast_to(np.asarray(contrepartie, dtype=object), (n,))
+    source = np.broadcast_to(np.asarray(source, dtype=object), (n,))
+
+    non_nuls = montants != 0
+    dates, montants = dates[non_nuls], montants[non_nuls]
+    contrepartie, source = contrepartie[non_nuls], source[non_nuls]
+
+    return pd.DataFrame({
+        'date': np.concatenate([dates, dates]),
+        'compte': pd.Categorical(np.concatenate([np.full(len(montants), TRESORERIE, dtype=object), contrepartie])),
+        'source': pd.Categorical(np.concatenate([source, source])),
+        'montant': np.concatenate([montants, -montants]),
+    })
+
+
+def concatener(journaux):
+    """
+    Assemble des journaux en un seul, trié par date (ordre des journaux conservé à date égale).
+
+    Les catégories de 'compte' et 'source' sont unies une fois pour toutes : le journal
+    reste en quatre colonnes quel que soit le nombre de comptes et de sources.
+
+    Args:
+        journaux (iterable): Journaux (voir `ecritures`), None ignorés
+
+    Returns:
+        pd.DataFrame: Journal consolidé (COLONNES)
+    """
+    journaux = [journal for journal in journaux if journal is not None and len(journal)]
+    if not journaux:
+        return pd.DataFrame({
+            'date': np.array([], dtype='datetime64[ns]'),
+            'compte': pd.Categorical([]),
+            'source': pd.Categorical([]),
+            'montant': np.array([], dtype=float),
+        })
+
+    dates = np.concatenate([journal['date'].to_numpy(dtype='datetime64[ns]') for journal in journaux])
+    ordre = np.argsort(dates, kind='stable')
+    return pd.DataFrame({
+        'date': dates[ordre],
+        'compte': union_categoricals([journal['compte'] for journal in journaux])[ordre],
+        'source': union_categoricals([journal['source'] for journal in journaux])[ordre],
+        'montant': np.concatenate([journal['montant'].to_numpy(dtype=float) for journal in journaux])[ordre],
+    })
+
+
+def flux_tresorerie(journal):
+    """
+    Flux net et trésorerie cumulée à chaque date du journal.
+
+    Args:
+        journal (pd.DataFrame): Journal trié par date
+
+    Returns:
+        pd.DataFrame: Colonnes 'date', 'encaissements', 'decaissements', 'flux_net', 'tresorerie'
+    """
+    tresorerie = journal[(journal['compte'] == TRESORERIE).to_numpy()]
+    dates = tresorerie['date'].to_numpy(dtype='datetime64[ns]')
+    montants = tresorerie['montant'].to_numpy(dtype=float)
+    if not len(dates):
+        return pd.DataFrame(columns=['date', 'encaissements', 'decaissements', 'flux_net', 'tresorerie'])
+
+    # Une somme par date (journal trié) : réduction sur les débuts de groupe
+    debuts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1])))
+    encaissements = np.add.reduceat(np.maximum(montants, 0), debuts)
+    decaissements = np.add.reduceat(np.minimum(montants, 0), debuts)
+    flux_net = encaissements + decaissements
+
+    return pd.DataFrame({
+        'date': dates[debuts],
+        'encaissements': encaissements,
+        'decaissements': decaissements,
+        'flux_net': flux_net,
+        'tresorerie': np.cumsum(flux_net),
+    })
+
+
+def soldes(journal, par=('compte', 'source')):
+    """
+    Totaux du journal par compte et source (par défaut).
+
+    Args:
+        journal (pd.DataFrame): Journal
+        par (tuple): Colonnes de regroupement
+
+    Returns:
+        pd.DataFrame: Une ligne par groupe présent, colonne 'montant'
+    """
+    return journal.groupby(list(par), observed=True, sort=True)['montant'].sum().reset_index()
+
+
+def par_periode(journal, periodes, colonne='compte'):
+    """
+    Mouvements de chaque compte par période : réduction groupée (période, compte) du journal.
+
+    Args:
+        journal (pd.DataFrame): Journal (ou toute table 'date', 'montant' et une colonne catégorielle)
+        periodes (pd.DatetimeIndex): Débuts des périodes, croissants (voir `ServiceAgregation.periodes`)
+        colonne (str): Colonne catégorielle de regroupement
+
+    Returns:
+        pd.DataFrame: Colonne 'periode' puis une colonne par catégorie (sommes des montants)
+    """
+    comptes = journal[colonne].cat
+    periodes = pd.DatetimeIndex(periodes).values.astype('datetime64[ns]')
+    indices = np.searchsorted(periodes, journal['date'].to_numpy(dtype='datetime64[ns]'), side='right') - 1
+    dans_periodes = indices >= 0
+
+    nb_comptes = len(comptes.categories)
+    codes = indices[dans_periodes] * nb_comptes + comptes.codes[dans_periodes]
+    cumuls = np.bincount(codes, weights=journal['montant'].to_numpy(dtype=float)[dans_periodes],
+                         minlength=len(periodes) * nb_comptes).reshape(len(periodes), nb_comptes)
+
+    colonnes = {'periode': periodes}
+    colonnes.update({compte: cumuls[:, i] for i, compte in enumerate(comptes.categories)})
+    return pd.DataFrame(colonnes)
@@ -0,0 +1,182 @@
+import json
+from datetime import date, datetime
+from pathlib import Path
+
+from models.advanced_simulation.component.input_validator import InputValidator
+from models.advanced_simulation.computation.agregation import ServiceAgregation
+from models.advanced_simulation.computation.cache import CACHE_CALCULS, CACHE_MODELES, copie_profonde, empreinte
+from models.advanced_simulation.computation.compute_manager import ComputeManager
+from models.advanced_simulation.computation.contexte import ContexteSimulation
+
+# Sections d'un scénario : leur contenu détermine entièrement les résultats
+SECTIONS = ['prets', 'loyers', 'bien', 'travaux', 'charges', 'frais_global', 'fisca', 'croissance', 'marche']
+
+# Sections facultatives, vides par défaut
+SECTIONS_FACULTATIVES = {'loyers': [], 'prets': [], 'charges': {}, 'frais_global': {}, 'fisca': {}, 'marche': {}}
+
+
+def charger_scenario(chemin):
+    """
+    Lit un scénario JSON ou YAML (une clé par section du DataStore).
+
+    Args:
+        chemin (str | Path): Fichier .json, .yaml ou .yml
+
+    Returns:
+        dict: Scénario normalisé (voir `normaliser_scenario`)
+    """
+    chemin = Path(chemin)
+    with open(chemin, encoding='utf-8') as fichier:
+        if chemin.suffix.lower() in ('.yaml', '.yml'):
+            import yaml
+            scenario = yaml.safe_load(fichier)
+        else:
+            scenario = json.load(fichier)
+    return normaliser_scenario(scenario)
+
+
+def normaliser_scenario(scenario):
+    """
+    Complète les sections facultatives et convertit les dates écrites en texte ISO.
+
+    Sont converties les valeurs textuelles des clés 'date', 'start_date*', 'end_date*'
+    et 'date_*', à tous les niveaux du scénario.
+
+    Args:
+        scenario (dict): Sections du scénario
+
+    Returns:
+        dict: Nouveau scénario, le dict d'origine n'est pas modifié
+    """
+    scenario = {section: _convertir_dates(valeur) for section, valeur in scenario.items()}
+    for section, defaut in SECTIONS_FACULTATIVES.items():
+        scenario.setdefault(section, type(defaut)())
+    return scenario
+
+
+def valider_scenario(scenario):
+    """
+    Returns:
+        tuple: (avertissements, erreurs), listes de messages
+    """
+    validateur = InputValidator(scenario)
+    validateur.validate()
+    return validateur.get_warnings(), validateur.get_errors()
+
+
+def simuler(scenario, cache=CACHE_MODELES, nb_workers=None, valider=True, cache_calculs=CACHE_CALCULS):
+    """
+    Exécute le modèle d'investissement complet sur un scénario, sans Streamlit ni DataStore.
+
+    Args:
+        scenario (dict): Sections du scénario (prets, loyers, bien, travaux, croissance, ...)
+        cache (CacheLRU, optional): Cache des résultats par empreinte du scénario (None : pas de cache)
+        nb_workers (int, optional): Nombre de threads de ComputeManager
+        valider (bool): Valider le scénario avant le calcul
+        cache_calculs (CacheLRU): Cache des sorties de chaque calculateur (voir ComputeManager)
+
+    Returns:
+        dict: 'resultats' (sortie de chaque calculateur), 'details' (get_results de chaque
+              calculateur), 'agregation', 'avertissements', 'depuis_cache' et 'recalcules'
+              (calculateurs exécutés, les autres ayant été lus dans `cache_calculs`)
+
+    Raises:
+        ValueError: Scénario invalide (erreurs de validation)
+    """
+    scenario = normaliser_scenario(scenario)
+    avertissements = []
+    if valider:
+        avertissements, erreurs = valider_scenario(scenario)
+        if erreurs:
+            raise ValueError("Scénario invalide : " + " ; ".join(erreurs))
+
+    # Scénario identique (ou restauré) : résultats relus sans relancer les calculateurs.
+    # Le cache ne distribue que des copies : l'appelant peut modifier ses résultats en place.
+    # Seules les dates du calendrier y sont conservées (et non le ServiceAgregation et ses
+    # cubes, que `taille_octets` ne sait pas mesurer) : l'agrégation est reconstruite à la relecture
+    cle = empreinte_scenario(scenario)
+    entree = cache.get(cle) if cache is not None else None
+    depuis_cache = entree is not None
+    recalcules = []
+    if entree is None:
+        manager = ComputeManager(cache=cache_calculs, nb_workers=nb_workers,
+                                 contexte=ContexteSimulation(scenario))
+        manager.run_all()
+        recalcules = manager.recalcules
+        agregation = manager.agregation
+        if cache is not None:
+            cache.set(cle, copie_profonde((manager.resultats, manager.details, agregation.dates)))
+        resultats, details = manager.resultats, manager.details
+    else:
+        resultats, details, dates = copie_profonde(entree)
+        agregation = ServiceAgregation(dates)
+
+    return {
+        'resultats': resultats,
+        'details': details,
+        'agregation': agregation,
+        'avertissements': avertissements,
+        'depuis_cache': depuis_cache,
+        'recalcules': recalcules,
+    }
+
+
+def indicateurs_cles(simulation):
+    """
+    Principaux chiffres d'une simulation, pour comparer des scénarios entre eux.
+
+    Args:
+        simulation (dict): Retour de `simuler`
+
+    Returns:
+        dict: 'total_paiements', 'total_interets', 'total_frais' (prêts), 'total_loyers',
+              'total_charges' (loyers), 'total_depenses' (dépenses récurrentes du propriétaire),
+              'prix_initial' et 'prix_final' (bien corrigé), 'tresorerie_finale' (trésorerie
+              cumulée du journal de trésorerie)
+    """
+    resultats, details = simulation['resultats'], simulation['details']
+    indicateurs = {}
+
+    prets = resultats.get('ComputePret')
+    if prets is not None:
+        totaux = prets[prets['pret'] == 'total'].groupby('metrique', observed=True)['valeur'].sum()
+        for cle, metrique in [('total_paiements', 'paiement'), ('total_interets', 'interets'),
+                              ('total_frais', 'frais')]:
+            indicateurs[cle] = float(totaux.get(metrique, 0.0))
+
+    loyers = details.get('ComputeLoyer', {})
+    indicateurs['total_loyers'] = float(loyers.get('total_loyers', 0.0))
+    indicateurs['total_charges'] = float(loyers.get('total_charges', 0.0))
+    indicateurs['total_depenses'] = float(details.get('ComputeCharges', {}).get('total_charges', 0.0))
+
+    bien = resultats.get('ComputeBien')
+    if bien is not None and len(bien):
+        indicateurs['prix_initial'] = float(bien['prix'].iloc[0])
+        indicateurs['prix_final'] = float(bien['prix_corrige_total'].iloc[-1])
+
+    flux = details.get('ComputeCashflow', {}).get('flux')
+    if flux is not None and len(flux):
+        indicateurs['tresorerie_finale'] = float(flux['tresorerie'].iloc[-1])
+
+    return indicateurs
+
+
+def empreinte_scenario(scenario):
+    """Empreinte canonique du contenu des sections du scénario (clés triées, dates en texte)"""
+    return empreinte({section: scenario.get(section) for section in SECTIONS})
+
+
+def _convertir_dates(valeur, cle=None):
+    if isinstance(valeur, dict):
+        return {k: _convertir_dates(v, k) for k, v in valeur.items()}
+    if isinstance(valeur, list):
+        return [_convertir_dates(v) for v in valeur]
+    if isinstance(valeur, str) and cle is not None and _est_cle_date(cle):
+        return date.fromisoformat(valeur[:10])
+    if isinstance(valeur, datetime):
+        return valeur.date()
+    return valeur
+
+
+def _est_cle_date(cle):
+    return cle == 'date' or cle.startswith(('start_date', 'end_date', 'date_'))
@@ -0,0 +1,150 @@
+import copy
+import numbers
+
+import pandas as pd
+
+from models.advanced_simulation.computation.cache import CacheLRU
+from models.advanced_simulation.computation.moteur import simuler, indicateurs_cles, normaliser_scenario
+
+# Paramètres numériques de chaque prêt et de chaque bail soumis à l'analyse
+PARAMETRES_PRET = ('montant', 'taux_interet', 'duree_mois', 'frais_dossier', 'frais_assurance', 'frais_caution',
+                   'frais_garantie_hypothecaire', 'frais_courtage', 'frais_divers')
+PARAMETRES_LOYER = ('loyer_mensuel', 'charges_mensuelles', 'taux_occupation')
+
+# Bornes des paramètres dont la variation ne doit pas sortir d'un intervalle
+BORNES = {'taux_occupation': (0, 100)}
+
+
+def parametres_sensibilite(scenario):
+    """
+    Paramètres du scénario soumis à l'analyse : hypothèses de la section Croissance
+    (clés 'taux_*'), paramètres de chaque prêt et de chaque bail.
+
+    Args:
+        scenario (dict): Sections du scénario
+
+    Returns:
+        list: (nom, chemin) où le chemin est (section, clé) ou (section, indice, clé),
+              par exemple ('croissance.taux_inflation', ('croissance', 'taux_inflation'))
+    """
+    parametres = [(f"croissance.{cle}", ('croissance', cle))
+                  for cle, valeur in scenario.get('croissance', {}).items()
+                  if cle.startswith('taux_') and _est_nombre(valeur)]
+
+    for section, cles, libelle in [('prets', PARAMETRES_PRET, 'pret'), ('loyers', PARAMETRES_LOYER, 'label')]:
+        for i, element in enumerate(scenario.get(section, [])):
+            nom = element.get(libelle) or f"{section}_{i + 1}"
+            parametres += [(f"{nom}.{cle}", (section, i, cle)) for cle in cles if _est_nombre(element.get(cle))]
+
+    return parametres
+
+
+def analyser_sensibilite(scenario, pas=0.10, pas_taux=None, parametres=None, indicateurs=None,
+                         nb_workers=None, valider=True):
+    """
+    Analyse de sensibilité un-à-la-fois (diagramme en tornade).
+
+    Chaque paramètre est diminué puis augmenté de `pas` (en relatif), les autres restant à
+    leur valeur de base. Les calculateurs partagent un cache propre à l'analyse : seuls ceux
+    dont les entrées changent sont ré-exécutés (une variation de taux de prêt ne recalcule
+    que ComputePret, une variation de l'augmentation des loyers que ComputeLoyer).
+
+    Args:
+        scenario (dict): Sections du scénario de base
+        pas (float): Variation relative des paramètres (0.10 : ±10 %)
+        pas_taux (float, optional): Variation absolue, en points, des paramètres 'taux_*'
+                                    (par défaut, variation relative comme les autres)
+        parametres (list, optional): Noms des paramètres à analyser (voir `parametres_sensibilite`,
+                                     tous par défaut)
+        indicateurs (list, optional): Indicateurs retenus (voir `moteur.indicateurs_cles`, tous par défaut)
+        nb_workers (int, optional): Nombre de threads de ComputeManager
+        valider (bool): Valider le scénario de base avant le calcul
+
+    Returns:
+        pd.DataFrame: Une ligne par (indicateur, paramètre) : valeurs basse / haute du paramètre,
+                      valeur de l'indicateur (base, bas, haut), écarts à la base, amplitude
+                      (plus grand écart absolu) et rang du paramètre pour l'indicateur
+
+    Raises:
+        ValueError: Scénario de base invalide ou paramètre inconnu
+    """
+    scenario = normaliser_scenario(scenario)
+    cache = CacheLRU()
+
+    def evaluer(variante, valider=False):
+        simulation = simuler(variante, cache=None, nb_workers=nb_workers, valider=valider, cache_calculs=cache)
+        valeurs = indicateurs_cles(simulation)
+        return {cle: valeurs[cle] for cle in indicateurs} if indicateurs else valeurs
+
+    base = evaluer(scenario, valider)
+
+    disponibles = dict(parametres_sensibilite(scenario))
+    inconnus = [nom for nom in parametres or [] if nom not in disponibles]
+    if inconnus:
+        raise ValueError("Paramètres inconnus : " + ", ".join(inconnus))
+    noms = parametres or list(disponibles)
+
+    lignes = []
+    for nom in noms:
+        chemin = disponibles[nom]
+        valeur = _lire(scenario, chemin)
+        bornes = [_varier(valeur, sens, pas, pas_taux, chemin[-1]) for sens in (-1, 1)]
+        # Variation nulle (paramètre à 0 en relatif) : l'indicateur vaut sa valeur de base
+        resultats = [base if variee == valeur else evaluer(_modifier(scenario, chemin, variee)) for variee in bornes]
+
+        for indicateur, valeur_base in base.items():
+            bas, haut = (resultat[indicateur] for resultat in resultats)
+            lignes.append({
+                'indicateur': indicateur,
+                'parametre': nom,
+                'valeur_base': valeur,
+                'valeur_basse': bornes[0],
+                'valeur_haute': bornes[1],
+                'base': valeur_base,
+                'bas': bas,
+                'haut': haut,
+                'delta_bas': bas - valeur_base,
+                'delta_haut': haut - valeur_base,
+                'amplitude': max(abs(bas - valeur_base), abs(haut - valeur_base)),
+            })
+
+    tornade = pd.DataFrame(lignes, columns=['indicateur', 'parametre', 'valeur_base', 'valeur_basse', 'valeur_haute',
+                                            'base', 'bas', 'haut', 'delta_bas', 'delta_haut', 'amplitude'])
+    tornade = tornade.sort_values(['indicateur', 'amplitude'], ascending=[True, False], kind='stable',
+                                  ignore_index=True)
+    tornade['rang'] = tornade.groupby('indicateur').cumcount() + 1
+    return tornade
+
+
+def _est_nombre(valeur):
+    return isinstance(valeur, numbers.Real) and not isinstance(valeur, bool)
+
+
+def _lire(scenario, chemin):
+    valeur = scenario
+    for cle in chemin:
+        valeur = valeur[cle]
+    return valeur
+
+
+def _modifier(scenario, chemin, valeur):
+    """Copie du scénario où seule la section du paramètre est copiée puis modifiée"""
+    variante = dict(scenario)
+    variante[chemin[0]] = section = copy.deepcopy(scenario[chemin[0]])
+    cible = section
+    for cle in chemin[1:-1]:
+        cible = cible[cle]
+    cible[chemin[-1]] = valeur
+    return variante
+
+
+def _varier(valeur, sens, pas, pas_taux, cle):
+    """Valeur du paramètre diminuée (sens -1) ou augmentée (sens 1), bornée et de même type"""
+    if pas_taux is not None and cle.startswith('taux_'):
+        variee = valeur + sens * pas_taux
+    else:
+        variee = valeur * (1 + sens * pas)
+    minimum, maximum = BORNES.get(cle, (None, None))
+    if minimum is not None:
+        variee = min(max(variee, minimum), maximum)
+    return int(round(variee)) if isinstance(valeur, numbers.Integral) else float(variee)
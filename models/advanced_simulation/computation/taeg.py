@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+
+def resoudre_taux_actuariel(flux, temps, bas=-0.99, haut=10.0, tolerance=1e-12, max_iterations=100):
+    """
+    Taux annuel i annulant la valeur actuelle  sum_k flux_k (1 + i)^(-t_k), pour plusieurs
+    séries de flux à la fois.
+
+    Newton encadré vectorisé : chaque série garde un encadrement [bas, haut] de sa racine,
+    resserré à chaque itération selon le signe de la valeur actuelle ; un pas de Newton
+    qui sort de l'encadrement est remplacé par une dichotomie.
+
+    Args:
+        flux (np.ndarray): Flux signés, forme (nb_series, nb_flux) ou (nb_flux,) ; 0 pour le bourrage
+        temps (np.ndarray): Dates des flux en années depuis le premier flux, diffusable avec `flux`
+        bas (float): Borne basse de l'encadrement initial
+        haut (float): Borne haute de l'encadrement initial
+        tolerance (float): Précision visée sur la valeur actuelle relative et sur le taux
+        max_iterations (int): Nombre maximal d'itérations
+
+    Returns:
+        np.ndarray: Taux annuel (décimal) par série, np.nan sans changement de signe dans [bas, haut]
+    """
+    flux = np.atleast_2d(np.asarray(flux, dtype=float))
+    temps = np.broadcast_to(np.asarray(temps, dtype=float), flux.shape)
+    nb_series = flux.shape[0]
+    echelle = np.maximum(np.abs(flux).sum(axis=1), 1e-300)
+
+    def valeur_actuelle(taux):
+        actualisation = (1 + taux[:, None]) ** -temps
+        va = (flux * actualisation).sum(axis=1)
+        derivee = (-temps * flux * actualisation).sum(axis=1) / (1 + taux)
+        return va, derivee
+
+    bas = np.full(nb_series, float(bas))
+    haut = np.full(nb_series, float(haut))
+    va_bas, _ = valeur_actuelle(bas)
+    va_haut, _ = valeur_actuelle(haut)
+    encadre = np.sign(va_bas) != np.sign(va_haut)
+    signe_bas = np.sign(va_bas)
+
+    taux = np.clip(np.full(nb_series, 0.05), bas, haut)
+    for _ in range(max_iterations):
+        va, derivee = valeur_actuelle(taux)
+        converge = np.abs(va) <= tolerance * echelle
+        if np.all(converge | ~encadre):
+            break
+
+        # Resserrer l'encadrement autour de la racine
+        meme_signe = np.sign(va) == signe_bas
+        bas = np.where(meme_signe, taux, bas)
+        haut = np.where(meme_signe, haut, taux)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = taux - va / derivee
+        hors_encadrement = ~np.isfinite(newton) | (newton <= bas) | (newton >= haut)
+        nouveau = np.where(hors_encadrement, (bas + haut) / 2, newton)
+        taux = np.where(converge, taux, nouveau)
+        if np.all(converge | ~encadre | (haut - bas < tolerance)):
+            break
+
+    return np.where(encadre, taux, np.nan)
+
+
+def flux_taeg(df, pret, montant, date_debut):
+    """
+    Flux datés d'un prêt pour le TAEG, à partir du résultat long de ComputePret.
+
+    Le capital reçu est un flux positif à la date de début ; les paiements (échéances,
+    frais de dossier, courtage, caution, garantie et assurance) sont des flux négatifs.
+
+    Args:
+        df (pd.DataFrame): Résultat de ComputePret (colonnes 'date', 'pret', 'metrique', 'valeur')
+        pret (str): Identifiant du prêt, par exemple 'pret_1'
+        montant (float): Capital emprunté
+        date_debut (date): Date de mise à disposition des fonds
+
+    Returns:
+        tuple: (temps en années depuis `date_debut`, flux signés), tableaux NumPy
+    """
+    paiements = df[(df['pret'] == pret) & (df['metrique'] == 'paiement')]
+    paiements = paiements.groupby('date', observed=True)['valeur'].sum()
+
+    debut = pd.Timestamp(date_debut)
+    dates = pd.DatetimeIndex(paiements.index)
+    temps = np.concatenate(([0.0], (dates - debut).days.to_numpy() / 365.25))
+    flux = np.concatenate(([float(montant)], -paiements.to_numpy()))
+    return temps, flux
+
+
+def calculer_taeg(series):
+    """
+    TAEG de plusieurs prêts ou scénarios en un seul appel du solveur.
+
+    Args:
+        series (list): Couples (temps en années, flux signés), un par prêt
+
+    Returns:
+        np.ndarray: TAEG annuel (décimal) par prêt
+    """
+    if not series:
+        return np.array([])
+    longueur = max(len(flux) for _, flux in series)
+    temps = np.zeros((len(series), longueur))
+    flux = np.zeros((len(series), longueur))
+    for i, (t, f) in enumerate(series):
+        temps[i, :len(t)] = t
+        flux[i, :len(f)] = f
+    return resoudre_taux_actuariel(flux, temps)
+
+
+def taeg_prets(df, prets):
+    """
+    TAEG de chaque prêt d'une simulation.
+
+    Args:
+        df (pd.DataFrame): Résultat de ComputePret
+        prets (list): Paramètres des prêts (section Pret du DataStore)
+
+    Returns:
+        dict: Identifiant du prêt -> TAEG annuel (décimal)
+    """
+    series = [flux_taeg(df, pret['pret'], pret['montant'], pret['start_date']) for pret in prets]
+    return dict(zip([pret['pret'] for pret in prets], calculer_taeg(series)))
@@ -0,0 +1,116 @@
+import numpy as np
+
+from models.advanced_simulation.computation.amortissement import Echeancier
+
+
+def periodes_revision(nb_periodes, periode_fixe=0, periodicite_revision=12):
+    """
+    Échéances auxquelles le taux est révisé : fin de la phase fixe puis tous les `periodicite_revision`.
+
+    Args:
+        nb_periodes (int): Nombre total d'échéances
+        periode_fixe (int): Nombre d'échéances de la phase à taux fixe
+        periodicite_revision (int): Nombre d'échéances entre deux révisions
+
+    Returns:
+        np.ndarray: Indices des échéances de révision (triés)
+    """
+    premiere = max(int(periode_fixe), 1) if periode_fixe else int(periodicite_revision)
+    return np.arange(premiere, int(nb_periodes), max(int(periodicite_revision), 1))
+
+
+def construire_chemins_taux(taux_initial, chemins_index, periode_fixe=0, periodicite_revision=12,
+                            marge=0.0, cap=None, plancher=None):
+    """
+    Taux annuel appliqué à chaque échéance, pour un ou plusieurs chemins d'index.
+
+    Le taux initial s'applique jusqu'à la première révision. À chaque révision, le taux
+    devient index + marge, borné par le plancher et le cap, puis reste constant jusqu'à
+    la révision suivante.
+
+    Args:
+        taux_initial (float): Taux annuel de la phase fixe (décimal)
+        chemins_index (np.ndarray): Index annuel par échéance, forme (nb_periodes,) ou (nb_chemins, nb_periodes)
+        periode_fixe (int): Nombre d'échéances de la phase à taux fixe
+        periodicite_revision (int): Nombre d'échéances entre deux révisions
+        marge (float): Marge ajoutée à l'index (décimal)
+        cap (float, optional): Taux annuel maximal (décimal)
+        plancher (float, optional): Taux annuel minimal (décimal)
+
+    Returns:
+        tuple: (taux annuels de forme (nb_chemins, nb_periodes), indices des révisions)
+    """
+    chemins_index = np.atleast_2d(np.asarray(chemins_index, dtype=float))
+    nb_chemins, nb_periodes = chemins_index.shape
+    revisions = periodes_revision(nb_periodes, periode_fixe, periodicite_revision)
+
+    taux_revises = np.clip(chemins_index[:, revisions] + marge,
+                           -np.inf if plancher is None else plancher,
+                           np.inf if cap is None else cap)
+
+    # Pour chaque échéance, dernière révision intervenue (-1 : phase fixe)
+    derniere_revision = np.searchsorted(revisions, np.arange(nb_periodes), side='right') - 1
+
+    taux = np.full((nb_chemins, nb_periodes), float(taux_initial))
+    apres_revision = derniere_revision >= 0
+    taux[:, apres_revision] = taux_revises[:, derniere_revision[apres_revision]]
+
+    return taux, revisions
+
+
+def calculer_echeanciers_taux_variable(montant, nb_periodes, periodes_par_an, taux_initial, chemins_index,
+                                       periode_fixe=0, periodicite_revision=12, marge=0.0,
+                                       cap=None, plancher=None):
+    """
+    Tableaux d'amortissement d'un prêt à taux révisable pour plusieurs chemins d'index en un appel.
+
+    Les révisions sont appliquées par le même échéancier segmenté que ComputePret
+    (`Echeancier.reviser_taux`) : l'échéance est recalculée à chaque révision sur la durée
+    restante. Les chemins forment un axe de l'échéancier, la boucle ne porte que sur les révisions.
+
+    Args:
+        montant (float): Capital emprunté
+        nb_periodes (int): Nombre d'échéances
+        periodes_par_an (int): Nombre d'échéances par an
+        taux_initial (float): Taux annuel de la phase fixe (décimal)
+        chemins_index (np.ndarray): Index annuel par échéance, forme (nb_periodes,) ou (nb_chemins, nb_periodes)
+        periode_fixe (int): Nombre d'échéances de la phase à taux fixe
+        periodicite_revision (int): Nombre d'échéances entre deux révisions
+        marge (float): Marge ajoutée à l'index (décimal)
+        cap (float, optional): Taux annuel maximal (décimal)
+        plancher (float, optional): Taux annuel minimal (décimal)
+
+    Returns:
+        dict: Tableaux (nb_chemins, nb_periodes) 'taux', 'paiement', 'interets', 'principal', 'capital_restant'
+    """
+    taux, revisions = construire_chemins_taux(taux_initial, chemins_index, periode_fixe,
+                                             periodicite_revision, marge, cap, plancher)
+    taux_periode = taux / periodes_par_an
+
+    echeancier = Echeancier(montant, taux_periode[:, 0], nb_periodes)
+    echeancier.appliquer((int(periode), 'revision', taux_periode[:, periode]) for periode in revisions)
+    tableau = echeancier.calculer()
+
+    return {
+        'taux': taux,
+        'paiement': tableau['paiement'],
+        'interets': tableau['interets'],
+        'principal': tableau['principal'],
+        'capital_restant': tableau['capital_restant'],
+    }
+
+
+def chemin_index_lineaire(index_initial, variation_annuelle, nb_periodes, periodes_par_an):
+    """
+    Chemin d'index déterministe évoluant linéairement.
+
+    Args:
+        index_initial (float): Valeur de l'index à la première échéance (décimal)
+        variation_annuelle (float): Variation de l'index par an (décimal, ex. 0.0025 = +25 pb)
+        nb_periodes (int): Nombre d'échéances
+        periodes_par_an (int): Nombre d'échéances par an
+
+    Returns:
+        np.ndarray: Index annuel par échéance
+    """
+    return index_initial + variation_annuelle * np.arange(nb_periodes) / periodes_par_an
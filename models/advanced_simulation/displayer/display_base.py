@@ -10,6 +10,8 @@ class DisplayBase(ABC):
     def __init__(self):
         self.data = DataStore.all()
         self.result = self.data["resultats"]
+        self.details = self.data.get("details_resultats", {})  # get_results() de chaque calculateur
+        self.agregation = self.data.get("agregation")  # Cube mensuel / trimestriel / annuel partagé
 
     @abstractmethod  
     def render(self):
@@ -13,6 +13,9 @@ class DisplayFactory:
         elif self.display == "DISPLAY_RESULT_V1":
             DisplayPrixEvolutionGraph().render()
 
+        elif self.display == "DISPLAY_RESULT_BANDES_PRIX":
+            DisplayBandesPrixGraph().render()
+
         elif self.display == "DISPLAY_RESULT_V2":
             DisplayTimeMetricsGraph().render()
 
@@ -25,5 +28,17 @@ class DisplayFactory:
         elif self.display == "DISPLAY_RESULT_V5":
             DisplayImpactOnPriceGraph().render()
 
+        elif self.display == "DISPLAY_RESULT_PRET":
+            DisplayResultPret().render()
+
+        elif self.display == "DISPLAY_RESULT_CASHFLOW":
+            DisplayCashflow().render()
+
+        elif self.display == "DISPLAY_RESULT_MONTE_CARLO":
+            DisplayMonteCarloGraph().render()
+
+        elif self.display == "DISPLAY_RESULT_LOYER":
+            DisplayLoyerAgrege().render()
+
         else:
             raise ValueError(f"DisplayFactory: Unknown display type '{self.display}'")
@@ -1,5 +1,7 @@
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
 
 from models.advanced_simulation.displayer.display_base import DisplayBase
 
@@ -26,6 +28,93 @@ class DisplayPrixEvolutionGraph(DisplayBase):
                       title="Prix du Bien et Prix au m²")
         st.plotly_chart(fig, use_container_width=True)
         
+class DisplayBandesPrixGraph(DisplayBase):
+
+    def __init__(self):
+        super().__init__()
+        self.bandes = self.details.get("ComputeBien", {}).get("bandes_prix")
+
+    def render(self):
+        st.subheader("🎲 Trajectoires stochastiques du prix")
+        if self.bandes is None:
+            st.info("Activez la simulation stochastique dans la section Marché pour afficher les bandes de prix.")
+            return
+        mesure = st.radio("Mesure", options=["prix", "prix_m2", "prix_corrige_total"], horizontal=True,
+                          format_func=lambda m: {"prix": "Prix", "prix_m2": "Prix/m²",
+                                                 "prix_corrige_total": "Prix corrigé de l'inflation"}[m],
+                          key="mesure_bandes_prix")
+        dates = self.bandes["date"]
+        x = list(dates) + list(dates[::-1])
+        fig = go.Figure()
+        for bas, haut, opacite in [("p5", "p95", 0.15), ("p25", "p75", 0.3)]:
+            fig.add_trace(go.Scatter(x=x, y=list(self.bandes[f"{mesure}_{haut}"]) + list(self.bandes[f"{mesure}_{bas}"][::-1]),
+                                     fill="toself", opacity=opacite, line=dict(width=0),
+                                     name=f"{bas.upper()}–{haut.upper()}"))
+        fig.add_trace(go.Scatter(x=dates, y=self.bandes[f"{mesure}_p50"], mode="lines", name="Médiane"))
+        fig.update_layout(template="plotly_white", xaxis_title="Date", yaxis_title="Prix (€)",
+                          title="Médiane et bandes de percentiles")
+        st.plotly_chart(fig, use_container_width=True)
+
+class DisplayMonteCarloGraph(DisplayBase):
+
+    def __init__(self):
+        super().__init__()
+        self.bandes = self.result.get("ComputeMonteCarlo")
+        self.resultats = self.details.get("ComputeMonteCarlo", {})
+
+    def render(self):
+        st.subheader("🎲 Simulation Monte Carlo des hypothèses")
+        if self.bandes is None or self.bandes.empty:
+            st.info("Activez la simulation Monte Carlo dans la section Hypothèses de Croissance pour afficher les bandes.")
+            return
+        st.caption(f"{self.resultats.get('nb_tirages', 0):,} tirages – probabilité d'une trésorerie cumulée "
+                   f"négative à l'horizon : {self.resultats.get('probabilite_tresorerie_negative', 0):.0%}")
+        mesure = st.radio("Mesure", options=["cashflow", "valeur_bien", "patrimoine_net", "tresorerie"], horizontal=True,
+                          format_func=lambda m: {"cashflow": "Cash-flow annuel", "valeur_bien": "Valeur du bien",
+                                                 "patrimoine_net": "Patrimoine net",
+                                                 "tresorerie": "Trésorerie cumulée"}[m],
+                          key="mesure_monte_carlo")
+        bandes, x_col = self.bandes, "date"
+        if mesure == "cashflow":
+            bandes, x_col = self.resultats["bandes_annuelles"], "annee"
+        abscisses = list(bandes[x_col])
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=abscisses + abscisses[::-1],
+                                 y=list(bandes[f"{mesure}_p95"]) + list(bandes[f"{mesure}_p5"][::-1]),
+                                 fill="toself", opacity=0.2, line=dict(width=0), name="P5–P95"))
+        fig.add_trace(go.Scatter(x=abscisses, y=bandes[f"{mesure}_p50"], mode="lines", name="Médiane"))
+        fig.update_layout(template="plotly_white", xaxis_title="Année" if x_col == "annee" else "Date",
+                          yaxis_title="Montant (€)", title="Médiane et bande P5–P95")
+        st.plotly_chart(fig, use_container_width=True)
+
+class DisplayCashflow(DisplayBase):
+
+    def __init__(self):
+        super().__init__()
+        self.journal = self.result.get("ComputeCashflow")
+        self.resultats = self.details.get("ComputeCashflow", {})
+
+    def render(self):
+        st.subheader("💶 Trésorerie consolidée")
+        if self.journal is None or self.journal.empty:
+            st.info("Aucun flux de trésorerie.")
+            return
+        grain = st.radio("Granularité", options=["comptes_mensuels", "comptes_annuels"], horizontal=True,
+                         format_func=lambda g: {"comptes_mensuels": "Mois", "comptes_annuels": "Année"}[g],
+                         key="grain_cashflow")
+        comptes = self.resultats[grain]
+        # Contreparties de signe opposé aux flux : affichées du point de vue de la trésorerie
+        contreparties = [c for c in comptes.columns if c not in ("periode", "tresorerie")]
+        vue = comptes[["periode"]].assign(**{c: -comptes[c] for c in contreparties})
+        fig = px.bar(vue, x="periode", y=contreparties, barmode="relative",
+                     labels={"value": "Flux (€)", "variable": "Compte", "periode": "Période"},
+                     title="Flux de trésorerie par compte")
+        fig.add_trace(go.Scatter(x=comptes["periode"], y=comptes["tresorerie"].cumsum(), mode="lines",
+                                 name="Trésorerie cumulée"))
+        st.plotly_chart(fig, use_container_width=True)
+        with st.expander("Journal de trésorerie"):
+            st.dataframe(self.journal)
+
 class DisplayTimeMetricsGraph(DisplayBase):
 
     def __init__(self):
@@ -84,4 +173,54 @@ class DisplayImpactOnPriceGraph(DisplayBase):
                      barmode="group",
                      labels={"value": "Impact (€)", "variable": "Type d'Impact"},
                      title="Impact du Prix Total et Prix au m²")
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig, use_container_width=True)
+
+class DisplayResultPret(DisplayBase):
+
+    def __init__(self):
+        super().__init__()
+        self.dtf = self.result.get("ComputePret")
+        self.taeg = self.details.get("ComputePret", {}).get("taeg", {})
+
+    def render(self):
+        st.subheader("🏦 Synthèse des prêts")
+        if self.dtf is None or self.dtf.empty:
+            st.info("Aucun prêt.")
+            return
+        totaux = self.dtf.groupby(["pret", "metrique"], observed=True)["valeur"].sum()
+        synthese = pd.DataFrame([
+            {
+                "Prêt": pret["pret"],
+                "Montant (€)": pret["montant"],
+                "Taux nominal (%)": pret["taux_interet"],
+                "TAEG (%)": self.taeg.get(pret["pret"], float("nan")) * 100,
+                "Intérêts (€)": totaux.get((pret["pret"], "interets"), 0.0),
+                "Frais et assurance (€)": totaux.get((pret["pret"], "frais"), 0.0),
+            }
+            for pret in self.data["prets"]
+        ])
+        st.dataframe(synthese.style.format({"TAEG (%)": "{:.3f}", "Taux nominal (%)": "{:.2f}",
+                                            "Montant (€)": "{:,.0f}", "Intérêts (€)": "{:,.0f}",
+                                            "Frais et assurance (€)": "{:,.0f}"}),
+                     use_container_width=True, hide_index=True)
+
+class DisplayLoyerAgrege(DisplayBase):
+
+    def __init__(self):
+        super().__init__()
+        self.dtf = self.result["ComputeLoyer"]
+
+    def render(self):
+        st.subheader("🏠 Loyers encaissés")
+        if self.dtf.empty:
+            st.info("Aucun loyer actif.")
+            return
+        grain = st.radio("Granularité", options=["mois", "trimestre", "annee"], horizontal=True,
+                         format_func=lambda g: {"mois": "Mois", "trimestre": "Trimestre", "annee": "Année"}[g],
+                         key="grain_loyer")
+        cube = self.agregation.cube(self.dtf[["date", "loyer", "charges"]], "ComputeLoyer")
+        fig = px.bar(cube[grain], x="periode", y=["loyer", "charges"], barmode="stack",
+                     labels={"value": "Montant (€)", "variable": "Type", "periode": "Période"},
+                     title="Loyers et charges encaissés")
+        st.plotly_chart(fig, use_container_width=True)
+
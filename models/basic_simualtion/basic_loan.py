@@ -1,6 +1,9 @@
 import streamlit as st
+import numpy as np
 import pandas as pd 
 
+from models.advanced_simulation.computation.amortissement import echeancier_en_cache
+
 
 st.title("Basic Loan Simulation")
 
@@ -27,28 +30,24 @@ frais_dossier = st.number_input("Frais de dossier (€)", min_value=0, max_value
 
 # Calcul de la mensualité (hors assurance)
 taux_mensuel = (taux_interet / 100) / 12
-mensualite = capital * (taux_mensuel / (1 - (1 + taux_mensuel) ** -duree))
-
-# Tableau d'amortissement
-solde = capital
-cumul_interets = 0
-cumul_assurance = 0
-cumul_total = 0
-
-data = []
-for mois in range(1, duree + 1):
-    interets = solde * taux_mensuel
-    capital_rembourse = mensualite - interets
-    assurance_mensuelle = (assurance / 100) * capital / 12
-    cout_total = mensualite + assurance_mensuelle
-    cumul_interets += interets
-    cumul_assurance += assurance_mensuelle
-    cumul_total += cout_total
-    solde -= capital_rembourse
-
-    data.append([mois, mensualite, assurance_mensuelle, interets, capital_rembourse, cout_total, cumul_interets, cumul_assurance, cumul_total])
-    
-df = pd.DataFrame(data, columns=["Mois", "Mensualité", "Assurance", "Intérêts", "Capital remboursé", "Coût total", "Cumul Intérêts","Cumul Assurance","Cumul Total"])
+
+# Tableau d'amortissement (cache partagé des échéanciers)
+echeancier = echeancier_en_cache(capital, taux_mensuel, duree)
+mensualite = echeancier["paiement"][0]
+assurance_mensuelle = np.full(duree, (assurance / 100) * capital / 12)
+cout_total = echeancier["paiement"] + assurance_mensuelle
+
+df = pd.DataFrame({
+    "Mois": np.arange(1, duree + 1),
+    "Mensualité": echeancier["paiement"],
+    "Assurance": assurance_mensuelle,
+    "Intérêts": echeancier["interets"],
+    "Capital remboursé": echeancier["principal"],
+    "Coût total": cout_total,
+    "Cumul Intérêts": np.cumsum(echeancier["interets"]),
+    "Cumul Assurance": np.cumsum(assurance_mensuelle),
+    "Cumul Total": np.cumsum(cout_total),
+})
 
 # Calcul des coûts totaux
 total_interets = df["Intérêts"].sum()
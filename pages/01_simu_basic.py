@@ -1,6 +1,8 @@
 import streamlit as st
 import math
 
+from models.advanced_simulation.computation.amortissement import echeancier_en_cache
+
 st.title("💰 Simulateur de Prêt Basique")
 
 # --- Champs de saisie ---
@@ -17,15 +19,12 @@ if st.button("Simuler le prêt"):
     taux_interet_mensuel = taux_interet / 100 / 12
     nombre_paiements = duree_loan_annees * 12
 
-    # Formule d'amortissement
-    if taux_interet_mensuel > 0:
-        paiement_mensuel = montant_loan * (taux_interet_mensuel * (1 + taux_interet_mensuel) ** nombre_paiements) / \
-                           ((1 + taux_interet_mensuel) ** nombre_paiements - 1)
-    else:
-        paiement_mensuel = montant_loan / nombre_paiements  # Taux d'intérêt nul
+    # Tableau d'amortissement (cache partagé des échéanciers, taux nul compris)
+    echeancier = echeancier_en_cache(montant_loan, taux_interet_mensuel, nombre_paiements)
+    paiement_mensuel = echeancier["paiement"][0]
 
-    paiement_total = paiement_mensuel * nombre_paiements
-    interets_totaux = paiement_total - montant_loan
+    paiement_total = echeancier["paiement"].sum()
+    interets_totaux = echeancier["interets"].sum()
 
     st.success("✅ Résultat de la simulation de prêt")
     st.write(f"**Paiement mensuel :** €{paiement_mensuel:,.2f}")
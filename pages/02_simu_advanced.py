@@ -1,5 +1,7 @@
 import streamlit as st
 
+from models.advanced_simulation.computation.amortissement import echeancier_en_cache
+
 # --- Vérification de l'accès ---
 if "logged_in" not in st.session_state or not st.session_state["logged_in"]:
     st.warning("Vous devez être connecté pour accéder à cette page.")
@@ -36,22 +38,17 @@ if st.button("Lancer la simulation"):
         st.error("L'apport personnel dépasse ou égale le montant du prêt.")
         st.stop()
 
-    if type_remboursement == "Mensualités constantes":
-        if taux_mensuel > 0:
-            mensualite = capital_emprunté * (taux_mensuel * (1 + taux_mensuel) ** nb_mensualites) / \
-                         ((1 + taux_mensuel) ** nb_mensualites - 1)
-        else:
-            mensualite = capital_emprunté / nb_mensualites
-    else:  # Amortissement constant
-        amortissement_constant = capital_emprunté / nb_mensualites
-        mensualite = amortissement_constant + (capital_emprunté * taux_mensuel)
+    # Échéancier complet (mensualités constantes ou amortissement constant)
+    echeancier = echeancier_en_cache(capital_emprunté, taux_mensuel, nb_mensualites,
+                                     type_remboursement=type_remboursement)
+    mensualite = echeancier["paiement"][0]  # Première mensualité (décroissante en amortissement constant)
 
     # Assurance mensuelle
     mensualite_assurance = capital_emprunté * taux_assurance_mensuel
     mensualite_totale = mensualite + mensualite_assurance
 
-    total_paye = mensualite_totale * nb_mensualites
-    interets_totaux = total_paye - capital_emprunté - (mensualite_assurance * nb_mensualites)
+    total_paye = echeancier["paiement"].sum() + mensualite_assurance * nb_mensualites
+    interets_totaux = echeancier["interets"].sum()
 
     # --- Résultats ---
     st.success("✅ Résultats de la simulation")
@@ -0,0 +1,78 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from models.advanced_simulation.computation.taux_variable import calculer_echeanciers_taux_variable
+
+st.title("📉 Simulateur de Prêt à Taux Variable")
+
+st.markdown("""
+Ce simulateur compare un **prêt à taux variable** et ses variantes **capées** sur un grand nombre
+de trajectoires aléatoires de l'index de référence. Toutes les trajectoires sont calculées en un seul appel.
+""")
+
+# 🧮 Entrée utilisateur
+st.sidebar.header("🔧 Paramètres du prêt")
+capital = st.sidebar.number_input("💶 Montant du prêt (€)", 1000, 2_000_000, 200_000, step=1000)
+duree_annees = st.sidebar.slider("📅 Durée du prêt (années)", 1, 30, 20)
+taux_initial = st.sidebar.number_input("📈 Taux initial (%)", 0.0, 15.0, 3.5, step=0.05) / 100
+duree_fixe_mois = st.sidebar.number_input("🔒 Phase à taux fixe (mois)", 0, 360, 0, step=12)
+periodicite_revision = st.sidebar.selectbox("🔁 Révision du taux (mois)", [1, 3, 6, 12], index=3)
+
+st.sidebar.header("📊 Index de référence")
+index_initial = st.sidebar.number_input("Index initial (%)", -1.0, 15.0, 2.5, step=0.05) / 100
+volatilite = st.sidebar.number_input("Volatilité annuelle de l'index (points de %)", 0.0, 5.0, 0.8, step=0.1) / 100
+nb_trajectoires = st.sidebar.select_slider("Nombre de trajectoires", options=[100, 500, 1000, 5000, 10000], value=1000)
+
+st.sidebar.header("🧢 Structures de cap")
+caps = st.sidebar.multiselect("Caps à la hausse (points de %)", options=[0.5, 1.0, 2.0, 3.0], default=[1.0, 2.0])
+
+# 🔢 Trajectoires de l'index : marche aléatoire mensuelle
+nb_mois = duree_annees * 12
+generateur = np.random.default_rng(42)
+chocs = generateur.normal(0.0, volatilite / np.sqrt(12), size=(nb_trajectoires, nb_mois))
+chocs[:, 0] = 0.0
+chemins_index = index_initial + np.cumsum(chocs, axis=1)
+marge = taux_initial - index_initial
+
+structures = {"Variable sans cap": None}
+for cap in sorted(caps):
+    structures[f"Capé +{cap:g} pt"] = taux_initial + cap / 100
+
+resultats = {}
+for nom, cap in structures.items():
+    resultats[nom] = calculer_echeanciers_taux_variable(
+        capital, nb_mois, 12, taux_initial, chemins_index,
+        periode_fixe=duree_fixe_mois, periodicite_revision=periodicite_revision,
+        marge=marge, cap=cap, plancher=0.0 if cap is not None else None)
+
+# 📋 Résumé
+st.subheader("📌 Coût total des intérêts selon la structure")
+resume = pd.DataFrame([
+    {
+        "Structure": nom,
+        "Mensualité initiale (€)": res["paiement"][0, 0],
+        "Mensualité max P95 (€)": np.percentile(res["paiement"].max(axis=1), 95),
+        "Intérêts P5 (€)": np.percentile(res["interets"].sum(axis=1), 5),
+        "Intérêts P50 (€)": np.percentile(res["interets"].sum(axis=1), 50),
+        "Intérêts P95 (€)": np.percentile(res["interets"].sum(axis=1), 95),
+    }
+    for nom, res in resultats.items()
+])
+st.dataframe(resume.style.format({col: "{:,.0f}" for col in resume.columns if col != "Structure"}),
+             use_container_width=True)
+
+# 📈 Bandes de mensualités
+st.subheader("📈 Mensualités : médiane et bande P5–P95")
+mois = np.arange(1, nb_mois + 1)
+fig = go.Figure()
+for nom, res in resultats.items():
+    p5, p50, p95 = np.percentile(res["paiement"], [5, 50, 95], axis=0)
+    fig.add_trace(go.Scatter(x=np.concatenate([mois, mois[::-1]]), y=np.concatenate([p95, p5[::-1]]),
+                             fill="toself", opacity=0.2, line=dict(width=0), name=f"{nom} P5–P95", showlegend=False))
+    fig.add_trace(go.Scatter(x=mois, y=p50, mode="lines", name=nom))
+fig.update_layout(template="plotly_white", xaxis_title="Mois", yaxis_title="Mensualité (€)", height=450)
+st.plotly_chart(fig, use_container_width=True)
+
+st.caption("⚠️ Simulation indicative à but pédagogique. Les trajectoires d'index sont aléatoires et ne constituent pas une prévision.")
@@ -1,8 +1,11 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from io import BytesIO
 
+from models.advanced_simulation.computation.amortissement import calculer_echeancier_annuel
+
 # Configuration Streamlit
 st.set_page_config(page_title="Simulateur Prêt In Fine", page_icon="📊", layout="centered")
 
@@ -19,11 +22,11 @@ taux_annuel = st.sidebar.number_input("📈 Taux d’intérêt annuel (%)", 0.1,
 duree_annees = st.sidebar.slider("📅 Durée du prêt (années)", 1, 30, 10)
 
 # 🔢 Calculs
-taux_mensuel = taux_annuel / 100 / 12
 nb_mois = duree_annees * 12
-interet_mensuel = capital * taux_mensuel
-interet_total = interet_mensuel * nb_mois
-remboursement_final = capital
+echeancier = calculer_echeancier_annuel(capital, taux_annuel, nb_mois, "Mensuelle", "In Fine")
+interet_mensuel = echeancier["interets"][0]
+interet_total = echeancier["interets"].sum()
+remboursement_final = echeancier["principal"][-1]
 
 # 📋 Résumé
 st.subheader("📌 Résumé")
@@ -34,26 +37,17 @@ col2.metric("Total intérêts payés", f"{interet_total:,.2f} €")
 col2.metric("Remboursement final", f"{remboursement_final:,.2f} €")
 
 # 📅 Échéancier
-data = []
-cumul_interets = 0
-for mois in range(1, nb_mois + 1):
-    capital_rembourse = 0
-    if mois == nb_mois:
-        capital_rembourse = capital
-    cumul_interets += interet_mensuel
-    data.append({
-        "Mois": mois,
-        "Année": (mois - 1) // 12 + 1,
-        "Mensualité intérêts (€)": interet_mensuel,
-        "Capital remboursé (€)": capital_rembourse,
-        "Cumul intérêts (€)": cumul_interets
-    })
-
-df = pd.DataFrame(data)
+mois = np.arange(1, nb_mois + 1)
+df = pd.DataFrame({
+    "Mois": mois,
+    "Année": (mois - 1) // 12 + 1,
+    "Mensualité intérêts (€)": echeancier["interets"],
+    "Capital remboursé (€)": echeancier["principal"],
+    "Cumul intérêts (€)": np.cumsum(echeancier["interets"])
+})
 
 # 📈 Graphique interactif Plotly
 st.subheader("📈 Visualisation interactive")
-df["Cumul intérêts (€)"] = df["Mensualité intérêts (€)"].cumsum()
 
 # 📊 Création des 3 colonnes
 col1, col2, col3 = st.columns(3)
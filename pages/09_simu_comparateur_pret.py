@@ -5,16 +5,24 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from models.advanced_simulation.computation.amortissement import echeancier_en_cache
+from models.advanced_simulation.computation.taeg import calculer_taeg
+
 def calcul_mensualite(montant, taux_annuel, duree_annees):
-    taux_mensuel = taux_annuel / 12
-    n = duree_annees * 12
-    if taux_mensuel == 0:
-        mensualite = montant / n
-    else:
-        mensualite = montant * taux_mensuel / (1 - (1 + taux_mensuel) ** -n)
-    cout_total = mensualite * n - montant
+    echeancier = echeancier_en_cache(montant, taux_annuel / 12, duree_annees * 12)
+    mensualite = echeancier["paiement"][0]
+    cout_total = echeancier["interets"].sum()
     return mensualite, cout_total
 
+def flux_pret(pret):
+    """Flux mensuels du prêt pour le TAEG : capital net des frais, puis mensualités assurance comprise"""
+    mensualite, _ = calcul_mensualite(pret["montant"], pret["taux"], pret["duree"])
+    n = pret["duree"] * 12
+    temps = np.arange(n + 1) / 12
+    flux = np.full(n + 1, -(mensualite + pret["assurance_mensuelle"]))
+    flux[0] = pret["montant"] - pret["frais_dossier"] - pret["frais_garantie"]
+    return temps, flux
+
 st.title("Comparateur de Prêts")
 
 with st.expander("3️⃣ Paramètres de Prêt – *Cliquez pour ouvrir*", expanded=True):
@@ -29,8 +37,13 @@ with st.expander("3️⃣ Paramètres de Prêt – *Cliquez pour ouvrir*", expan
             montant = st.number_input("Montant du prêt (€)", min_value=1000, max_value=2_000_000, value=200_000, step=1000, key=f"montant_{i}")
             taux = st.number_input("Taux annuel (%)", min_value=0.0, max_value=10.0, value=1.5, step=0.1, key=f"taux_{i}") / 100
             duree = st.number_input("Durée (années)", min_value=1, max_value=40, value=20, step=1, key=f"duree_{i}")
+            frais_dossier = st.number_input("Frais de dossier et courtage (€)", min_value=0, value=1000, step=100, key=f"frais_dossier_{i}")
+            frais_garantie = st.number_input("Frais de garantie (€)", min_value=0, value=2000, step=100, key=f"frais_garantie_{i}")
+            assurance_mensuelle = st.number_input("Assurance mensuelle (€)", min_value=0.0, value=30.0, step=5.0, key=f"assurance_{i}")
             active = True if i == 0 else st.checkbox("Activer ce prêt", value=False, key=f"actif_{i}")
-            prets.append({"label": label_pret[i], "montant": montant, "taux": taux, "duree": duree, "active": active})
+            prets.append({"label": label_pret[i], "montant": montant, "taux": taux, "duree": duree,
+                          "frais_dossier": frais_dossier, "frais_garantie": frais_garantie,
+                          "assurance_mensuelle": assurance_mensuelle, "active": active})
 
 # Filtrage
 prets_actifs = [pret for pret in prets if pret["active"]]
@@ -51,6 +64,9 @@ df_resultats = pd.DataFrame([
     for pret in prets_actifs
 ])
 
+# TAEG de tous les prêts en un seul appel du solveur
+df_resultats["TAEG (%)"] = np.round(calculer_taeg([flux_pret(pret) for pret in prets_actifs]) * 100, 3)
+
 # Calculs complémentaires
 df_resultats["Capital remboursé (€)"] = df_resultats["Montant (€)"]
 df_resultats["Intérêts (€)"] = df_resultats["Coût total (€)"]
@@ -141,7 +157,8 @@ df_comparaison["Diff. Mensualité (€)"] = df_comparaison["Mensualité (€)"]
 df_comparaison["Diff. Coût total (€)"] = df_comparaison["Coût total (€)"] - ref["Coût total (€)"]
 
 st.subheader("📉 Comparaison par rapport au prêt de référence (Prêt 1)")
-st.dataframe(df_comparaison[["Prêt", "Diff. Mensualité (€)", "Diff. Coût total (€)"]], use_container_width=True)
+df_comparaison["Diff. TAEG (pts)"] = df_comparaison["TAEG (%)"] - ref["TAEG (%)"]
+st.dataframe(df_comparaison[["Prêt", "Diff. Mensualité (€)", "Diff. Coût total (€)", "Diff. TAEG (pts)"]], use_container_width=True)
 
 # 📈 Graphiques
 st.subheader("📊 Visualisations comparatives des prêts")
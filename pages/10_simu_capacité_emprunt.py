@@ -1,4 +1,8 @@
 import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from models.advanced_simulation.computation.capacite import capital_maximal, duree_minimale, taux_maximal
 
 # Titre
 st.title("Simulation de Capacité d'Emprunt Immobilier")
@@ -20,11 +24,8 @@ mensualite_max = (revenu_mensuel * (taux_endettement_max / 100)) - charges_mensu
 taux_mensuel = taux_interet / 100 / 12
 nb_mois = duree_annees * 12
 
-# Formule de calcul du montant empruntable : mensualité = C * t / (1 - (1 + t)^-n)
-if taux_mensuel > 0:
-    montant_max = mensualite_max * (1 - (1 + taux_mensuel) ** -nb_mois) / taux_mensuel
-else:
-    montant_max = mensualite_max * nb_mois  # taux nul
+# Montant empruntable : inversion de mensualité = C * t / (1 - (1 + t)^-n)
+montant_max = float(capital_maximal(mensualite_max, taux_interet / 100, nb_mois))
 
 # Affichage des résultats
 st.subheader("🧮 Résultat de la simulation")
@@ -35,4 +36,31 @@ st.write(f"**Durée du prêt :** {duree_annees} ans")
 st.write(f"**Taux d’intérêt :** {taux_interet:.2f} %")
 st.write(f"**Coût total du crédit estimé :** {mensualite_max * nb_mois - montant_max:,.2f} €")
 
+# Objectif de montant : durée minimale au taux choisi, taux maximal à la durée choisie
+st.subheader("🎯 Objectif de montant")
+montant_vise = st.number_input("Montant visé (€)", min_value=0, step=5000, value=int(max(montant_max, 0) // 5000 * 5000))
+duree_min = float(duree_minimale(montant_vise, mensualite_max, taux_interet / 100))
+taux_max = float(taux_maximal(montant_vise, mensualite_max, nb_mois))
+
+col1, col2 = st.columns(2)
+col1.metric(f"Durée minimale à {taux_interet:.2f} %",
+            f"{duree_min / 12:.1f} ans" if np.isfinite(duree_min) else "Impossible")
+col2.metric(f"Taux maximal sur {duree_annees} ans",
+            f"{taux_max * 100:.2f} %" if np.isfinite(taux_max) else "Impossible")
+
+# Surface de capacité : toute la grille taux × durée en un seul appel vectorisé
+st.subheader("🗺️ Surface de capacité d'emprunt")
+taux_grille = np.round(np.arange(0.5, 10.0 + 1e-9, 0.1), 1)
+durees_grille = np.arange(5, 31)
+surface = capital_maximal(mensualite_max, taux_grille[:, None] / 100, durees_grille[None, :] * 12)
+
+fig = go.Figure(go.Heatmap(
+    z=surface, x=durees_grille, y=taux_grille, colorscale="Viridis",
+    colorbar=dict(title="Montant (€)"),
+    hovertemplate="Durée : %{x} ans<br>Taux : %{y:.1f} %<br>Montant : %{z:,.0f} €<extra></extra>"))
+fig.add_trace(go.Scatter(x=[duree_annees], y=[taux_interet], mode="markers",
+                         marker=dict(color="red", size=10), name="Simulation"))
+fig.update_layout(template="plotly_white", xaxis_title="Durée (années)", yaxis_title="Taux annuel (%)", height=500)
+st.plotly_chart(fig, use_container_width=True)
+
 st.info("⚠️ Simulation indicative. Consultez un conseiller bancaire pour une évaluation précise.")
@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from datetime import date
+
+from models.advanced_simulation.computation.etat_locatif import EtatLocatif
 
 st.set_page_config(page_title="Simulation de loyer locatif", layout="wide")
 
@@ -11,39 +14,75 @@ st.header("1️⃣ Paramètres du bien")
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    nb_chambres = st.number_input("Nombre de chambres", min_value=1, max_value=20, value=3)
+    nb_chambres = st.number_input("Nombre de chambres / lots", min_value=1, max_value=500, value=3)
 with col2:
     loyer_par_chambre = st.number_input("Loyer par chambre (€)", min_value=100, max_value=5000, value=500)
 with col3:
     mode_occupation = st.radio("Mode d’occupation", ["Global", "Par chambre"])
 
-# Taux d’occupation
-occupation = []
+col4, col5, col6 = st.columns(3)
+with col4:
+    date_debut = st.date_input("Date de début", value=date.today().replace(day=1))
+with col5:
+    horizon = st.number_input("Horizon (années)", min_value=1, max_value=40, value=10)
+with col6:
+    taux_indexation = st.number_input("Indexation annuelle des loyers (%)", min_value=0.0, max_value=10.0, value=0.0, step=0.1)
+
+# Une ligne par chambre : loyer, charges et taux d’occupation
+lots = pd.DataFrame({
+    "Chambre": [f"Chambre {i+1}" for i in range(nb_chambres)],
+    "Loyer brut (€)": float(loyer_par_chambre),
+    "Charges (€)": 0.0,
+    "Taux d'occupation (%)": 90.0,
+})
 if mode_occupation == "Global":
     taux = st.slider("Taux d’occupation global (%)", 0, 100, 90)
-    occupation = [taux / 100] * nb_chambres
+    lots["Taux d'occupation (%)"] = float(taux)
 else:
     st.subheader("Taux d’occupation par chambre")
-    for i in range(nb_chambres):
-        taux_i = st.slider(f"Chambre {i+1}", 0, 100, 90, key=f"chambre_{i}")
-        occupation.append(taux_i / 100)
+    lots = st.data_editor(
+        lots,
+        disabled=["Chambre"],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Taux d'occupation (%)": st.column_config.NumberColumn(min_value=0.0, max_value=100.0, step=1.0),
+        },
+        key="lots_chambres",
+    )
+
+date_fin = pd.Timestamp(date_debut) + pd.DateOffset(years=int(horizon)) - pd.Timedelta(days=1)
+etat = EtatLocatif(
+    labels=lots["Chambre"].to_numpy(),
+    loyer_mensuel=lots["Loyer brut (€)"].to_numpy(dtype=float),
+    charges_mensuelles=lots["Charges (€)"].to_numpy(dtype=float),
+    taux_occupation=lots["Taux d'occupation (%)"].to_numpy(dtype=float) / 100,
+    debut=pd.Timestamp(date_debut),
+    fin=date_fin,
+    taux_indexation=taux_indexation / 100,
+    jour_paiement=pd.Timestamp(date_debut).day,
+)
 
-# Revenus mensuels
-revenus_par_chambre = [loyer_par_chambre * taux for taux in occupation]
-revenu_total_mensuel = sum(revenus_par_chambre)
-revenu_total_annuel = revenu_total_mensuel * 12
+# Flux de toutes les chambres en une seule diffusion (chambres × mois)
+flux = etat.flux_mensuels(date_debut, date_fin)
+revenus_par_chambre = flux['loyer'][:, 0]
+revenu_total_mensuel = flux['loyer_total'][0]
+revenu_total_annuel = flux['loyer_total'][:12].sum()
 
 st.header("2️⃣ Résultats")
 
-st.metric("💵 Revenu locatif mensuel", f"{revenu_total_mensuel:,.0f} €")
-st.metric("📅 Revenu locatif annuel", f"{revenu_total_annuel:,.0f} €")
+col_m1, col_m2, col_m3 = st.columns(3)
+col_m1.metric("💵 Revenu locatif mensuel", f"{revenu_total_mensuel:,.0f} €")
+col_m2.metric("📅 Revenu locatif annuel", f"{revenu_total_annuel:,.0f} €")
+col_m3.metric(f"📈 Revenus cumulés sur {horizon} ans", f"{flux['loyer_total'].sum():,.0f} €")
 
 # Dataframe récapitulatif
 df = pd.DataFrame({
-    "Chambre": [f"Chambre {i+1}" for i in range(nb_chambres)],
-    "Taux d'occupation": [f"{round(occ*100)}%" for occ in occupation],
-    "Loyer brut (€)": [loyer_par_chambre] * nb_chambres,
+    "Chambre": etat.labels,
+    "Taux d'occupation": [f"{round(occ*100)}%" for occ in etat.taux_occupation],
+    "Loyer brut (€)": etat.loyer_mensuel,
     "Loyer perçu (€)": revenus_par_chambre,
+    f"Total sur {horizon} ans (€)": flux['loyer'].sum(axis=1),
 })
 st.dataframe(df, use_container_width=True)
 
@@ -68,3 +107,16 @@ fig_occ = px.pie(
     template="plotly_white"
 )
 st.plotly_chart(fig_occ, use_container_width=True)
+
+# Graphique: Revenus annuels du bien sur l’horizon
+annees = pd.DatetimeIndex(flux['mois']).year
+df_annuel = (pd.DataFrame({"Année": annees, "Loyers (€)": flux['loyer_total'], "Charges (€)": flux['charges_total']})
+             .groupby("Année", as_index=False).sum())
+fig_annuel = px.bar(
+    df_annuel,
+    x="Année",
+    y=["Loyers (€)", "Charges (€)"],
+    title="📆 Revenus annuels sur l’horizon",
+    template="plotly_white"
+)
+st.plotly_chart(fig_annuel, use_container_width=True)
@@ -1,5 +1,8 @@
 import streamlit as st
 
+from models.advanced_simulation.computation.amortissement import CACHE_ECHEANCIERS
+from models.advanced_simulation.computation.cache import CACHE_CALCULS, CACHE_MODELES
+
 # --- Access Control ---
 if "logged_in" not in st.session_state or not st.session_state["logged_in"]:
     st.warning("You must be logged in to access your settings.")
@@ -43,6 +46,26 @@ if st.button("Save Preferences"):
 
 st.divider()
 
+# --- Cache Section ---
+for titre, cache, cle in [("Schedule Cache", CACHE_ECHEANCIERS, "echeanciers"),
+                          ("Calculator Cache", CACHE_CALCULS, "calculs"),
+                          ("Model Cache", CACHE_MODELES, "modeles")]:
+    st.subheader(titre)
+
+    stats = cache.statistiques()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit Rate", f"{stats['taux_succes']:.0%}")
+    col2.metric("Hits / Misses", f"{stats['succes']} / {stats['echecs']}")
+    col3.metric("Entries", f"{stats['entrees']} / {cache.taille_max}")
+    col4.metric("Memory", f"{stats['memoire'] / 1024 ** 2:.1f} / {cache.memoire_max / 1024 ** 2:.0f} MB")
+    st.caption(f"Evictions: {stats['evictions']}")
+
+    if st.button("Clear Cache", key=f"vider_{cle}"):
+        cache.vider()
+        st.rerun()
+
+st.divider()
+
 # --- Security Section ---
 st.subheader("Security Settings")
 
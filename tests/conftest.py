@@ -0,0 +1,13 @@
+from pathlib import Path
+
+import pytest
+
+from models.advanced_simulation.computation.moteur import charger_scenario
+
+SCENARIO_EXEMPLE = Path(__file__).resolve().parent.parent / "scenarios" / "exemple.json"
+
+
+@pytest.fixture
+def scenario():
+    """Scénario d'exemple (deux prêts, deux baux), relu à chaque test"""
+    return charger_scenario(SCENARIO_EXEMPLE)
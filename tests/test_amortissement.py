@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from models.advanced_simulation.computation.amortissement import Echeancier, calculer_echeance
+
+MONTANT = 200_000.0
+TAUX = 0.04 / 12
+NB_PERIODES = 240
+
+
+def echeancier_boucle(montant, taux, nb_periodes, periode_differe=0, taux_differe=None,
+                      type_differe="Aucun", revisions=None, remboursements=None, reduction_duree=False):
+    """
+    Référence : une itération par échéance, sans forme fermée.
+
+    Args:
+        revisions (dict): Échéance -> nouveau taux par période
+        remboursements (dict): Première échéance postérieure -> (montant, pénalité)
+        reduction_duree (bool): Après un remboursement, conserver l'échéance et solder plus tôt
+    """
+    taux_differe = taux if taux_differe is None else taux_differe
+    revisions = revisions or {}
+    remboursements = remboursements or {}
+    colonnes = ('paiement', 'interets', 'principal', 'capital_restant', 'remboursement_anticipe', 'penalite')
+    tableau = {cle: np.zeros(nb_periodes) for cle in colonnes}
+
+    capital = montant
+    echeance = None
+    for k in range(nb_periodes):
+        if k < periode_differe:
+            interets = capital * taux_differe
+            if 'Total' in type_differe:
+                paiement, principal = 0.0, 0.0
+                capital += interets
+            else:
+                paiement, principal = interets, 0.0
+        else:
+            if k == periode_differe:
+                echeance = calculer_echeance(capital, taux, nb_periodes - k)
+            if k in revisions:
+                taux = revisions[k]
+                echeance = calculer_echeance(capital, taux, nb_periodes - k)
+            interets = capital * taux
+            solde = k == nb_periodes - 1 or (reduction_duree and capital + interets <= echeance)
+            principal = capital if solde else echeance - interets
+            paiement = principal + interets
+            capital -= principal
+
+        tableau['paiement'][k] = paiement
+        tableau['interets'][k] = interets
+        tableau['principal'][k] = principal
+
+        # Remboursement versé avant l'échéance suivante, comptabilisé sur celle-ci
+        if k + 1 in remboursements:
+            verse, taux_penalite = remboursements[k + 1]
+            penalite = verse * taux_penalite
+            rembourse = min(verse - penalite, capital)
+            capital -= rembourse
+            tableau['remboursement_anticipe'][k] += rembourse
+            tableau['penalite'][k] += penalite
+            tableau['principal'][k] += rembourse
+            tableau['paiement'][k] += rembourse + penalite
+            if k + 1 >= periode_differe and not reduction_duree:
+                echeance = calculer_echeance(capital, taux, nb_periodes - k - 1)
+
+        tableau['capital_restant'][k] = capital
+    return tableau
+
+
+def comparer(resultat, reference):
+    for cle, attendu in reference.items():
+        np.testing.assert_allclose(resultat[cle], attendu, rtol=1e-9, atol=1e-6, err_msg=cle)
+
+
+def test_amortissable_sans_evenement():
+    resultat = Echeancier(MONTANT, TAUX, NB_PERIODES).calculer()
+    comparer(resultat, echeancier_boucle(MONTANT, TAUX, NB_PERIODES))
+    assert resultat['capital_restant'][-1] == 0.0
+    assert resultat['principal'].sum() == pytest.approx(MONTANT)
+
+
+@pytest.mark.parametrize("type_differe", ["Partiel (Intérêts)", "Total (Pas de paiement)"])
+def test_differe(type_differe):
+    resultat = Echeancier(MONTANT, TAUX, NB_PERIODES, periode_differe=24,
+                          taux_differe_par_periode=0.02 / 12, type_differe=type_differe).calculer()
+    comparer(resultat, echeancier_boucle(MONTANT, TAUX, NB_PERIODES, periode_differe=24,
+                                         taux_differe=0.02 / 12, type_differe=type_differe))
+
+
+def test_remboursement_anticipe_partiel():
+    evenements = [(36, 'remboursement', 20_000.0, 0.03, 'Partiel'),
+                  (120, 'remboursement', 15_000.0, 0.0, 'Partiel')]
+    resultat = Echeancier(MONTANT, TAUX, NB_PERIODES).appliquer(evenements).calculer()
+    comparer(resultat, echeancier_boucle(MONTANT, TAUX, NB_PERIODES,
+                                         remboursements={36: (20_000.0, 0.03), 120: (15_000.0, 0.0)}))
+
+
+def test_remboursement_total_solde_le_pret():
+    resultat = Echeancier(MONTANT, TAUX, NB_PERIODES).appliquer(
+        [(60, 'remboursement', 10 * MONTANT, 0.0, 'Total')]).calculer()
+    assert resultat['capital_restant'][59] == pytest.approx(0.0, abs=1e-6)
+    assert not resultat['paiement'][60:].any()
+    assert resultat['principal'].sum() == pytest.approx(MONTANT)
+
+
+def test_revisions_de_taux():
+    revisions = {60: 0.05 / 12, 120: 0.025 / 12}
+    resultat = Echeancier(MONTANT, TAUX, NB_PERIODES).appliquer(
+        [(periode, 'revision', taux) for periode, taux in revisions.items()]).calculer()
+    comparer(resultat, echeancier_boucle(MONTANT, TAUX, NB_PERIODES, revisions=revisions))
+
+
+def test_differe_revision_et_remboursement():
+    evenements = [(48, 'remboursement', 25_000.0, 0.02, 'Partiel'), (72, 'revision', 0.055 / 12)]
+    resultat = Echeancier(MONTANT, TAUX, NB_PERIODES, periode_differe=12,
+                          type_differe="Partiel (Intérêts)").appliquer(evenements).calculer()
+    comparer(resultat, echeancier_boucle(MONTANT, TAUX, NB_PERIODES, periode_differe=12,
+                                         type_differe="Partiel (Intérêts)",
+                                         revisions={72: 0.055 / 12}, remboursements={48: (25_000.0, 0.02)}))
+
+
+def test_remboursement_anticipe_reduction_duree():
+    evenements = [(36, 'remboursement', 40_000.0, 0.02, 'Partiel reduction_duree')]
+    resultat = Echeancier(MONTANT, TAUX, NB_PERIODES).appliquer(evenements).calculer()
+    reference = echeancier_boucle(MONTANT, TAUX, NB_PERIODES, remboursements={36: (40_000.0, 0.02)},
+                                  reduction_duree=True)
+
+    # L'échéancier s'arrête au nouveau terme ; la référence est nulle au-delà
+    duree = len(resultat['paiement'])
+    assert duree < NB_PERIODES
+    comparer(resultat, {cle: valeurs[:duree] for cle, valeurs in reference.items()})
+    assert not reference['paiement'][duree:].any()
+
+    # Échéance inchangée après le remboursement
+    assert resultat['paiement'][37] == pytest.approx(resultat['paiement'][0])
+    assert resultat['capital_restant'][-1] == 0.0
+    assert resultat['principal'].sum() == pytest.approx(MONTANT)
@@ -0,0 +1,41 @@
+import json
+
+import pandas as pd
+
+from models.advanced_simulation.batch import executer_lot, executer_scenario
+from tests.conftest import SCENARIO_EXEMPLE
+
+
+def ecrire_lot(chemin, scenarios):
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        for identifiant, scenario in scenarios:
+            fichier.write(json.dumps(dict(scenario, id=identifiant)) + "\n")
+
+
+def test_scenario_en_echec_rapporte_sans_interrompre_le_lot(tmp_path):
+    exemple = json.loads(SCENARIO_EXEMPLE.read_text(encoding='utf-8'))
+    casse = {section: valeur for section, valeur in exemple.items() if section != 'travaux'}
+    ecrire_lot(tmp_path / "lot.jsonl", [('premier', exemple), ('casse', casse), ('dernier', exemple)])
+
+    synthese = executer_lot(tmp_path / "lot.jsonl", tmp_path / "sortie", nb_workers=2)
+
+    # Ordre du fichier conservé, une ligne par scénario quel que soit son statut
+    assert synthese['scenario'].tolist() == ['premier', 'casse', 'dernier']
+    assert synthese['statut'].tolist() == ['ok', 'erreur', 'ok']
+    echec = synthese.set_index('scenario').loc['casse']
+    assert echec['erreur'].startswith('KeyError') and 'travaux' in echec['trace']
+    assert echec['nb_fichiers'] == 0
+
+    for identifiant in ('premier', 'dernier'):
+        assert (tmp_path / "sortie" / identifiant).is_dir()
+    assert not (tmp_path / "sortie" / "casse").exists()
+    ecrite = pd.read_parquet(tmp_path / "sortie" / "synthese.parquet")
+    pd.testing.assert_frame_equal(ecrite[['scenario', 'statut']], synthese[['scenario', 'statut']])
+
+
+def test_erreur_de_validation_rapportee(tmp_path, scenario):
+    scenario['prets'][0]['montant'] = -1
+    ligne = executer_scenario('invalide', scenario, tmp_path)
+    assert ligne['statut'] == 'erreur'
+    assert ligne['erreur'].startswith('ValueError: Scénario invalide')
+    assert ligne['duree_s'] >= 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from models.advanced_simulation.computation.amortissement import calculer_echeance
+from models.advanced_simulation.computation.capacite import capital_maximal, duree_minimale, taux_maximal
+
+TAUX_ANNUELS = np.array([0.0, 0.01, 0.035, 0.06])
+DUREES = np.array([60, 180, 300])
+
+
+def echeances(capital, taux_annuels, durees):
+    """`calculer_echeance` point par point sur la grille (taux × durée)"""
+    capital = np.broadcast_to(capital, (len(taux_annuels), len(durees)))
+    return np.array([[calculer_echeance(capital[i, j], t / 12, int(n)) for j, n in enumerate(durees)]
+                     for i, t in enumerate(taux_annuels)])
+
+
+def test_capital_maximal_inverse_de_l_echeance():
+    capital = capital_maximal(1_200.0, TAUX_ANNUELS[:, None], DUREES[None, :])
+    assert capital.shape == (len(TAUX_ANNUELS), len(DUREES))
+    np.testing.assert_allclose(echeances(capital, TAUX_ANNUELS, DUREES), 1_200.0, rtol=1e-10)
+
+
+def test_duree_minimale_inverse_de_l_echeance():
+    capital = 180_000.0
+    echeance = np.array([900.0, 1_200.0, 2_500.0])
+    for taux in TAUX_ANNUELS:
+        durees = duree_minimale(capital, echeance, taux)
+        for n, e in zip(durees, echeance):
+            if not np.isfinite(n):
+                assert e <= capital * taux / 12
+                continue
+            # Plus courte durée dont l'échéance ne dépasse pas le budget
+            assert calculer_echeance(capital, taux / 12, int(n)) <= e + 1e-9
+            assert calculer_echeance(capital, taux / 12, int(n) - 1) > e
+
+
+def test_duree_infinie_si_l_echeance_ne_couvre_pas_les_interets():
+    assert duree_minimale(100_000.0, 250.0, 0.03) == np.inf
+
+
+def test_taux_maximal_inverse_de_l_echeance():
+    capital = np.array([100_000.0, 150_000.0, 250_000.0])
+    taux = taux_maximal(capital[:, None], 1_300.0, DUREES[None, :])
+    valides = ~np.isnan(taux)
+    attendu = echeances(capital[:, None], np.zeros(len(capital)), DUREES)
+    # Sans solution exactement quand l'échéance ne rembourse pas le capital à taux nul
+    np.testing.assert_array_equal(valides, attendu <= 1_300.0)
+    for i, j in zip(*np.nonzero(valides)):
+        assert calculer_echeance(capital[i], taux[i, j] / 12, int(DUREES[j])) == pytest.approx(1_300.0, rel=1e-7)
@@ -0,0 +1,55 @@
+from models.advanced_simulation.computation.cache import CacheLRU
+from models.advanced_simulation.computation.compute_cashflow import ComputeCashflow
+from models.advanced_simulation.computation.compute_manager import ComputeManager
+from models.advanced_simulation.computation.contexte import ContexteSimulation
+
+
+def calculer(scenario):
+    contexte = ContexteSimulation(scenario)
+    manager = ComputeManager(cache=CacheLRU(), nb_workers=1, contexte=contexte)
+    manager.run_all()
+    entrees = {nom: (manager.resultats[nom], manager.details[nom]) for nom in ComputeCashflow.DEPENDANCES}
+    return contexte, manager, entrees
+
+
+def executer_cashflow(contexte, entrees):
+    calculateur = ComputeCashflow(contexte)
+    calculateur.entrees = entrees
+    calculateur.run()
+    return calculateur.get_results()
+
+
+def test_journal_rapproche_des_calculateurs_amont(scenario):
+    _, manager, _ = calculer(scenario)
+    resultats = manager.details['ComputeCashflow']
+    assert resultats['rapproche']
+    sources = set(resultats['rapprochement']['source'])
+    assert {pret['pret'] for pret in scenario['prets']} <= sources
+    assert {loyer['label'] for loyer in scenario['loyers']} <= sources
+
+
+def test_ecriture_perdue_detectee(scenario):
+    contexte, _, entrees = calculer(scenario)
+    loyers, details = entrees['ComputeLoyer']
+    ecritures = details['ecritures']
+    # Un encaissement du premier bail disparaît lors de la consolidation
+    premiere = ecritures.index[(ecritures['source'] == 'Loyer 1').to_numpy()][:2]
+    entrees['ComputeLoyer'] = (loyers, dict(details, ecritures=ecritures.drop(premiere)))
+
+    resultats = executer_cashflow(contexte, entrees)
+    rapprochement = resultats['rapprochement'].set_index('source')
+    assert not resultats['rapproche']
+    assert not rapprochement.loc['Loyer 1', 'rapproche']
+    assert rapprochement.drop('Loyer 1')['rapproche'].all()
+
+
+def test_differe_total_rapproche(scenario):
+    pret = scenario['prets'][1]
+    pret['differe'] = dict(pret['differe'], active=True, type='Total (Pas de paiement)')
+    _, manager, _ = calculer(scenario)
+    resultats = manager.details['ComputeCashflow']
+    rapprochement = resultats['rapprochement'].set_index('source')
+
+    # Les intérêts capitalisés ne sont décaissés qu'une fois, via le principal
+    assert rapprochement.loc[pret['pret'], 'rapproche']
+    assert resultats['rapproche']
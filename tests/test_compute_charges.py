@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from models.advanced_simulation.computation.cache import CacheLRU
+from models.advanced_simulation.computation.moteur import simuler
+
+
+def charges(scenario):
+    simulation = simuler(scenario, cache=None, nb_workers=1, cache_calculs=CacheLRU())
+    return simulation['resultats'], simulation['details']['ComputeCharges']
+
+
+def montants(df, poste):
+    lignes = df[(df['poste'] == poste).to_numpy()]
+    return lignes['date'].to_numpy(dtype='datetime64[D]'), lignes['montant'].to_numpy()
+
+
+def test_indexation_annuelle_des_postes(scenario):
+    resultats, details = charges(scenario)
+    df = resultats['ComputeCharges']
+
+    # Taxe foncière payée en octobre, +3 % à chaque anniversaire de l'achat (15/01/2025)
+    dates, taxe = montants(df, 'taxe_fonciere')
+    assert (dates.astype('datetime64[M]').astype(np.int64) % 12 == 9).all()
+    np.testing.assert_allclose(taxe, 900 * 1.03 ** np.arange(len(taxe)))
+
+    # Poste mensuel indexé sur l'inflation (2 %) : premier palier à l'échéance suivant l'anniversaire
+    dates, abonnements = montants(df, 'abonnements')
+    np.testing.assert_allclose(abonnements[:13], 20.0)
+    assert dates[13] == np.datetime64('2026-02-01')
+    assert abonnements[13] == pytest.approx(20.0 * 1.02)
+
+    # Frais de gestion : 7 % de chaque loyer encaissé, à sa date
+    loyers = resultats['ComputeLoyer']
+    encaisse = loyers.groupby('date')['loyer'].sum()
+    dates, gestion = montants(df, 'frais_gestion')
+    np.testing.assert_allclose(gestion, 0.07 * encaisse.to_numpy())
+    np.testing.assert_array_equal(dates, encaisse.index.to_numpy(dtype='datetime64[D]'))
+
+    assert details['total_charges'] == pytest.approx(df['montant'].sum())
+    assert details['total_par_poste']['taxe_fonciere'] == pytest.approx(taxe.sum())
+
+
+def test_indexation_mensuelle(scenario):
+    scenario['croissance']['frequence_taux_croissance_taxe_fonciere'] = 'Mensuelle'
+    resultats, _ = charges(scenario)
+
+    # Huit mises à jour mensuelles (15/02 ... 15/09) avant l'échéance du 01/10/2025
+    _, taxe = montants(resultats['ComputeCharges'], 'taxe_fonciere')
+    assert taxe[0] == pytest.approx(900 * 1.03 ** (8 / 12))
+    np.testing.assert_allclose(taxe[1:] / taxe[:-1], 1.03)
@@ -0,0 +1,60 @@
+import copy
+
+import pandas as pd
+
+from models.advanced_simulation.computation.cache import CacheLRU
+from models.advanced_simulation.computation.compute_manager import ComputeManager
+from models.advanced_simulation.computation.contexte import ContexteSimulation
+
+
+def executer(scenario, cache):
+    manager = ComputeManager(cache=cache, nb_workers=1, contexte=ContexteSimulation(scenario))
+    manager.run_all()
+    return manager
+
+
+def test_premier_run_execute_tous_les_calculateurs(scenario):
+    manager = executer(scenario, CacheLRU())
+    assert sorted(manager.recalcules) == sorted(classe.__name__ for classe in ComputeManager.CALCULATEURS)
+
+
+def test_scenario_inchange_lu_en_cache(scenario):
+    cache = CacheLRU()
+    executer(scenario, cache)
+    assert executer(copy.deepcopy(scenario), cache).recalcules == []
+
+
+def test_modification_des_loyers_ne_recalcule_pas_les_prets(scenario):
+    cache = CacheLRU()
+    executer(scenario, cache)
+
+    modifie = copy.deepcopy(scenario)
+    modifie['loyers'][0]['loyer_mensuel'] += 100
+    manager = executer(modifie, cache)
+
+    assert 'ComputeLoyer' in manager.recalcules
+    assert 'ComputePret' not in manager.recalcules
+    assert 'ComputeBien' not in manager.recalcules
+
+    # Résultats identiques à une exécution complète sans cache
+    complet = executer(modifie, CacheLRU())
+    for nom, resultat in complet.resultats.items():
+        pd.testing.assert_frame_equal(manager.resultats[nom], resultat, check_like=True)
+
+
+def test_modification_d_un_resultat_n_altere_pas_le_cache(scenario):
+    cache = CacheLRU()
+    reference = executer(scenario, cache)
+    attendu = {nom: resultat.copy(deep=True) for nom, resultat in reference.resultats.items()}
+    taeg = dict(reference.details['ComputePret']['taeg'])
+
+    # Un affichage ou un calculateur qui modifie en place ce qu'il a reçu
+    reference.resultats['ComputePret']['valeur'] = 0.0
+    reference.resultats['ComputeLoyer'].drop(reference.resultats['ComputeLoyer'].index, inplace=True)
+    reference.details['ComputePret']['taeg'].clear()
+
+    relu = executer(copy.deepcopy(scenario), cache)
+    assert relu.recalcules == []
+    for nom, resultat in attendu.items():
+        pd.testing.assert_frame_equal(relu.resultats[nom], resultat)
+    assert relu.details['ComputePret']['taeg'] == taeg
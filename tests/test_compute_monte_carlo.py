@@ -0,0 +1,64 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.advanced_simulation.computation.cache import CacheLRU
+from models.advanced_simulation.computation.compute_monte_carlo import ComputeMonteCarlo
+from models.advanced_simulation.computation.contexte import ContexteSimulation
+from models.advanced_simulation.computation.moteur import simuler
+
+HYPOTHESES = ('taux_inflation', 'taux_croissance_annuel', 'taux_augmentation_loyer', 'taux_croissance_taxe_fonciere')
+
+
+def monte_carlo(scenario, distributions, nb_tirages=500, graine=7):
+    scenario = copy.deepcopy(scenario)
+    scenario['croissance'].update(monte_carlo=True, nb_tirages=nb_tirages, graine=graine,
+                                  distributions=distributions)
+    simulation = simuler(scenario, cache=None, nb_workers=1, cache_calculs=CacheLRU())
+    return simulation['resultats'], simulation['details']['ComputeMonteCarlo']
+
+
+def test_tirages_sans_dispersion_reproduisent_le_deterministe(scenario):
+    resultats, details = monte_carlo(scenario, {cle: {'loi': 'normale', 'ecart_type': 0.0} for cle in HYPOTHESES})
+    bandes = resultats['ComputeMonteCarlo']
+
+    # Hypothèses tirées mais constantes : mêmes flux que sans aucune loi
+    reference, _ = monte_carlo(scenario, {}, nb_tirages=1)
+    pd.testing.assert_frame_equal(bandes, reference['ComputeMonteCarlo'], rtol=1e-12)
+
+    # Bandes confondues, et même valeur du bien que ComputeBien en début de mois
+    for mesure in ComputeMonteCarlo.MESURES:
+        np.testing.assert_allclose(bandes[f"{mesure}_p5"], bandes[f"{mesure}_p95"])
+    prix = resultats['ComputeBien'].set_index('date')['prix_corrige_total'].reindex(bandes['date']).to_numpy()
+    connus = ~np.isnan(prix)
+    np.testing.assert_allclose(bandes['valeur_bien_p50'].to_numpy()[connus], prix[connus], rtol=1e-12)
+    assert details['probabilite_tresorerie_negative'] in (0.0, 1.0)
+
+
+def test_bandes_ordonnees_et_reproductibles(scenario):
+    distributions = {
+        'taux_croissance_annuel': {'loi': 'normale', 'ecart_type': 1.5},
+        'taux_augmentation_loyer': {'loi': 'uniforme', 'min': 0.0, 'max': 3.0},
+        'taux_inflation': {'loi': 'triangulaire', 'min': 0.5, 'max': 4.0},
+    }
+    resultats, details = monte_carlo(scenario, distributions)
+    bandes = resultats['ComputeMonteCarlo']
+
+    for mesure in ComputeMonteCarlo.MESURES:
+        p5, p50, p95 = (bandes[f"{mesure}_p{p}"].to_numpy() for p in ComputeMonteCarlo.PERCENTILES)
+        assert (p5 <= p50 + 1e-9).all() and (p50 <= p95 + 1e-9).all()
+    assert bandes['valeur_bien_p95'].iloc[-1] > bandes['valeur_bien_p5'].iloc[-1]
+    assert details['tirages'].shape == (500, len(distributions))
+    assert 0.0 <= details['probabilite_tresorerie_negative'] <= 1.0
+
+    # Même graine : mêmes tirages et mêmes bandes
+    relu, _ = monte_carlo(scenario, distributions)
+    pd.testing.assert_frame_equal(relu['ComputeMonteCarlo'], bandes)
+
+
+def test_loi_inconnue(scenario):
+    scenario['croissance']['distributions'] = {'taux_inflation': {'loi': 'cauchy'}}
+    with pytest.raises(ValueError, match="Loi inconnue"):
+        ComputeMonteCarlo(ContexteSimulation(scenario)).tirer(10)
@@ -0,0 +1,30 @@
+import pytest
+
+from models.advanced_simulation.computation.cache import empreinte
+from models.advanced_simulation.computation.contexte import ContexteSimulation
+
+
+def test_sections_figees_en_profondeur(scenario):
+    contexte = ContexteSimulation(scenario)
+    with pytest.raises(TypeError):
+        contexte.data['prets'][0]['montant'] = 0
+    with pytest.raises(TypeError):
+        contexte.data['croissance']['taux_inflation'] = 10.0
+    with pytest.raises(AttributeError):
+        contexte.data['loyers'].append({})
+    with pytest.raises(AttributeError):
+        contexte.dates = None
+
+
+def test_contexte_independant_du_scenario_source(scenario):
+    contexte = ContexteSimulation(scenario)
+    scenario['prets'][0]['montant'] = 1.0
+    scenario['loyers'].clear()
+    assert contexte.data['prets'][0]['montant'] != 1.0
+    assert len(contexte.data['loyers']) == 2
+
+
+def test_empreinte_identique_a_celle_des_sections(scenario):
+    contexte = ContexteSimulation(scenario)
+    for section, contenu in scenario.items():
+        assert empreinte(contexte.data[section]) == empreinte(contenu)
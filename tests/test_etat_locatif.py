@@ -0,0 +1,74 @@
+import calendar
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from models.advanced_simulation.computation.etat_locatif import EtatLocatif
+
+LOTS = [
+    # label, loyer, charges, occupation, début, fin, indexation, jour, mois occupés
+    ("A", 1_000.0, 50.0, 1.0, date(2025, 1, 10), date(2027, 6, 30), 0.02, 5, range(1, 13)),
+    ("B", 800.0, 40.0, 0.9, date(2025, 3, 1), date(2026, 12, 31), 0.0, 31, range(1, 11)),
+]
+
+
+def journal_boucle(debut, fin):
+    """Référence : un paiement par lot et par mois, indexations comptées anniversaire par anniversaire"""
+    lignes = []
+    for label, loyer, charges, occupation, debut_bail, fin_bail, taux, jour, mois_occupes in LOTS:
+        mois = date(debut.year, debut.month, 1)
+        while mois <= fin:
+            paiement = mois.replace(day=min(jour, calendar.monthrange(mois.year, mois.month)[1]))
+            if debut_bail <= paiement <= fin_bail:
+                nb_indexations = 0
+                while debut_bail + relativedelta(months=12 * (nb_indexations + 1)) <= paiement:
+                    nb_indexations += 1
+                facteur = occupation * (mois.month in mois_occupes) * (1 + taux) ** nb_indexations
+                lignes.append((pd.Timestamp(paiement), label, loyer * facteur, charges * facteur))
+            mois += relativedelta(months=1)
+    lignes.sort(key=lambda ligne: (ligne[0], ligne[1]))
+    return pd.DataFrame(lignes, columns=['date', 'lot', 'loyer', 'charges'])
+
+
+def etat_locatif():
+    masques = np.array([[m in lot[8] for m in range(1, 13)] for lot in LOTS])
+    return EtatLocatif(
+        labels=[lot[0] for lot in LOTS],
+        loyer_mensuel=[lot[1] for lot in LOTS],
+        charges_mensuelles=[lot[2] for lot in LOTS],
+        taux_occupation=[lot[3] for lot in LOTS],
+        debut=[pd.Timestamp(lot[4]) for lot in LOTS],
+        fin=[pd.Timestamp(lot[5]) for lot in LOTS],
+        taux_indexation=[lot[6] for lot in LOTS],
+        jour_paiement=[lot[7] for lot in LOTS],
+        mois_occupes=masques,
+    )
+
+
+def test_journal_des_jours_de_paiement():
+    debut, fin = date(2025, 1, 1), date(2027, 12, 31)
+    journal = etat_locatif().journal(debut, fin)
+    attendu = journal_boucle(debut, fin)
+
+    assert len(journal) == len(attendu)
+    np.testing.assert_array_equal(journal['date'].to_numpy(), attendu['date'].to_numpy())
+    np.testing.assert_array_equal(journal['lot'].astype(str).to_numpy(), attendu['lot'].to_numpy())
+    np.testing.assert_allclose(journal['loyer'], attendu['loyer'])
+    np.testing.assert_allclose(journal['charges'], attendu['charges'])
+
+
+def test_journal_jour_borne_a_la_fin_du_mois():
+    journal = etat_locatif().journal(date(2025, 1, 1), date(2025, 12, 31))
+    dates_b = pd.DatetimeIndex(journal.loc[journal['lot'] == 'B', 'date'])
+    assert date(2025, 4, 30) in dates_b.date
+    assert (dates_b.is_month_end).all()
+
+
+def test_journal_indexation_a_l_anniversaire():
+    journal = etat_locatif().journal(date(2025, 1, 1), date(2027, 6, 30))
+    loyers_a = journal[journal['lot'] == 'A'].set_index('date')['loyer']
+    # Première indexation le 10/01/2026 : le paiement du 5 janvier n'est pas encore indexé
+    assert loyers_a[pd.Timestamp(2026, 1, 5)] == 1_000.0
+    assert loyers_a[pd.Timestamp(2026, 2, 5)] == 1_000.0 * 1.02
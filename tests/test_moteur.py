@@ -0,0 +1,47 @@
+import copy
+
+import pandas as pd
+
+from models.advanced_simulation.computation.cache import CacheLRU, taille_octets
+from models.advanced_simulation.computation.moteur import simuler
+
+
+def test_resultats_relus_en_cache_independants(scenario):
+    cache = CacheLRU()
+    premiere = simuler(scenario, cache=cache, cache_calculs=CacheLRU())
+    attendu = {nom: resultat.copy(deep=True) for nom, resultat in premiere['resultats'].items()}
+
+    # Un affichage qui modifie en place les résultats publiés
+    premiere['resultats']['ComputeBien']['prix'] = 0.0
+    premiere['details']['ComputeCashflow']['flux'].drop(columns='tresorerie', inplace=True)
+
+    relue = simuler(copy.deepcopy(scenario), cache=cache, cache_calculs=CacheLRU())
+    assert relue['depuis_cache']
+    for nom, resultat in attendu.items():
+        pd.testing.assert_frame_equal(relue['resultats'][nom], resultat)
+    assert 'tresorerie' in relue['details']['ComputeCashflow']['flux']
+
+
+def test_cube_d_agregation_independant(scenario):
+    simulation = simuler(scenario, cache=None, cache_calculs=CacheLRU())
+    agregation, loyers = simulation['agregation'], simulation['resultats']['ComputeLoyer']
+    cube = agregation.cube(loyers[['date', 'loyer']], 'ComputeLoyer')
+    total = cube['annee']['loyer'].sum()
+
+    cube['annee']['loyer'] = 0.0
+    assert agregation.cube(loyers[['date', 'loyer']], 'ComputeLoyer')['annee']['loyer'].sum() == total
+
+
+def test_memoire_du_cache_couvre_le_calendrier(scenario):
+    cache = CacheLRU()
+    premiere = simuler(scenario, cache=cache, cache_calculs=CacheLRU())
+    agregation = premiere['agregation']
+    memoire_resultats = taille_octets((premiere['resultats'], premiere['details']))
+    assert cache.statistiques()['memoire'] >= memoire_resultats + agregation.dates.nbytes
+
+    # Agrégation reconstruite à la relecture, sur le même calendrier
+    relue = simuler(copy.deepcopy(scenario), cache=cache, cache_calculs=CacheLRU())
+    assert relue['depuis_cache'] and relue['agregation'] is not agregation
+    loyers = relue['resultats']['ComputeLoyer'][['date', 'loyer']]
+    pd.testing.assert_frame_equal(relue['agregation'].cube(loyers, 'ComputeLoyer')['annee'],
+                                  agregation.cube(loyers, 'ComputeLoyer')['annee'])
@@ -0,0 +1,45 @@
+import copy
+
+import pytest
+
+from models.advanced_simulation.computation.cache import CacheLRU
+from models.advanced_simulation.computation.moteur import indicateurs_cles, simuler
+from models.advanced_simulation.computation.sensibilite import analyser_sensibilite
+
+PARAMETRES = ['pret_1.taux_interet', 'pret_2.taux_interet', 'Loyer 1.loyer_mensuel', 'Loyer 1.taux_occupation']
+
+
+def test_tornade(scenario):
+    tornade = analyser_sensibilite(scenario, pas=0.10, parametres=PARAMETRES,
+                                   indicateurs=['total_interets', 'total_loyers'], nb_workers=1)
+    assert len(tornade) == 2 * len(PARAMETRES)
+    interets = tornade[tornade['indicateur'] == 'total_interets'].set_index('parametre')
+
+    # Un taux plus élevé augmente les intérêts ; le plus gros prêt au taux le plus élevé domine
+    for pret in ('pret_1', 'pret_2'):
+        ligne = interets.loc[f"{pret}.taux_interet"]
+        assert ligne['delta_bas'] < 0 < ligne['delta_haut']
+    assert interets.loc['pret_1.taux_interet', 'rang'] == 1
+    assert interets.loc['pret_2.taux_interet', 'rang'] == 2
+    assert interets.loc['pret_1.taux_interet', 'amplitude'] > interets.loc['pret_2.taux_interet', 'amplitude']
+    assert interets.loc['Loyer 1.loyer_mensuel', 'amplitude'] == pytest.approx(0.0, abs=1e-6)
+
+    loyers = tornade[tornade['indicateur'] == 'total_loyers'].set_index('parametre')
+    assert loyers.loc['Loyer 1.loyer_mensuel', 'delta_haut'] > 0
+    assert loyers.loc['Loyer 1.loyer_mensuel', 'rang'] == 1
+
+    # Taux d'occupation de 100 % : la hausse est bornée et laisse l'indicateur inchangé
+    occupation = loyers.loc['Loyer 1.taux_occupation']
+    assert occupation['valeur_haute'] == 100
+    assert occupation['delta_haut'] == 0
+
+    # Chaque variation est une simulation indépendante du scénario modifié
+    variante = copy.deepcopy(scenario)
+    variante['prets'][0]['taux_interet'] = interets.loc['pret_1.taux_interet', 'valeur_haute']
+    attendu = indicateurs_cles(simuler(variante, cache=None, cache_calculs=CacheLRU()))['total_interets']
+    assert interets.loc['pret_1.taux_interet', 'haut'] == pytest.approx(attendu)
+
+
+def test_parametre_inconnu(scenario):
+    with pytest.raises(ValueError, match="inconnu"):
+        analyser_sensibilite(scenario, parametres=['pret_9.taux_interet'], nb_workers=1)
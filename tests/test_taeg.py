@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from models.advanced_simulation.computation.amortissement import calculer_echeance
+from models.advanced_simulation.computation.compute_pret import ComputePret
+from models.advanced_simulation.computation.contexte import ContexteSimulation
+from models.advanced_simulation.computation.taeg import calculer_taeg, resoudre_taux_actuariel
+
+
+def flux_annuite(capital, taux_mensuel, nb_mois, frais=0.0):
+    """Capital reçu (net des frais) puis échéances mensuelles constantes, dates en années"""
+    echeance = calculer_echeance(capital, taux_mensuel, nb_mois)
+    temps = np.arange(nb_mois + 1) / 12
+    flux = np.concatenate(([capital - frais], np.full(nb_mois, -echeance)))
+    return temps, flux
+
+
+@pytest.mark.parametrize("taux_mensuel", [0.0, 0.001, 0.004, 0.01])
+def test_taux_actuariel_d_une_annuite(taux_mensuel):
+    temps, flux = flux_annuite(150_000.0, taux_mensuel, 240)
+    taux = resoudre_taux_actuariel(flux, temps)
+    # Sans frais, le taux actuariel annuel est le taux périodique composé sur l'année
+    assert taux[0] == pytest.approx((1 + taux_mensuel) ** 12 - 1, abs=1e-10)
+
+
+def test_plusieurs_series_en_un_appel():
+    taux_mensuels = np.array([0.002, 0.003, 0.005, 0.008])
+    series = [flux_annuite(100_000.0, t, n) for t, n in zip(taux_mensuels, [120, 180, 240, 300])]
+    np.testing.assert_allclose(calculer_taeg(series), (1 + taux_mensuels) ** 12 - 1, atol=1e-10)
+
+
+def test_frais_augmentent_le_taux():
+    sans_frais = calculer_taeg([flux_annuite(100_000.0, 0.003, 240)])[0]
+    avec_frais = calculer_taeg([flux_annuite(100_000.0, 0.003, 240, frais=2_000.0)])[0]
+    assert avec_frais > sans_frais
+
+
+def test_sans_changement_de_signe():
+    assert np.isnan(resoudre_taux_actuariel(np.array([100.0, 10.0, 10.0]), np.arange(3.0))[0])
+
+
+def test_taeg_de_compute_pret(scenario):
+    pret = scenario['prets'][0]
+    pret.update(frais_dossier=0.0, frais_courtage=0.0, frais_divers=0.0, frais_caution=0.0,
+                frais_garantie_hypothecaire=0.0, frais_assurance=0.0, remboursements_anticipes=[],
+                differe={'active': False}, type_taux='Fixe', periodicite='Mensuelle')
+    scenario['prets'] = [pret]
+    calculateur = ComputePret(ContexteSimulation(scenario))
+    calculateur.run()
+
+    # Sans frais, au calendrier réel près : taux nominal mensuel composé sur l'année
+    taeg = calculateur.get_results()['taeg'][pret['pret']]
+    assert taeg == pytest.approx((1 + pret['taux_interet'] / 100 / 12) ** 12 - 1, abs=5e-4)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from models.advanced_simulation.computation.amortissement import Echeancier
+from models.advanced_simulation.computation.taux_variable import (
+    calculer_echeanciers_taux_variable,
+    construire_chemins_taux,
+)
+
+NB_PERIODES = 180
+
+
+def chemins(nb_chemins, graine=0):
+    generateur = np.random.default_rng(graine)
+    return 0.025 + np.cumsum(generateur.normal(0.0, 0.003, (nb_chemins, NB_PERIODES)), axis=1)
+
+
+def test_cap_et_plancher_bornent_les_taux():
+    taux, revisions = construire_chemins_taux(0.035, chemins(50), periode_fixe=24, periodicite_revision=12,
+                                              marge=0.01, cap=0.045, plancher=0.02)
+    assert (taux[:, :24] == 0.035).all()
+    assert taux[:, 24:].max() <= 0.045 and taux[:, 24:].min() >= 0.02
+    np.testing.assert_array_equal(revisions, np.arange(24, NB_PERIODES, 12))
+
+
+def test_chemins_identiques_a_l_echeancier_scalaire():
+    index = chemins(5)
+    resultat = calculer_echeanciers_taux_variable(150_000.0, NB_PERIODES, 12, 0.035, index,
+                                                  periode_fixe=36, periodicite_revision=6, marge=0.01, cap=0.05)
+    assert resultat['paiement'].shape == (5, NB_PERIODES)
+
+    # Chaque chemin : mêmes révisions appliquées une à une par l'échéancier de ComputePret
+    for k, taux in enumerate(resultat['taux']):
+        revisions = np.flatnonzero(np.diff(taux, prepend=taux[0]) != 0)
+        attendu = Echeancier(150_000.0, taux[0] / 12, NB_PERIODES).appliquer(
+            (int(periode), 'revision', taux[periode] / 12) for periode in revisions).calculer()
+        for cle in ('paiement', 'interets', 'principal', 'capital_restant'):
+            np.testing.assert_allclose(resultat[cle][k], attendu[cle], rtol=1e-10, atol=1e-6, err_msg=cle)
+    np.testing.assert_allclose(resultat['principal'].sum(axis=1), 150_000.0)